@@ -63,6 +63,8 @@ from config.surfaces import SURFACE_CLASSES
 from config.endpoints import (
     OVERPASS_ENDPOINTS, OVERPASS_ENDPOINT, OVERPASS_FALLBACK_ENDPOINT,
     OVERPASS_TIMEOUT, OVERPASS_HTTP_TIMEOUT, OVERPASS_PROBE_TIMEOUT,
+    OVERPASS_MIRROR_COOLDOWN, OVERPASS_CACHE_DIR, OVERPASS_CACHE_TTL_S,
+    OVERPASS_CACHE_MAX_MB,
     OPENTOPOGRAPHY_ENDPOINT,
     SENTINEL2_WMS_ENDPOINT, SENTINEL2_WMTS_URL,
     CORINE_WMS, TREE_COVER_REST,
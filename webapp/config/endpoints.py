@@ -1,5 +1,8 @@
 """External API endpoint URLs."""
 
+import os
+import tempfile
+
 # Overpass API endpoint pool. All instances serve identical OSM data —
 # differences are only in capacity/uptime. At runtime osm_service probes
 # every mirror and queries the fastest healthy one first; this list order
@@ -13,6 +16,16 @@ OVERPASS_ENDPOINTS = [
 OVERPASS_TIMEOUT = 60          # server-side query budget: [timeout:60] in Overpass QL
 OVERPASS_HTTP_TIMEOUT = 75     # httpx client timeout — server budget + 15s network buffer
 OVERPASS_PROBE_TIMEOUT = 12    # pre-flight mirror health probe — trivial query, short budget
+OVERPASS_MIRROR_COOLDOWN = 30  # seconds a mirror that failed (429/5xx/network) is tried last
+# On-disk cache of Overpass responses, keyed on the exact query (incl. bbox)
+# so re-generating the same selection skips the fetch. Empty disables it.
+OVERPASS_CACHE_DIR = os.getenv(
+    "OVERPASS_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "arma_reforger", "overpass"),
+)
+OVERPASS_CACHE_TTL_S = 24 * 3600
+# Size cap for that cache; oldest responses are evicted first once exceeded.
+OVERPASS_CACHE_MAX_MB = int(os.getenv("OVERPASS_CACHE_MAX_MB", "512"))
 
 # Legacy aliases for backward compatibility
 OVERPASS_ENDPOINT = OVERPASS_ENDPOINTS[0]
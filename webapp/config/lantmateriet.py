@@ -10,6 +10,7 @@ Authentication: Basic Auth (username/password) over HTTPS.
 """
 
 import os
+import tempfile
 from dataclasses import dataclass
 
 
@@ -40,6 +41,18 @@ class LantmaterietConfig:
     elevation_resolution_m: float = 1.0
     max_tile_size: int = 4096
 
+    # Persistent STAC Höjd tile cache (tiles change on an annual cadence).
+    # Empty string disables caching.
+    tile_cache_dir: str = ""
+    tile_cache_max_mb: int = 4096
+    stac_search_cache_ttl_s: int = 24 * 3600
+    # Size cap for the Hydrografi/Marktäcke responses cached alongside.
+    features_cache_max_mb: int = 512
+
+    # Scratch dir for per-job tile downloads (e.g. a fast SSD or tmpfs).
+    # Empty string means the system temp dir.
+    tile_scratch_dir: str = ""
+
     def has_credentials(self) -> bool:
         """Check if authentication credentials are configured."""
         return bool(self.username and self.password)
@@ -57,6 +70,15 @@ def _load_config() -> LantmaterietConfig:
     return LantmaterietConfig(
         username=os.getenv("LANTMATERIET_USERNAME", ""),
         password=os.getenv("LANTMATERIET_PASSWORD", ""),
+        tile_cache_dir=os.getenv(
+            "LANTMATERIET_TILE_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "arma_reforger", "stac_tiles"),
+        ),
+        tile_cache_max_mb=int(os.getenv("LANTMATERIET_TILE_CACHE_MAX_MB", "4096")),
+        features_cache_max_mb=int(
+            os.getenv("LANTMATERIET_FEATURES_CACHE_MAX_MB", "512")
+        ),
+        tile_scratch_dir=os.getenv("LANTMATERIET_TILE_SCRATCH_DIR", ""),
     )
 
 
@@ -7,9 +7,11 @@ fetch elevation, road, water, forest, and building data for any selected area.
 """
 
 import asyncio
+import heapq
 import logging
 import os
 import threading
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional
@@ -110,6 +112,14 @@ async def startup_event():
     logger.info(f"Startup cleanup: cleared {cleared_count} hanging sessions")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled HTTP connections held by long-lived service clients."""
+    from services.osm_service import close_overpass_client
+
+    await close_overpass_client()
+
+
 # ===========================================================================
 # Cleanup scheduler
 # ===========================================================================
@@ -119,28 +129,85 @@ FILE_RETENTION_MINUTES = 10
 
 # Track scheduled cleanups: {job_id: cleanup_time} - thread-safe access required
 scheduled_cleanups: dict[str, datetime] = {}
-_cleanups_lock = threading.RLock()
+_cleanups_lock = threading.Lock()
+
+# One long-running worker handles every cleanup instead of one sleeping task
+# per finished job. _cleanup_heap is a min-heap of (monotonic deadline,
+# job_id); _cleanup_deadlines holds each job's current deadline, so heap
+# entries superseded by a reschedule are skipped. Both guarded by
+# _cleanups_lock. _cleanup_wakeup wakes the worker when an earlier
+# deadline is pushed.
+_cleanup_heap: list[tuple[float, str]] = []
+_cleanup_deadlines: dict[str, float] = {}
+_cleanup_wakeup: Optional[asyncio.Event] = None
+_cleanup_worker_task: Optional[asyncio.Task] = None
+
+# Delay before retrying the cleanup of a job whose ZIP is being downloaded
+DOWNLOAD_ACTIVE_RETRY_SECONDS = 300
 
 
-async def schedule_cleanup(job_id: str, delay_minutes: int = FILE_RETENTION_MINUTES):
+def schedule_cleanup(job_id: str, delay_minutes: int = FILE_RETENTION_MINUTES) -> None:
     """
     Schedule automatic cleanup of job files after a delay.
 
+    Must be called from the event loop; starts the cleanup worker on first use.
+
     Args:
         job_id: Job identifier
         delay_minutes: Delay in minutes before cleanup (default: 10)
     """
     cleanup_time = datetime.now() + timedelta(minutes=delay_minutes)
+    _push_cleanup(job_id, delay_minutes * 60)
 
     with _cleanups_lock:
         scheduled_cleanups[job_id] = cleanup_time
 
     logger.info(f"Scheduled cleanup for job {job_id[:8]}... at {cleanup_time}")
 
-    # Wait for the specified delay
-    await asyncio.sleep(delay_minutes * 60)
 
-    # Perform cleanup
+def _push_cleanup(job_id: str, delay_s: float) -> None:
+    global _cleanup_wakeup, _cleanup_worker_task
+
+    if _cleanup_worker_task is None or _cleanup_worker_task.done():
+        _cleanup_wakeup = asyncio.Event()
+        _cleanup_worker_task = asyncio.create_task(_cleanup_worker())
+
+    deadline = time.monotonic() + delay_s
+    with _cleanups_lock:
+        _cleanup_deadlines[job_id] = deadline
+        heapq.heappush(_cleanup_heap, (deadline, job_id))
+    _cleanup_wakeup.set()
+
+
+async def _cleanup_worker() -> None:
+    """Sleep until the earliest cleanup deadline, run it, repeat."""
+    while True:
+        # Clear before reading the heap: a push after this point sets the
+        # event again, so the wait below can't miss it.
+        _cleanup_wakeup.clear()
+        with _cleanups_lock:
+            deadline, job_id = _cleanup_heap[0] if _cleanup_heap else (None, None)
+        if deadline is None:
+            await _cleanup_wakeup.wait()
+            continue
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(_cleanup_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        with _cleanups_lock:
+            heapq.heappop(_cleanup_heap)
+            if _cleanup_deadlines.get(job_id) != deadline:
+                continue  # superseded by a later reschedule
+            del _cleanup_deadlines[job_id]
+        await _run_cleanup(job_id)
+
+
+async def _run_cleanup(job_id: str) -> None:
+    """Remove a job's files once its retention time is up."""
     try:
         from services.export_service import cleanup_job
         from services.map_generator import is_download_active
@@ -149,14 +216,15 @@ async def schedule_cleanup(job_id: str, delay_minutes: int = FILE_RETENTION_MINU
         if is_download_active(job_id):
             logger.info(f"Skipping cleanup for job {job_id[:8]}... (download in progress)")
             # Reschedule for 5 minutes later
-            await asyncio.sleep(300)  # 5 minutes
+            _push_cleanup(job_id, DOWNLOAD_ACTIVE_RETRY_SECONDS)
+            return
 
         # Verify the job directory and files still exist before cleanup
         job_dir = OUTPUT_DIR / job_id
         zip_path = OUTPUT_DIR / f"map_{job_id}.zip"
 
         if job_dir.exists() or zip_path.exists():
-            cleanup_job(job_id, OUTPUT_DIR)
+            await asyncio.to_thread(cleanup_job, job_id, OUTPUT_DIR)
             logger.info(f"Auto-cleanup completed for job {job_id[:8]}...")
         else:
             logger.debug(f"Job {job_id[:8]}... already cleaned up")
@@ -401,7 +469,7 @@ async def get_data_sources():
 
 @app.post("/api/generate")
 async def start_generation(
-    request: Request, request_body: GenerateRequest, background_tasks: BackgroundTasks
+    request: Request, request_body: GenerateRequest
 ):
     """
     Start a map generation job.
@@ -409,7 +477,7 @@ async def start_generation(
     Validates the polygon, creates a job, and starts background processing.
     Returns immediately with a job ID and access token for polling/downloading.
     """
-    from services.map_generator import create_job, run_generation
+    from services.map_generator import create_job, launch_generation
     from services.session_service import generate_access_token
 
     # Validate polygon
@@ -442,10 +510,10 @@ async def start_generation(
         f"(map_name={map_label})"
     )
 
-    # Run generation in background
+    # Run generation in background, in its own task (see launch_generation)
     # Note: We don't schedule cleanup here anymore - it's now scheduled
     # when generation completes to give users the full retention time
-    background_tasks.add_task(run_generation, job)
+    launch_generation(job)
 
     return {
         "job_id": job.job_id,
@@ -463,9 +531,10 @@ async def get_job_status_public(job_id: str, since: int = 0):
     This endpoint is accessible via Cloudflare tunnel and does NOT require
     authentication. It's used for polling job progress from the frontend.
 
-    The optional `since` query parameter is the index of the next log entry
-    the client wants. The response slices `logs` to entries from that index
-    forward and reports `logs_total` so the client can advance its cursor.
+    The optional `since` query parameter is the sequence number of the next
+    log entry the client wants. The response carries only entries from that
+    number forward and reports `logs_total` so the client can advance its
+    cursor. Old entries may be evicted from the job's bounded log buffer.
     This keeps poll payloads small under fast polling and long log streams.
 
     Cache-Control: no-store is critical. Without it, Cloudflare/CDN/browser
@@ -484,16 +553,12 @@ async def get_job_status_public(job_id: str, since: int = 0):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job_data = job.to_dict()
-
-    logs = job_data.get("logs") or []
-    total = len(logs)
+    total = job.logs_total
     if since < 0:
         since = 0
     if since > total:
         since = total
-    job_data["logs"] = logs[since:]
-    job_data["logs_total"] = total
+    job_data = job.to_dict(since=since)
     job_data["logs_since"] = since
 
     # Add retention information if cleanup is scheduled
@@ -702,13 +767,17 @@ async def list_job_files(request: Request, job_id: str):
 
 @app.delete("/api/job/{job_id}")
 async def delete_job(request: Request, job_id: str):
-    """Clean up job output files."""
+    """Cancel the job if it is still running and clean up its output files."""
     from services.export_service import cleanup_job
 
     # Verify session ownership
     job = get_session_job(request, job_id)
 
-    cleanup_job(job_id, OUTPUT_DIR)
+    # A still-live pipeline removes its own output once its worker threads
+    # have stopped (see MapGenerationJob.cancel); otherwise clean up here,
+    # off the event loop.
+    if not job.cancel():
+        await asyncio.to_thread(cleanup_job, job_id, OUTPUT_DIR)
 
     # Remove from session's job list
     session = request.state.session
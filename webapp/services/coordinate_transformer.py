@@ -22,6 +22,24 @@ import numpy as np
 logger = logging.getLogger(__name__)
 
 
+def _pyproj_transformers(crs: str):
+    """
+    Shared (WGS84 → crs, crs → WGS84) pyproj Transformer pair.
+
+    Building a Transformer opens the PROJ database and resolves the operation
+    pipeline, which dominates CoordinateTransformer construction. Only the
+    CRS-dependent pair is shared (via the process-wide cached_transformer);
+    the bbox-dependent state stays per instance, so jobs over slightly
+    different areas never share a mapping.
+    """
+    from services.utils.geo import cached_transformer
+
+    return (
+        cached_transformer("EPSG:4326", crs),
+        cached_transformer(crs, "EPSG:4326"),
+    )
+
+
 class CoordinateTransformer:
     """
     Transforms coordinates between WGS84 and Enfusion local coordinate systems.
@@ -84,13 +102,8 @@ class CoordinateTransformer:
             return
 
         try:
-            from pyproj import Transformer
-
-            self._transformer_to_local = Transformer.from_crs(
-                "EPSG:4326", self.crs, always_xy=True
-            )
-            self._transformer_to_wgs84 = Transformer.from_crs(
-                self.crs, "EPSG:4326", always_xy=True
+            self._transformer_to_local, self._transformer_to_wgs84 = (
+                _pyproj_transformers(self.crs)
             )
 
             # Project bbox corners
@@ -219,6 +232,40 @@ class CoordinateTransformer:
 
         return local_x, local_z
 
+    def wgs84_to_local_arrays(self, lons, lats) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized wgs84_to_local for many points at once.
+
+        One pyproj call for the whole batch instead of one per point (the
+        per-call overhead dominates for road/building vertex lists); the
+        arithmetic is the same as wgs84_to_local, element for element.
+
+        Args:
+            lons: Sequence/array of longitudes in degrees.
+            lats: Sequence/array of latitudes in degrees.
+
+        Returns:
+            (local_x, local_z) float64 arrays.
+        """
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        if self._use_pyproj:
+            px, py = self._transformer_to_local.transform(lons, lats)
+            local_x = np.asarray(px, dtype=np.float64) - self._sw_projected[0]
+            local_z = np.asarray(py, dtype=np.float64) - self._sw_projected[1]
+        else:
+            local_x = (lons - self.west) * self._m_per_deg_lon
+            local_z = (lats - self.south) * self._m_per_deg_lat
+
+        if self.terrain_size_m is not None:
+            target_w, target_d = self.terrain_size_m
+            if self._projected_width > 0:
+                local_x = local_x * (target_w / self._projected_width)
+            if self._projected_depth > 0:
+                local_z = local_z * (target_d / self._projected_depth)
+
+        return local_x, local_z
+
     def local_to_wgs84(self, local_x: float, local_z: float) -> tuple[float, float]:
         """
         Convert Enfusion local metres back to WGS84 coordinates.
@@ -280,38 +327,21 @@ class CoordinateTransformer:
             geom["coordinates"] = [x, z] + coords[2:]  # Preserve elevation if present
 
         elif geom_type == "LineString":
-            geom["coordinates"] = [
-                [*self.wgs84_to_local(c[0], c[1]), *(c[2:] if len(c) > 2 else [])]
-                for c in geom["coordinates"]
-            ]
+            geom["coordinates"] = self._transform_coord_list(geom["coordinates"])
 
         elif geom_type == "MultiLineString":
             geom["coordinates"] = [
-                [
-                    [*self.wgs84_to_local(c[0], c[1]), *(c[2:] if len(c) > 2 else [])]
-                    for c in line
-                ]
-                for line in geom["coordinates"]
+                self._transform_coord_list(line) for line in geom["coordinates"]
             ]
 
         elif geom_type == "Polygon":
             geom["coordinates"] = [
-                [
-                    [*self.wgs84_to_local(c[0], c[1]), *(c[2:] if len(c) > 2 else [])]
-                    for c in ring
-                ]
-                for ring in geom["coordinates"]
+                self._transform_coord_list(ring) for ring in geom["coordinates"]
             ]
 
         elif geom_type == "MultiPolygon":
             geom["coordinates"] = [
-                [
-                    [
-                        [*self.wgs84_to_local(c[0], c[1]), *(c[2:] if len(c) > 2 else [])]
-                        for c in ring
-                    ]
-                    for ring in polygon
-                ]
+                [self._transform_coord_list(ring) for ring in polygon]
                 for polygon in geom["coordinates"]
             ]
 
@@ -319,6 +349,17 @@ class CoordinateTransformer:
             for sub_geom in geom.get("geometries", []):
                 self._transform_geometry_coords(sub_geom)
 
+    def _transform_coord_list(self, coords: list) -> list:
+        """Transform a GeoJSON position list in one batch, keeping any Z/M values."""
+        if not coords:
+            return []
+        xs, zs = self.wgs84_to_local_arrays(
+            [c[0] for c in coords], [c[1] for c in coords]
+        )
+        return [
+            [x, z, *c[2:]] for x, z, c in zip(xs.tolist(), zs.tolist(), coords)
+        ]
+
     def transform_points(
         self,
         points: list[dict],
@@ -339,7 +380,12 @@ class CoordinateTransformer:
         Returns:
             List of dicts with 'x' (local_x), 'y' (elevation), 'z' (local_z).
         """
-        # Pre-compute mapping constants for elevation sampling
+        if not points:
+            return []
+        local_x, local_z = self.wgs84_to_local_arrays(
+            [p["x"] for p in points], [p["y"] for p in points]
+        )
+
         if elevation_array is not None:
             arr_h, arr_w = elevation_array.shape
             if self.terrain_size_m:
@@ -348,32 +394,22 @@ class CoordinateTransformer:
                 tw = self._projected_width
                 td = self._projected_depth
 
-        result = []
-        for p in points:
-            local_x, local_z = self.wgs84_to_local(p["x"], p["y"])
+            # Map local coords (0..tw, 0..td) to array pixel indices
+            # (truncating like int()), clamped to the array bounds.
+            px = np.clip((local_x / tw * (arr_w - 1)).astype(np.intp), 0, arr_w - 1)
+            pz = np.clip((local_z / td * (arr_h - 1)).astype(np.intp), 0, arr_h - 1)
 
-            y_val = 0.0
-            if elevation_array is not None:
-                # Map local coords (0..tw, 0..td) to array pixel indices
-                px = int(local_x / tw * (arr_w - 1))
-                pz = int(local_z / td * (arr_h - 1))
+            # Array is north-up: row 0 = north, local_z grows northward
+            row = (arr_h - 1) - pz
 
-                # Clamp to array bounds
-                px = max(0, min(arr_w - 1, px))
-                pz = max(0, min(arr_h - 1, pz))
-
-                # Array is north-up: row 0 = north, local_z grows northward
-                row = (arr_h - 1) - pz
-                row = max(0, min(arr_h - 1, row))
-
-                y_val = float(elevation_array[row, px])
+            y_vals = elevation_array[row, px].astype(np.float64).tolist()
+        else:
+            y_vals = [0.0] * len(points)
 
-            result.append({
-                "x": round(local_x, 3),
-                "y": round(y_val, 3),
-                "z": round(local_z, 3),
-            })
-        return result
+        return [
+            {"x": round(x, 3), "y": round(y, 3), "z": round(z, 3)}
+            for x, y, z in zip(local_x.tolist(), y_vals, local_z.tolist())
+        ]
 
     def get_verification_data(self) -> dict:
         """
@@ -8,9 +8,12 @@ No network calls; the dataset covers every country worldwide.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
@@ -180,22 +183,29 @@ def get_crs_for_area(
     return _utm_crs_from_centroid(centroid_lng, centroid_lat)
 
 
-async def detect_countries(polygon_coords: list[list[float]]) -> dict:
-    """Main entry point: detect countries for a polygon.
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
 
-    Args:
-        polygon_coords: List of [lng, lat] coordinate pairs forming the polygon.
+# The frontend calls /api/detect-countries while the user draws, then the job
+# runs detection again for the same polygon, and users often resubmit the same
+# area with different options. Cache the country/CRS decision keyed on the
+# polygon rounded to 5 decimals (~1 m), which collapses sub-metre jitter.
+_COUNTRY_CACHE_MAX = 256
+_country_cache: "OrderedDict[str, tuple[list[str], str, str]]" = OrderedDict()
+_country_cache_lock = threading.Lock()
 
-    Returns:
-        Dict with:
-            - countries: list of ISO 2-letter country codes
-            - primary_country: country with the largest intersection area
-            - crs: recommended CRS for processing
-            - bbox: bounding box dict (west, south, east, north)
-    """
-    polygon = Polygon([(c[0], c[1]) for c in polygon_coords])
-    bounds = polygon.bounds  # (minx/west, miny/south, maxx/east, maxy/north)
 
+def _polygon_cache_key(polygon_coords: list[list[float]]) -> str:
+    """Stable fingerprint of a polygon rounded to ~1 m."""
+    rounded = [(round(c[0], 5), round(c[1], 5)) for c in polygon_coords]
+    return hashlib.blake2b(repr(rounded).encode(), digest_size=16).hexdigest()
+
+
+def _detect_countries_uncached(
+    polygon: Polygon, polygon_coords: list[list[float]]
+) -> tuple[list[str], str, str]:
+    """Run the spatial lookup: (countries, primary country, CRS)."""
     countries = _detect_countries_polygon(polygon_coords)
     logger.info(f"Country detection: {countries}")
 
@@ -216,9 +226,46 @@ async def detect_countries(polygon_coords: list[list[float]]) -> dict:
         primary = best_code
 
     crs = get_crs_for_area(countries, polygon_coords)
+    return countries, primary, crs
+
+
+async def detect_countries(polygon_coords: list[list[float]]) -> dict:
+    """Main entry point: detect countries for a polygon.
+
+    Args:
+        polygon_coords: List of [lng, lat] coordinate pairs forming the polygon.
+
+    Returns:
+        Dict with:
+            - countries: list of ISO 2-letter country codes
+            - primary_country: country with the largest intersection area
+            - crs: recommended CRS for processing
+            - bbox: bounding box dict (west, south, east, north)
+    """
+    polygon = Polygon([(c[0], c[1]) for c in polygon_coords])
+    bounds = polygon.bounds  # (minx/west, miny/south, maxx/east, maxy/north)
+
+    key = _polygon_cache_key(polygon_coords)
+    with _country_cache_lock:
+        cached = _country_cache.get(key)
+        if cached is not None:
+            _country_cache.move_to_end(key)
+
+    if cached is None:
+        cached = _detect_countries_uncached(polygon, polygon_coords)
+        with _country_cache_lock:
+            _country_cache[key] = cached
+            _country_cache.move_to_end(key)
+            while len(_country_cache) > _COUNTRY_CACHE_MAX:
+                _country_cache.popitem(last=False)
+    else:
+        logger.debug(f"Country detection cache hit: {cached[0]}")
+
+    countries, primary, crs = cached
 
+    # The bbox always comes from the exact polygon, never the cache.
     return {
-        "countries": countries,
+        "countries": list(countries),
         "primary_country": primary,
         "crs": crs,
         "bbox": {
@@ -1092,7 +1092,7 @@ async def fetch_elevation(
                 )
             else:
                 job.add_log(f"Attempting to fetch elevation data from {config.name} ({native_res}m resolution)...")
-            job.progress = 12
+            job.progress = max(job.progress, 12)
         data = await fetch_elevation_for_country(country_code, bbox_tuple, target_w, target_h, job=job)
         if data:
             result["data"] = data
@@ -1101,7 +1101,7 @@ async def fetch_elevation(
             result["crs"] = config.native_crs
             if job:
                 job.add_log(f"Successfully fetched elevation data from {config.name} ({len(data)} bytes)", "success")
-                job.progress = 23
+                job.progress = max(job.progress, 23)
             return result
         else:
             if job:
@@ -1115,7 +1115,7 @@ async def fetch_elevation(
     logger.info("Trying Copernicus DEM 30 m directly from AWS Open Data...")
     if job:
         job.add_log("Trying Copernicus DEM 30m directly from AWS Open Data (no API key)...")
-        job.progress = 15
+        job.progress = max(job.progress, 15)
     data = await fetch_elevation_cop30_aws(bbox, job=job)
     if data:
         result["data"] = data
@@ -1124,7 +1124,7 @@ async def fetch_elevation(
         result["crs"] = "EPSG:4326"
         if job:
             job.add_log(f"Successfully fetched elevation data from AWS COP30 ({len(data)} bytes)", "success")
-            job.progress = 23
+            job.progress = max(job.progress, 23)
         return result
 
     # Fallback 2: OpenTopography Copernicus DEM 30 m (same data, different host)
@@ -1139,7 +1139,7 @@ async def fetch_elevation(
         result["crs"] = "EPSG:4326"
         if job:
             job.add_log(f"Successfully fetched elevation data from OpenTopography ({len(data)} bytes)", "success")
-            job.progress = 23
+            job.progress = max(job.progress, 23)
         return result
 
     # SRTM fallback (only works below 60 deg N)
@@ -401,8 +401,9 @@ class EnfusionProjectGenerator:
         suffix = path.suffix.lower()
         if suffix in (".gproj", ".ent", ".layer"):
             content = self._GENERATOR_BANNER + content
-        with open(path, "w", encoding="utf-8", newline="\n") as f:
-            f.write(content)
+        # Encode once and write the bytes directly: no text-wrapper setup
+        # per file, and "\n" line endings are kept as-is (newline="\n").
+        path.write_bytes(content.encode("utf-8"))
         logger.debug(f"Wrote: {path}")
         return str(path)
 
@@ -5,6 +5,7 @@ Handles creating downloadable archives and serving files.
 """
 
 import logging
+import os
 import shutil
 from pathlib import Path
 from typing import Optional
@@ -105,12 +106,15 @@ def list_job_files(job_id: str, output_dir: Path = OUTPUT_DIR) -> list[dict]:
         return []
 
     files = []
-    for path in sorted(job_dir.iterdir()):
-        if path.is_file():
+    with os.scandir(job_dir) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if entry.is_file():
+            size = entry.stat().st_size
             files.append({
-                "name": path.name,
-                "size_bytes": path.stat().st_size,
-                "size_human": _human_readable_size(path.stat().st_size),
+                "name": entry.name,
+                "size_bytes": size,
+                "size_human": _human_readable_size(size),
             })
 
     return files
@@ -125,6 +129,58 @@ def _human_readable_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f} TB"
 
 
+# Flat output files that organize_export_structure moves into Sourcefiles/
+SOURCEFILES_NAMES = frozenset({
+    "heightmap.asc",
+    "heightmap.png",
+    "heightmap_preview.png",
+    "satellite_map.png",
+    "surface_grass.png",
+    "surface_forest_floor.png",
+    "surface_pine_floor.png",
+    "surface_asphalt.png",
+    "surface_gravel.png",
+    "surface_crop.png",
+    "surface_dirt.png",
+    "surface_rock.png",
+    "surface_sand.png",
+    "surface_water_edge.png",
+    "surface_preview.png",
+})
+
+# Flat output files that organize_export_structure moves into Reference/
+# (plus every osm_*.geojson, see export_relpath).
+REFERENCE_NAMES = frozenset({
+    "roads_enfusion.geojson",
+    "roads_enfusion_local.geojson",
+    "roads_splines.csv",
+    "roads_reference.csv",
+    "features.json",
+    "metadata.json",
+})
+
+# Replaced by SETUP_GUIDE.md; removed from the export.
+_LEGACY_NAMES = frozenset({"IMPORT_GUIDE.md"})
+
+
+def export_relpath(name: str) -> Optional[str]:
+    """
+    Final location, relative to the job output directory, of a flat output
+    file once organize_export_structure has run.
+
+    Returns "Sourcefiles/<name>", "Reference/<name>", the name unchanged for
+    files that stay at the top level, or None for files the export drops.
+    Lets the export ZIP be filled before the files are actually moved.
+    """
+    if name in _LEGACY_NAMES:
+        return None
+    if name in SOURCEFILES_NAMES:
+        return f"Sourcefiles/{name}"
+    if name in REFERENCE_NAMES or (name.startswith("osm_") and name.endswith(".geojson")):
+        return f"Reference/{name}"
+    return name
+
+
 def organize_export_structure(output_dir: Path, map_name: str, job=None):
     """
     Organize flat output files into the Enfusion project folder structure.
@@ -144,70 +200,32 @@ def organize_export_structure(output_dir: Path, map_name: str, job=None):
         output_dir: The job output directory containing all generated files.
         map_name: Sanitized project name.
     """
-    sourcefiles_dir = output_dir / "Sourcefiles"
-    reference_dir = output_dir / "Reference"
-    sourcefiles_dir.mkdir(exist_ok=True)
-    reference_dir.mkdir(exist_ok=True)
+    (output_dir / "Sourcefiles").mkdir(exist_ok=True)
+    (output_dir / "Reference").mkdir(exist_ok=True)
 
-    # Count total files to organize
-    n_files = sum(1 for f in output_dir.iterdir() if f.is_file())
+    with os.scandir(output_dir) as it:
+        names = [entry.name for entry in it if entry.is_file()]
     if job:
-        job.add_log(f"Organizing {n_files} files into Enfusion project structure...")
-
-    # Files to move to Sourcefiles/
-    sourcefiles_patterns = [
-        "heightmap.asc",
-        "heightmap.png",
-        "heightmap_preview.png",
-        "satellite_map.png",
-        "surface_grass.png",
-        "surface_forest_floor.png",
-        "surface_pine_floor.png",
-        "surface_asphalt.png",
-        "surface_gravel.png",
-        "surface_crop.png",
-        "surface_dirt.png",
-        "surface_rock.png",
-        "surface_sand.png",
-        "surface_water_edge.png",
-        "surface_preview.png",
-    ]
-
-    # Files to move to Reference/
-    reference_patterns = [
-        "roads_enfusion.geojson",
-        "roads_enfusion_local.geojson",
-        "roads_splines.csv",
-        "roads_reference.csv",
-        "features.json",
-        "metadata.json",
-    ]
-
-    # Also move any osm_*.geojson files to Reference/
-    osm_files = [
-        f.name for f in output_dir.iterdir()
-        if f.is_file() and f.name.startswith("osm_") and f.name.endswith(".geojson")
-    ]
-    reference_patterns.extend(osm_files)
-
-    def _safe_move(src: Path, dst_dir: Path):
-        """Move file to directory if it exists, skip silently otherwise."""
-        if src.exists() and src.is_file():
-            dst = dst_dir / src.name
-            if not dst.exists():  # Don't overwrite if already in place
-                shutil.move(str(src), str(dst))
-                logger.debug(f"Moved {src.name} -> {dst_dir.name}/")
-
-    for pattern in sourcefiles_patterns:
-        _safe_move(output_dir / pattern, sourcefiles_dir)
-
-    for pattern in reference_patterns:
-        _safe_move(output_dir / pattern, reference_dir)
-
-    # Remove old IMPORT_GUIDE.md if it exists (replaced by SETUP_GUIDE.md)
-    old_guide = output_dir / "IMPORT_GUIDE.md"
-    if old_guide.exists():
-        old_guide.unlink()
+        job.add_log(f"Organizing {len(names)} files into Enfusion project structure...")
+
+    for name in names:
+        src = output_dir / name
+        relpath = export_relpath(name)
+        if relpath is None:
+            # e.g. the old IMPORT_GUIDE.md (replaced by SETUP_GUIDE.md)
+            src.unlink()
+            continue
+        if relpath == name:
+            continue
+        dst = output_dir / relpath
+        if dst.exists():  # Don't overwrite if already in place
+            continue
+        try:
+            # Same directory tree, so normally a single rename(2)
+            os.rename(src, dst)
+        except OSError:
+            shutil.move(str(src), str(dst))
+        logger.debug(f"Moved {name} -> {dst.parent.name}/")
 
     logger.info(f"Organized export structure for {map_name}")
 
@@ -9,10 +9,9 @@ Extracts and processes geographic features for Arma Reforger:
 """
 
 import logging
+import math
 from typing import Optional
 
-import numpy as np
-
 logger = logging.getLogger(__name__)
 
 
@@ -448,13 +447,15 @@ def _estimate_building_rotation(geom: dict) -> float:
     max_len = 0
     best_angle = 0
 
+    # Plain-float math: numpy ufuncs on scalars cost ~1 µs each and this
+    # runs per edge of every building. Keeps the result a JSON-native float.
     for i in range(len(coords) - 1):
         dx = coords[i + 1][0] - coords[i][0]
         dy = coords[i + 1][1] - coords[i][1]
-        length = np.sqrt(dx**2 + dy**2)
+        length = math.hypot(dx, dy)
         if length > max_len:
             max_len = length
-            best_angle = np.degrees(np.arctan2(dy, dx))
+            best_angle = math.degrees(math.atan2(dy, dx))
 
     return best_angle % 360
 
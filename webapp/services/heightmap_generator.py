@@ -12,6 +12,7 @@ Merges:
 
 from __future__ import annotations
 
+import contextlib
 import json
 import logging
 import tempfile
@@ -48,33 +49,46 @@ class ElevationTruncatedError(Exception):
 # GeoTIFF to array with nodata interpolation
 # ---------------------------------------------------------------------------
 
-def geotiff_to_array(geotiff_bytes: bytes) -> tuple[np.ndarray, dict]:
+def geotiff_to_array(geotiff_bytes: bytes | Path) -> tuple[np.ndarray, dict]:
     """
     Convert GeoTIFF bytes to numpy array and metadata.
     Handles nodata values by interpolating from nearest valid neighbours.
 
+    `geotiff_bytes` may also be a path to a GeoTIFF on disk, which GDAL
+    reads directly instead of going through an in-memory copy.
+
     Returns:
         (elevation_array, metadata_dict)
     """
     import rasterio
     from rasterio.io import MemoryFile
 
+    geotiff_path = None
+    if isinstance(geotiff_bytes, (str, Path)):
+        geotiff_path = Path(geotiff_bytes)
+        data_size = geotiff_path.stat().st_size
+        with open(geotiff_path, "rb") as f:
+            head = f.read(512)
+    else:
+        data_size = len(geotiff_bytes) if geotiff_bytes else 0
+        head = geotiff_bytes[:512] if geotiff_bytes else b""
+
     # Validate input data
-    if not geotiff_bytes:
+    if not data_size:
         raise ValueError("Empty GeoTIFF data provided")
 
-    if len(geotiff_bytes) < 8:
-        raise ValueError(f"GeoTIFF data too small ({len(geotiff_bytes)} bytes)")
+    if data_size < 8:
+        raise ValueError(f"GeoTIFF data too small ({data_size} bytes)")
 
     # Check for valid TIFF magic bytes
-    if geotiff_bytes[:4] not in (b"II*\x00", b"MM\x00*"):
-        first_bytes = geotiff_bytes[:8].hex()
+    if head[:4] not in (b"II*\x00", b"MM\x00*"):
+        first_bytes = head[:8].hex()
         logger.error(f"Invalid TIFF magic bytes. First 8 bytes: {first_bytes}")
 
         # Check if this is an XML error response
-        if geotiff_bytes.startswith(b"<?xml") or geotiff_bytes.startswith(b"<"):
+        if head.startswith(b"<?xml") or head.startswith(b"<"):
             try:
-                xml_preview = geotiff_bytes[:500].decode('utf-8', errors='replace')
+                xml_preview = head[:500].decode('utf-8', errors='replace')
                 logger.error(f"Response appears to be XML (likely a WCS error): {xml_preview}")
                 raise ValueError(
                     f"Elevation service returned an XML error instead of a GeoTIFF. "
@@ -90,24 +104,39 @@ def geotiff_to_array(geotiff_bytes: bytes) -> tuple[np.ndarray, dict]:
             f"got: {first_bytes}"
         )
 
-    logger.debug(f"Opening GeoTIFF from memory ({len(geotiff_bytes)} bytes)")
-
     try:
-        with MemoryFile(geotiff_bytes) as memfile:
-            with memfile.open() as dataset:
-                elevation = dataset.read(1).astype(np.float32)
-                metadata = {
-                    "crs": str(dataset.crs),
-                    "transform": dataset.transform,
-                    "width": dataset.width,
-                    "height": dataset.height,
-                    "bounds": dataset.bounds,
-                    "nodata": dataset.nodata,
-                    "resolution": dataset.res,
-                }
+        with contextlib.ExitStack() as stack:
+            if geotiff_path is not None:
+                logger.debug(f"Opening GeoTIFF from {geotiff_path} ({data_size} bytes)")
+                dataset = stack.enter_context(rasterio.open(geotiff_path))
+            else:
+                logger.debug(f"Opening GeoTIFF from memory ({data_size} bytes)")
+                memfile = stack.enter_context(MemoryFile(geotiff_bytes))
+                dataset = stack.enter_context(memfile.open())
+            raw = dataset.read(1)
+            elevation = raw.astype(np.float32)
+            # Apply the band scale/offset (e.g. STAC elevation is
+            # stored as int16 decimetres with scale 0.1). Flag
+            # nodata as NaN first so the sentinel is not rescaled
+            # into a plausible-looking elevation.
+            scale, offset = dataset.scales[0], dataset.offsets[0]
+            if scale != 1.0 or offset != 0.0:
+                if dataset.nodata is not None:
+                    elevation[raw == dataset.nodata] = np.nan
+                elevation *= scale
+                elevation += offset
+            metadata = {
+                "crs": str(dataset.crs),
+                "transform": dataset.transform,
+                "width": dataset.width,
+                "height": dataset.height,
+                "bounds": dataset.bounds,
+                "nodata": dataset.nodata,
+                "resolution": dataset.res,
+            }
     except Exception as e:
         logger.error(f"Failed to read GeoTIFF: {e}")
-        logger.error(f"Data size: {len(geotiff_bytes)} bytes, first 100 bytes: {geotiff_bytes[:100].hex()}")
+        logger.error(f"Data size: {data_size} bytes, first 100 bytes: {head[:100].hex()}")
         raise
 
     # Interpolate nodata values using nearest-neighbour.
@@ -599,7 +628,7 @@ def save_metadata(metadata: dict, output_path: str) -> str:
 # ---------------------------------------------------------------------------
 
 def generate_heightmap(
-    dem_bytes: bytes,
+    dem_bytes: bytes | Path,
     road_features: Optional[dict] = None,
     water_features: Optional[dict] = None,
     target_size: int | tuple[int, int] = 4096,
@@ -611,7 +640,7 @@ def generate_heightmap(
     Main heightmap generation pipeline.
 
     Args:
-        dem_bytes: Raw GeoTIFF DEM data
+        dem_bytes: Raw GeoTIFF DEM data, or a path to the GeoTIFF on disk
         road_features: GeoJSON roads for flattening
         water_features: GeoJSON water bodies for leveling
         target_size: Output heightmap dimensions (pixels).
@@ -654,7 +683,11 @@ def generate_heightmap(
     # 1. Parse GeoTIFF
     logger.info("Parsing DEM data...")
     if job:
-        job.add_log(f"Validating elevation data ({len(dem_bytes) / 1024 / 1024:.1f} MB)...")
+        dem_size = (
+            Path(dem_bytes).stat().st_size
+            if isinstance(dem_bytes, (str, Path)) else len(dem_bytes)
+        )
+        job.add_log(f"Validating elevation data ({dem_size / 1024 / 1024:.1f} MB)...")
         job.progress = 42
     elevation, metadata = geotiff_to_array(dem_bytes)
 
@@ -779,6 +812,13 @@ def generate_heightmap(
     )
     preview_path = save_heightmap_preview(heightmap, str(output_dir / "heightmap_preview.png"))
 
+    # Steps 5, 8, 9 and 11 all read this array, partly concurrently from
+    # worker threads. Hand out one float32 C-contiguous buffer (a no-op for
+    # the usual float32 pipeline) and make it read-only, so every consumer
+    # shares the same pages and none can mutate it under another.
+    elevation = np.ascontiguousarray(elevation, dtype=np.float32)
+    elevation.setflags(write=False)
+
     return {
         "heightmap_png": png_path,
         "heightmap_asc": asc_path,
@@ -789,6 +829,12 @@ def generate_heightmap(
         "terrain_grid_size": f"{heightmap.shape[1] - 1}x{heightmap.shape[0] - 1}",
         "terrain_size_m": f"{(heightmap.shape[1] - 1) * target_resolution_m:.0f}x{(heightmap.shape[0] - 1) * target_resolution_m:.0f}",
         "grid_cell_size_m": target_resolution_m,
+        # Numeric forms of the strings above, so callers don't re-parse them.
+        "dimensions_px": (heightmap.shape[1], heightmap.shape[0]),
+        "terrain_size_m_xy": (
+            (heightmap.shape[1] - 1) * target_resolution_m,
+            (heightmap.shape[0] - 1) * target_resolution_m,
+        ),
         # Intermediate arrays for downstream steps (e.g. surface mask generation)
         # so callers don't need to re-parse the DEM from raw bytes.
         "_elevation_array": elevation,
@@ -26,9 +26,10 @@ if TYPE_CHECKING:
 _APP_LOGGER_PREFIXES = ("main", "services.", "middleware.")
 _APP_LOGGER_EXACT = {"main", "services", "middleware"}
 
-# Hard cap on per-job log entries to prevent runaway memory if a service
-# spins in a tight logging loop. Jobs are short-lived (cleaned up after 10
-# minutes); this just protects against pathological cases.
+# Hard cap on per-job log entries (the size of MapGenerationJob.logs) to
+# prevent runaway memory if a service spins in a tight logging loop. Jobs
+# are short-lived (cleaned up after 10 minutes); this just protects against
+# pathological cases.
 MAX_LOGS_PER_JOB = 5000
 
 # Map Python logging levels to the frontend's level names (info/success/warning/error).
@@ -47,14 +48,32 @@ current_job_var: ContextVar[Optional["MapGenerationJob"]] = ContextVar(
 
 
 def _is_app_logger(name: str) -> bool:
-    if name in _APP_LOGGER_EXACT:
-        return True
-    return any(name.startswith(prefix) for prefix in _APP_LOGGER_PREFIXES)
+    return name in _APP_LOGGER_EXACT or name.startswith(_APP_LOGGER_PREFIXES)
 
 
 class JobLogHandler(logging.Handler):
     """Append matching log records to the current job's activity log."""
 
+    def handle(self, record: logging.LogRecord):
+        """
+        Filter and emit `record` without taking the handler lock.
+
+        logging.Handler.handle() serializes every emit() on a per-handler
+        RLock. That would make pipeline stages running in parallel worker
+        threads (roads, features, masks...) queue behind each other for
+        every log call, even for records from different jobs. emit() keeps
+        no handler state; the one shared mutation is job.append_log_entry,
+        which takes that job's own lock. The lock itself is left in place
+        for anything else (e.g. setFormatter) that still acquires it.
+        """
+        rv = self.filter(record)
+        # Python 3.12+ filters may return a replacement record.
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
+
     def emit(self, record: logging.LogRecord) -> None:
         job = current_job_var.get()
         if job is None:
@@ -83,11 +102,9 @@ class JobLogHandler(logging.Handler):
             "level": _LEVEL_MAP.get(record.levelno, "info"),
             "message": message,
         }
-        logs = job.logs
-        logs.append(entry)
-        overflow = len(logs) - MAX_LOGS_PER_JOB
-        if overflow > 0:
-            del logs[:overflow]
+        # job.logs is a bounded deque (MAX_LOGS_PER_JOB), so the oldest
+        # entries are evicted automatically.
+        job.append_log_entry(entry)
 
 
 _installed = False
@@ -24,7 +24,10 @@ import logging
 from typing import Optional
 
 from config.lantmateriet import LANTMATERIET_CONFIG
-from services.lantmateriet.ogc_features_client import fetch_ogc_collection
+from services.lantmateriet.ogc_features_client import (
+    fetch_ogc_collection,
+    ogc_client,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -270,24 +273,25 @@ async def fetch_lantmateriet_water(
     if job:
         job.add_log("Fetching water features from Lantmäteriet Hydrografi...")
 
-    # Fetch all collections concurrently
-    standing_task = fetch_ogc_collection(
-        base_url, "StandingWater", bbox_wgs84, job=job
-    )
-    line_task = fetch_ogc_collection(
-        base_url, "WatercourseLine", bbox_wgs84, job=job
-    )
-    polygon_task = fetch_ogc_collection(
-        base_url, "WatercoursePolygon", bbox_wgs84, job=job
-    )
-    wetland_task = fetch_ogc_collection(
-        base_url, "Wetland", bbox_wgs84, job=job
-    )
-
-    results = await asyncio.gather(
-        standing_task, line_task, polygon_task, wetland_task,
-        return_exceptions=True,
-    )
+    # Fetch all collections concurrently over one shared connection pool
+    async with ogc_client() as client:
+        standing_task = fetch_ogc_collection(
+            base_url, "StandingWater", bbox_wgs84, job=job, client=client
+        )
+        line_task = fetch_ogc_collection(
+            base_url, "WatercourseLine", bbox_wgs84, job=job, client=client
+        )
+        polygon_task = fetch_ogc_collection(
+            base_url, "WatercoursePolygon", bbox_wgs84, job=job, client=client
+        )
+        wetland_task = fetch_ogc_collection(
+            base_url, "Wetland", bbox_wgs84, job=job, client=client
+        )
+
+        results = await asyncio.gather(
+            standing_task, line_task, polygon_task, wetland_task,
+            return_exceptions=True,
+        )
 
     standing_raw, line_raw, polygon_raw, wetland_raw = results
 
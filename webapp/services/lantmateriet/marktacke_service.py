@@ -23,7 +23,10 @@ import logging
 from typing import Optional
 
 from config.lantmateriet import LANTMATERIET_CONFIG
-from services.lantmateriet.ogc_features_client import fetch_ogc_collection
+from services.lantmateriet.ogc_features_client import (
+    fetch_ogc_collection,
+    ogc_client,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -365,18 +368,19 @@ async def fetch_lantmateriet_land_cover(
             "Fetching land cover from Lantmäteriet Marktäcke..."
         )
 
-    # Fetch both collections concurrently
-    markytor_task = fetch_ogc_collection(
-        base_url, "markytor", bbox_wgs84, job=job
-    )
-    sankmark_task = fetch_ogc_collection(
-        base_url, "sankmarksytor", bbox_wgs84, job=job
-    )
-
-    results = await asyncio.gather(
-        markytor_task, sankmark_task,
-        return_exceptions=True,
-    )
+    # Fetch both collections concurrently over one shared connection pool
+    async with ogc_client() as client:
+        markytor_task = fetch_ogc_collection(
+            base_url, "markytor", bbox_wgs84, job=job, client=client
+        )
+        sankmark_task = fetch_ogc_collection(
+            base_url, "sankmarksytor", bbox_wgs84, job=job, client=client
+        )
+
+        results = await asyncio.gather(
+            markytor_task, sankmark_task,
+            return_exceptions=True,
+        )
 
     markytor_raw, sankmark_raw = results
 
@@ -40,6 +40,11 @@ RETRY_WAIT_S = 5.0
 RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
 
 
+def _retry_fields(attempt: int) -> dict:
+    """Structured `extra` fields for retry log records (attempt is 0-based)."""
+    return {"attempt": attempt + 1, "max_retries": MAX_RETRIES}
+
+
 async def fetch_historical_orthophoto(
     bbox_wgs84: tuple[float, float, float, float],
     width: int,
@@ -119,12 +124,17 @@ async def fetch_historical_orthophoto(
                 # Retryable status codes
                 if resp.status_code in RETRYABLE_STATUS_CODES:
                     logger.warning(
-                        f"Orthophoto WMS returned {resp.status_code} "
-                        f"(attempt {attempt + 1}/{MAX_RETRIES})"
+                        "Orthophoto WMS returned %d (attempt %d/%d)",
+                        resp.status_code, attempt + 1, MAX_RETRIES,
+                        extra=_retry_fields(attempt),
                     )
                     if attempt < MAX_RETRIES - 1:
                         wait_time = RETRY_WAIT_S * (2 ** attempt)
-                        logger.info(f"Retrying in {wait_time}s...")
+                        logger.info(
+                            "Retrying in %.1fs (attempt %d/%d)",
+                            wait_time, attempt + 2, MAX_RETRIES,
+                            extra=_retry_fields(attempt + 1),
+                        )
                         await asyncio.sleep(wait_time)
                         continue
 
@@ -139,17 +149,28 @@ async def fetch_historical_orthophoto(
             ):
                 wait_time = RETRY_WAIT_S * (2 ** attempt)
                 logger.warning(
-                    f"Orthophoto WMS error {exc.response.status_code}, "
-                    f"retrying in {wait_time}s..."
+                    "Orthophoto WMS error %d, retrying in %.1fs (attempt %d/%d)",
+                    exc.response.status_code, wait_time, attempt + 2, MAX_RETRIES,
+                    extra=_retry_fields(attempt + 1),
                 )
                 await asyncio.sleep(wait_time)
                 continue
-            logger.error(f"Orthophoto WMS HTTP error: {exc.response.status_code}")
+            logger.error("Orthophoto WMS HTTP error: %d", exc.response.status_code)
             return None
+        except asyncio.CancelledError:
+            # Client disconnected / job cancelled: stop retrying right away.
+            # The client context has already closed its pooled connection;
+            # re-raise so the cancellation reaches the caller.
+            logger.info(
+                "Orthophoto WMS fetch cancelled (attempt %d/%d)",
+                attempt + 1, MAX_RETRIES,
+                extra=_retry_fields(attempt),
+            )
+            raise
         except Exception as exc:
             logger.error(f"Error fetching historical orthophoto: {exc}")
             return None
 
     if last_exception:
-        logger.error(f"Orthophoto WMS failed after {MAX_RETRIES} retries")
+        logger.error("Orthophoto WMS failed after %d retries", MAX_RETRIES)
     return None
@@ -0,0 +1,94 @@
+"""
+On-disk cache shared by the Lantmäteriet STAC services (Höjd and Bild).
+
+Both services keep their STAC search responses in the persistent tile cache
+directory (LANTMATERIET_TILE_CACHE_DIR), keyed on the full query so Höjd
+and Bild entries never collide. Search bboxes are snapped outward onto a
+fixed grid first, so repeat and adjacent jobs share an entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from config.lantmateriet import LANTMATERIET_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def tile_cache_dir() -> Optional[Path]:
+    """
+    Persistent tile cache directory, or None when caching is disabled.
+
+    Lantmäteriet elevation tiles change on an annual cadence, so re-rendering
+    the same or an adjacent area can reuse tiles from earlier jobs instead of
+    re-downloading ~10 MB each.
+    """
+    raw = LANTMATERIET_CONFIG.tile_cache_dir
+    if not raw:
+        return None
+    path = Path(raw).expanduser()
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        logger.warning(f"STAC tile cache disabled ({path}): {exc}")
+        return None
+    return path
+
+
+def quantize_bbox_wgs84(
+    bbox: list[float], step: float = 1e-3,
+) -> list[float]:
+    """
+    Expand a WGS84 bbox outward onto a fixed grid (~100 m at 0.001°).
+
+    Nearby requests then share one STAC search cache entry, and because the
+    grid only grows the bbox, the cached result still covers the request.
+    """
+    lon_min, lat_min, lon_max, lat_max = bbox
+    return [
+        round(math.floor(lon_min / step) * step, 6),
+        round(math.floor(lat_min / step) * step, 6),
+        round(math.ceil(lon_max / step) * step, 6),
+        round(math.ceil(lat_max / step) * step, 6),
+    ]
+
+
+def _search_cache_path(cache_dir: Path, query: dict) -> Path:
+    digest = hashlib.sha1(
+        json.dumps(query, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return cache_dir / f"search_{digest}.json"
+
+
+def load_cached_search(cache_dir: Optional[Path], query: dict) -> Optional[dict]:
+    """Return a cached STAC search response younger than the TTL, or None."""
+    if cache_dir is None:
+        return None
+    path = _search_cache_path(cache_dir, query)
+    try:
+        if time.time() - path.stat().st_mtime > LANTMATERIET_CONFIG.stac_search_cache_ttl_s:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_search(cache_dir: Optional[Path], query: dict, result: dict) -> None:
+    if cache_dir is None:
+        return
+    path = _search_cache_path(cache_dir, query)
+    part_path = path.with_suffix(f".{os.getpid()}.part")
+    try:
+        part_path.write_text(json.dumps(result), encoding="utf-8")
+        os.replace(part_path, path)
+    except OSError as exc:
+        logger.debug(f"Could not cache STAC search response: {exc}")
+        part_path.unlink(missing_ok=True)
@@ -26,29 +26,86 @@ Workflow:
 1. Convert native CRS bbox to WGS84 (STAC spec requires WGS84 bbox)
 2. Query the STAC search endpoint for items intersecting the bbox
 3. Download COG GeoTIFF assets with Basic Auth (saved to temp files)
-4. Merge tiles from disk and crop to requested bbox
+4. Mosaic tiles from disk (GDAL VRT) and crop to requested bbox
 5. Optionally resample to requested dimensions
-6. Return merged GeoTIFF bytes
+6. Return merged GeoTIFF bytes (tiled, DEFLATE-compressed)
 """
 
 from __future__ import annotations
 
 import asyncio
-import io
+import ctypes
+import gc
 import logging
+import math
+import os
+import re
 import shutil
 import tempfile
+import time
+import traceback
 from pathlib import Path
 from typing import Optional
 
 import httpx
 import numpy as np
+import rasterio
+from pyproj import Transformer
+from rasterio.enums import Resampling
+from rasterio.transform import from_bounds
+from rasterio.vrt import WarpedVRT
+from rasterio.windows import from_bounds as window_from_bounds
+
+# GDAL's Python bindings are only needed to build the multi-tile VRT mosaic.
+# Keep the module importable without them (single-tile requests still work).
+try:
+    from osgeo import gdal
+except ImportError:  # pragma: no cover - depends on system GDAL packaging
+    gdal = None
 
 from config.lantmateriet import LANTMATERIET_CONFIG
 from services.lantmateriet.auth import get_basic_auth_header
+from services.lantmateriet.stac_cache import (
+    load_cached_search,
+    quantize_bbox_wgs84,
+    store_cached_search,
+    tile_cache_dir,
+)
+from services.utils.geo import cached_transformer
 
 logger = logging.getLogger(__name__)
 
+# Upper estimate of one downloaded tile (2500×2500 float32 ≈ 10 MB + headers),
+# used for the scratch-space pre-check.
+_TILE_SIZE_ESTIMATE_BYTES = 12_000_000
+
+# Concurrent tile downloads; also caps the HTTP connection pool.
+_MAX_CONCURRENT_DOWNLOADS = 4
+
+# The merged DEM is stored as int16 decimetres (scale 0.1 m) instead of
+# float32 metres: Swedish elevations (~-10 m to ~2100 m) fit comfortably
+# in ±3276.7 m, and it halves the output GeoTIFF and the downstream buffers.
+_OUTPUT_SCALE = 0.1
+_OUTPUT_NODATA = -32768
+
+
+def _quantize_elevation(
+    data: np.ndarray, nodata: float | None
+) -> np.ndarray:
+    """
+    Convert float elevations in metres to int16 decimetres.
+
+    Source nodata and NaN pixels map to _OUTPUT_NODATA; valid values are
+    clipped to the int16 range so they can never collide with it.
+    """
+    invalid = ~np.isfinite(data)
+    if nodata is not None:
+        invalid |= data == nodata
+    scaled = np.rint(data / _OUTPUT_SCALE)
+    np.clip(scaled, _OUTPUT_NODATA + 1, np.iinfo(np.int16).max, out=scaled)
+    scaled[invalid] = _OUTPUT_NODATA
+    return scaled.astype(np.int16)
+
 
 def _is_raster_asset(asset: Optional[dict]) -> bool:
     """
@@ -71,6 +128,156 @@ def _is_raster_asset(asset: Optional[dict]) -> bool:
     return False
 
 
+def _get_transformer(crs: str) -> Transformer:
+    """
+    Cached native CRS → WGS84 transformer.
+
+    Transformer.from_crs() loads the PROJ database and builds the operation
+    pipeline (tens of ms), so reuse one instance per CRS across requests.
+    """
+    return cached_transformer(crs, "EPSG:4326")
+
+
+# SWEREF 99 TM (EPSG:3006): GRS80 ellipsoid, central meridian 15°E.
+_GRS80_A = 6378137.0
+_GRS80_F = 1 / 298.257222101
+_SWEREF99TM_K0 = 0.9996
+_SWEREF99TM_FE = 500000.0
+_SWEREF99TM_LON0 = math.radians(15.0)
+
+
+def _sweref99tm_to_wgs84(easting: float, northing: float) -> tuple[float, float]:
+    """
+    Inverse SWEREF 99 TM projection → (lon, lat) in degrees.
+
+    Closed-form Gauss–Krüger series as published by Lantmäteriet
+    ("Gauss-Krügers projektion", 4th-order terms), accurate to well under
+    a millimetre within Sweden. SWEREF 99 and WGS84 coincide at the
+    metre level, which is far below the STAC search granularity.
+    """
+    f = _GRS80_F
+    e2 = f * (2 - f)
+    n = f / (2 - f)
+    a_hat = _GRS80_A / (1 + n) * (1 + n ** 2 / 4 + n ** 4 / 64)
+
+    d1 = n / 2 - 2 * n ** 2 / 3 + 37 * n ** 3 / 96 - n ** 4 / 360
+    d2 = n ** 2 / 48 + n ** 3 / 15 - 437 * n ** 4 / 1440
+    d3 = 17 * n ** 3 / 480 - 37 * n ** 4 / 840
+    d4 = 4397 * n ** 4 / 161280
+
+    a_star = e2 + e2 ** 2 + e2 ** 3 + e2 ** 4
+    b_star = -(7 * e2 ** 2 + 17 * e2 ** 3 + 30 * e2 ** 4) / 6
+    c_star = (224 * e2 ** 3 + 889 * e2 ** 4) / 120
+    d_star = -(4279 * e2 ** 4) / 1260
+
+    xi = northing / (_SWEREF99TM_K0 * a_hat)
+    eta = (easting - _SWEREF99TM_FE) / (_SWEREF99TM_K0 * a_hat)
+
+    xi_p = xi
+    eta_p = eta
+    for k, d in ((2, d1), (4, d2), (6, d3), (8, d4)):
+        xi_p -= d * math.sin(k * xi) * math.cosh(k * eta)
+        eta_p -= d * math.cos(k * xi) * math.sinh(k * eta)
+
+    phi_star = math.asin(math.sin(xi_p) / math.cosh(eta_p))
+    d_lambda = math.atan(math.sinh(eta_p) / math.cos(xi_p))
+
+    sin2 = math.sin(phi_star) ** 2
+    phi = phi_star + math.sin(phi_star) * math.cos(phi_star) * (
+        a_star + b_star * sin2 + c_star * sin2 ** 2 + d_star * sin2 ** 3
+    )
+    return math.degrees(_SWEREF99TM_LON0 + d_lambda), math.degrees(phi)
+
+
+def _bbox_to_wgs84(
+    bbox_native: tuple[float, float, float, float],
+    crs: str,
+) -> tuple[float, float, float, float]:
+    """
+    Convert a native-CRS (min_x, min_y, max_x, max_y) bbox to WGS84.
+
+    Callers that already pass EPSG:4326 skip pyproj entirely, and the
+    common EPSG:3006 case uses the closed-form inverse above instead of
+    loading the PROJ database. Other CRSs fall back to pyproj.
+    """
+    if crs.upper() in ("EPSG:4326", "4326"):
+        return tuple(bbox_native)
+    x_min, y_min, x_max, y_max = bbox_native
+    if crs.upper() in ("EPSG:3006", "3006"):
+        lon_min, lat_min = _sweref99tm_to_wgs84(x_min, y_min)
+        lon_max, lat_max = _sweref99tm_to_wgs84(x_max, y_max)
+        return (lon_min, lat_min, lon_max, lat_max)
+    transformer = _get_transformer(crs)
+    lon_min, lat_min = transformer.transform(x_min, y_min)
+    lon_max, lat_max = transformer.transform(x_max, y_max)
+    return (lon_min, lat_min, lon_max, lat_max)
+
+
+def _get_inverse_transformer(crs: str) -> Transformer:
+    """Cached WGS84 → native CRS transformer (see _get_transformer)."""
+    return cached_transformer("EPSG:4326", crs)
+
+
+def _filter_features_to_bbox(
+    features: list[dict],
+    bbox_native: tuple[float, float, float, float],
+    crs: str,
+) -> list[dict]:
+    """
+    Drop STAC items that don't overlap the native bbox; nearest first.
+
+    The search runs on the (outward-quantized) WGS84 envelope, which picks
+    up tiles that fall entirely outside the native-CRS bbox. Each item's
+    WGS84 `bbox` is projected back (all four corners, so the envelope stays
+    conservative) and tested for overlap. Survivors are ordered by distance
+    from the bbox centre so the most important tiles download first. Items
+    without a usable `bbox` are kept.
+    """
+    x_min, y_min, x_max, y_max = bbox_native
+    cx, cy = (x_min + x_max) / 2, (y_min + y_max) / 2
+    is_wgs84 = crs.upper() in ("EPSG:4326", "4326")
+
+    kept: list[tuple[float, dict]] = []
+    for feat in features:
+        fb = feat.get("bbox")
+        if not fb or len(fb) < 4:
+            kept.append((0.0, feat))
+            continue
+        lon0, lat0, lon1, lat1 = fb[0], fb[1], fb[-2], fb[-1]
+        if is_wgs84:
+            xs, ys = (lon0, lon1), (lat0, lat1)
+        else:
+            xs, ys = _get_inverse_transformer(crs).transform(
+                [lon0, lon1, lon0, lon1], [lat0, lat0, lat1, lat1]
+            )
+        fx_min, fx_max = min(xs), max(xs)
+        fy_min, fy_max = min(ys), max(ys)
+        if fx_max < x_min or fx_min > x_max or fy_max < y_min or fy_min > y_max:
+            continue
+        dist = math.hypot((fx_min + fx_max) / 2 - cx, (fy_min + fy_max) / 2 - cy)
+        kept.append((dist, feat))
+
+    kept.sort(key=lambda item: item[0])
+    return [feat for _, feat in kept]
+
+
+def _log_auth_failure(status_code: int) -> None:
+    """Log the actionable message for a 401/403 from the tile download host."""
+    if status_code == 403:
+        logger.error(
+            "STAC Höjd tile download returned HTTP 403 Forbidden. "
+            "Your Lantmäteriet credentials are recognized but your "
+            "account is NOT authorized for Höjddata downloads. "
+            "You may need to subscribe to the 'Höjddata' product at "
+            "https://apimanager.lantmateriet.se/"
+        )
+    else:
+        logger.error(
+            "STAC Höjd tile download returned HTTP 401 Unauthorized. "
+            "Check LANTMATERIET_USERNAME and LANTMATERIET_PASSWORD in .env"
+        )
+
+
 def _get_download_headers() -> dict:
     """
     Get headers for downloading assets from dl1.lantmateriet.se.
@@ -88,6 +295,265 @@ def _get_download_headers() -> dict:
     return headers
 
 
+def _tile_cache_key(feat: dict, tile_id: str) -> str:
+    """Filesystem-safe cache key for a STAC item (collection + item id)."""
+    raw = f"{feat.get('collection', '')}_{tile_id}".strip("_")
+    return re.sub(r"[^A-Za-z0-9._-]", "_", raw)
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-link src to dst, falling back to a copy across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _lookup_cached_tile(
+    cache_dir: Path, key: str, expected_size: object,
+) -> Optional[Path]:
+    """
+    Return the cached tile for key, or None on a miss.
+
+    A cached file whose size disagrees with the STAC `file:size` is treated
+    as stale (the tile was republished) and ignored.
+    """
+    cache_path = cache_dir / f"{key}.tif"
+    try:
+        size = cache_path.stat().st_size
+    except OSError:
+        return None
+    if size == 0 or (isinstance(expected_size, int) and size != expected_size):
+        return None
+    try:
+        os.utime(cache_path)  # Bump mtime so pruning evicts least-recently-used
+    except OSError:
+        pass
+    return cache_path
+
+
+def _store_cached_tile(tile_path: Path, cache_dir: Path, key: str) -> None:
+    """Publish a downloaded tile into the cache with an atomic rename."""
+    cache_path = cache_dir / f"{key}.tif"
+    part_path = cache_dir / f".{key}.{os.getpid()}.part"
+    try:
+        _link_or_copy(tile_path, part_path)
+        os.replace(part_path, cache_path)
+    except OSError as exc:
+        logger.debug(f"Could not cache STAC tile {key}: {exc}")
+        part_path.unlink(missing_ok=True)
+
+
+def _prune_tile_cache(cache_dir: Path, max_bytes: int) -> None:
+    """
+    Drop expired STAC search responses, then evict least-recently-used
+    tiles until the cache fits in max_bytes.
+    """
+    cutoff = time.time() - LANTMATERIET_CONFIG.stac_search_cache_ttl_s
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if (
+                    entry.name.startswith("search_")
+                    and entry.name.endswith(".json")
+                    and entry.stat().st_mtime < cutoff
+                ):
+                    Path(entry.path).unlink(missing_ok=True)
+    except OSError:
+        pass
+    try:
+        entries = [
+            (st.st_mtime, st.st_size, p)
+            for p in cache_dir.glob("*.tif")
+            for st in (p.stat(),)
+        ]
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+def _merge_and_write(
+    tile_paths: list[Path],
+    bbox_native: tuple[float, float, float, float],
+    crs: str,
+    target_width: int | None,
+    target_height: int | None,
+    tmp_dir: str,
+    job=None,
+) -> tuple[bytes, int, int]:
+    """
+    Mosaic downloaded tiles, reproject/crop to the bbox and encode a GeoTIFF.
+
+    Synchronous — every step is a blocking GDAL call, so the caller runs it
+    on a worker thread (GDAL releases the GIL during I/O and warping).
+
+    Returns:
+        (geotiff_bytes, width_px, height_px)
+    """
+    x_min, y_min, x_max, y_max = bbox_native
+
+    # 3. Build a mosaic view over the tiles on disk
+    #    A GDAL VRT stitches the tiles on the fly instead of
+    #    rasterio_merge() materialising the full mosaic as a NumPy
+    #    array (~400 MB float32 for a 20 km × 20 km area). The
+    #    reproject step below then reads only the blocks it needs.
+    #    A single tile is read directly — no VRT needed.
+    if len(tile_paths) == 1:
+        mosaic_path = tile_paths[0]
+    else:
+        if gdal is None:
+            raise RuntimeError(
+                "GDAL Python bindings (osgeo) are required to mosaic "
+                "multiple elevation tiles"
+            )
+        mosaic_path = Path(tmp_dir) / "mosaic.vrt"
+        vrt = gdal.BuildVRT(
+            str(mosaic_path), [str(p) for p in tile_paths]
+        )
+        if vrt is None:
+            raise RuntimeError("gdal.BuildVRT failed to mosaic elevation tiles")
+        vrt = None  # Close the handle — flushes the VRT XML to disk
+
+    with rasterio.open(mosaic_path) as src:
+        # Detect the source CRS from the mosaic
+        # (Lantmäteriet tiles use EPSG:5845 = SWEREF 99 TM + RH 2000)
+        src_crs = str(src.crs)
+        logger.info(f"Source tile CRS: {src_crs}")
+
+        # Read nodata value from the tiles — needed for reproject
+        # to correctly handle sea/void pixels.
+        nodata_val = src.nodata
+        logger.info(f"Source tile nodata value: {nodata_val}")
+
+        logger.info(
+            f"Mosaicked {len(tile_paths)} tiles into "
+            f"{src.width}x{src.height} px virtual raster"
+        )
+
+        profile = src.profile.copy()
+        profile["driver"] = "GTiff"
+
+        # 4. Reproject to target CRS (EPSG:3006) and crop to bbox
+        out_h, out_w = src.height, src.width
+        needs_reproject = (
+            (target_width and target_height) or
+            (src_crs != crs and src_crs != f"EPSG:{crs.split(':')[1] if ':' in crs else crs}")
+        )
+
+        if target_width and target_height:
+            out_w, out_h = target_width, target_height
+
+        # 5. Write merged GeoTIFF to a temp file, then read its bytes
+        #    Ensure nodata is preserved so downstream geotiff_to_array()
+        #    can identify and interpolate sea/void pixels.
+        #    Writing to disk (not io.BytesIO) avoids holding the
+        #    BytesIO buffer and its getvalue() copy at the same time;
+        #    tiled DEFLATE shrinks the spatially correlated
+        #    elevation payload further (predictor 2 = horizontal
+        #    differencing for the int16 decimetre values).
+        output = Path(tmp_dir) / "out.tif"
+        profile.update(
+            dtype="int16",
+            tiled=True,
+            blockxsize=512,
+            blockysize=512,
+            compress="deflate",
+            predictor=2,
+        )
+        if needs_reproject:
+            if job:
+                job.add_log(f"Reprojecting merged elevation to {crs}...")
+            target_transform = from_bounds(
+                x_min, y_min, x_max, y_max, out_w, out_h
+            )
+            profile.update(
+                crs=crs,
+                width=out_w,
+                height=out_h,
+                transform=target_transform,
+                nodata=_OUTPUT_NODATA,
+            )
+            # WarpedVRT fuses mosaic + reproject + crop + resample into
+            # a single lazy gdalwarp pass over the VRT; reading it block
+            # by block streams the warp straight into the output GeoTIFF.
+            # Pixels outside tile coverage are initialised to nodata by
+            # the warper — NaN when the tiles declare none, so they still
+            # end up as the int16 sentinel rather than 0 m.
+            warp_nodata = nodata_val
+            if warp_nodata is None and np.dtype(src.dtypes[0]).kind == "f":
+                warp_nodata = float("nan")
+            with WarpedVRT(
+                src,
+                crs=crs,
+                transform=target_transform,
+                width=out_w,
+                height=out_h,
+                nodata=warp_nodata,
+                resampling=Resampling.bilinear,
+                warp_extras={
+                    "NUM_THREADS": os.cpu_count() or 2,
+                    "INIT_DEST": "NO_DATA",
+                },
+            ) as wvrt:
+                with rasterio.open(output, "w", **profile) as dst:
+                    dst.scales = (_OUTPUT_SCALE,)
+                    dst.offsets = (0.0,)
+                    for _, window in wvrt.block_windows(1):
+                        block = wvrt.read(window=window)
+                        dst.write(
+                            _quantize_elevation(block, nodata_val),
+                            window=window,
+                        )
+        else:
+            # Same CRS at native resolution: read only the bbox
+            # window instead of decoding the whole mosaic.
+            window = window_from_bounds(
+                x_min, y_min, x_max, y_max, transform=src.transform
+            ).round_offsets().round_lengths()
+            out_w, out_h = int(window.width), int(window.height)
+            profile.update(
+                width=out_w,
+                height=out_h,
+                transform=src.window_transform(window),
+                nodata=_OUTPUT_NODATA,
+            )
+            fill = nodata_val if nodata_val is not None else np.nan
+            with rasterio.open(output, "w", **profile) as dst:
+                dst.scales = (_OUTPUT_SCALE,)
+                dst.offsets = (0.0,)
+                data = src.read(
+                    window=window,
+                    boundless=True,
+                    fill_value=fill,
+                )
+                dst.write(_quantize_elevation(data, nodata_val))
+
+    # Release memory from the large read/write buffers.
+    # Python's glibc allocator often holds freed memory as resident
+    # (RSS) instead of returning it to the OS, which can cause OOM
+    # kills when subsequent pipeline steps allocate large arrays.
+    # gc.collect() releases Python objects, and malloc_trim() tells
+    # glibc to return unused heap pages to the OS.
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except Exception:
+        pass  # Not on glibc (e.g. musl/macOS) — skip
+
+    merged_bytes = output.read_bytes()
+    return merged_bytes, out_w, out_h
+
+
 async def fetch_stac_elevation(
     bbox_native: tuple[float, float, float, float],
     crs: str = "EPSG:3006",
@@ -120,13 +586,10 @@ async def fetch_stac_elevation(
 
     # STAC search: bbox must be WGS84 per STAC specification.
     # Convert from native CRS (EPSG:3006) to EPSG:4326.
-    from pyproj import Transformer
-
-    transformer = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
-    x_min, y_min, x_max, y_max = bbox_native
-    lon_min, lat_min = transformer.transform(x_min, y_min)
-    lon_max, lat_max = transformer.transform(x_max, y_max)
-    bbox_wgs84 = [lon_min, lat_min, lon_max, lat_max]
+    lon_min, lat_min, lon_max, lat_max = _bbox_to_wgs84(bbox_native, crs)
+    # Snapped outward to a 0.001° grid so repeat/adjacent requests hit the
+    # same search cache entry.
+    bbox_wgs84 = quantize_bbox_wgs84([lon_min, lat_min, lon_max, lat_max])
 
     # STAC search — no auth needed for the catalog API
     search_headers = {
@@ -141,11 +604,22 @@ async def fetch_stac_elevation(
         # collections (mhm-*) for our bbox
     }
 
+    cache_dir = tile_cache_dir()
+
     # Create a temporary directory for tile files (cleaned up in finally block)
-    tmp_dir = tempfile.mkdtemp(prefix="stac_elev_")
+    scratch_dir = LANTMATERIET_CONFIG.tile_scratch_dir or tempfile.gettempdir()
+    tmp_dir = tempfile.mkdtemp(prefix="stac_elev_", dir=scratch_dir)
 
     try:
-        async with httpx.AsyncClient(timeout=180.0) as client:
+        # The connection pool is capped at the download concurrency, so the
+        # semaphore below is the only rate control needed — no per-tile sleep.
+        async with httpx.AsyncClient(
+            timeout=180.0,
+            limits=httpx.Limits(
+                max_connections=_MAX_CONCURRENT_DOWNLOADS,
+                max_keepalive_connections=_MAX_CONCURRENT_DOWNLOADS,
+            ),
+        ) as client:
             # 1. Search for STAC items covering the bbox
             if job:
                 job.add_log("Searching Lantmäteriet STAC API for elevation tiles...")
@@ -153,10 +627,15 @@ async def fetch_stac_elevation(
                 f"STAC Höjd: searching for elevation items "
                 f"(bbox WGS84: [{lon_min:.4f}, {lat_min:.4f}, {lon_max:.4f}, {lat_max:.4f}])"
             )
-            resp = await client.post(search_url, json=query, headers=search_headers)
-            resp.raise_for_status()
-
-            stac_result = resp.json()
+            stac_result = load_cached_search(cache_dir, query)
+            if stac_result is not None:
+                logger.info("STAC Höjd: using cached search response")
+            else:
+                resp = await client.post(search_url, json=query, headers=search_headers)
+                resp.raise_for_status()
+
+                stac_result = resp.json()
+                store_cached_search(cache_dir, query, stac_result)
             features = stac_result.get("features", [])
 
             if not features:
@@ -185,6 +664,33 @@ async def fetch_stac_elevation(
                 logger.warning("No raster elevation tiles found in STAC Höjd search")
                 return None
 
+            # Drop tiles that only matched the loose WGS84 search envelope
+            overlapping = _filter_features_to_bbox(features, bbox_native, crs)
+            if len(overlapping) < len(features):
+                logger.info(
+                    f"STAC Höjd: skipping {len(features) - len(overlapping)} "
+                    f"tile(s) outside the requested bbox, "
+                    f"{len(overlapping)} remain"
+                )
+            features = overlapping
+
+            if not features:
+                logger.warning("No STAC Höjd tiles overlap the requested bbox")
+                return None
+
+            # Fail fast if the scratch disk can't hold the tiles — otherwise
+            # writes fail mid-download and all prior transfers are wasted.
+            needed_bytes = len(features) * _TILE_SIZE_ESTIMATE_BYTES
+            free_bytes = shutil.disk_usage(tmp_dir).free
+            if free_bytes < needed_bytes:
+                logger.error(
+                    f"STAC Höjd: not enough scratch space in {scratch_dir} "
+                    f"({free_bytes / 1e6:.0f} MB free, ~{needed_bytes / 1e6:.0f} MB "
+                    f"needed for {len(features)} tiles). "
+                    f"Set LANTMATERIET_TILE_SCRATCH_DIR to a larger volume."
+                )
+                return None
+
             if job:
                 job.add_log(f"Found {len(features)} elevation tiles to download")
 
@@ -192,28 +698,47 @@ async def fetch_stac_elevation(
             #    This avoids holding all tiles in memory simultaneously,
             #    which would cause OOM for large areas (63 tiles × ~10 MB each).
             #    Downloads run concurrently (up to 4 at a time) for speed.
-            import rasterio
-            import rasterio.warp
-            from rasterio.merge import merge as rasterio_merge
-            from rasterio.transform import from_bounds
-
             tile_paths: list[Path] = []
             download_errors = 0
             _auth_abort = False  # Set True on 401/403 to stop all downloads
             _tiles_completed = 0  # Counter for activity log progress
             _total_tiles = len(features)
 
+            # Probe auth with a HEAD on the first tile that isn't cached.
+            # A 401/403 aborts before any tile body is transferred instead
+            # of after the first ~10 MB GET.
+            probe_feat = next(
+                (
+                    feat for idx, feat in enumerate(features)
+                    if cache_dir is None or _lookup_cached_tile(
+                        cache_dir,
+                        _tile_cache_key(feat, feat.get("id", f"tile_{idx}")),
+                        feat["assets"]["data"].get("file:size"),
+                    ) is None
+                ),
+                None,
+            )
+            if probe_feat is not None:
+                head_resp = await client.head(
+                    probe_feat["assets"]["data"]["href"],
+                    headers=download_headers,
+                    follow_redirects=True,
+                )
+                if head_resp.status_code in (401, 403):
+                    _log_auth_failure(head_resp.status_code)
+                    return None
+
             # Semaphore limits concurrent downloads to avoid overwhelming
             # Lantmäteriet's download server while still being much faster
             # than sequential (4 concurrent vs 1 sequential).
-            sem = asyncio.Semaphore(4)
+            sem = asyncio.Semaphore(_MAX_CONCURRENT_DOWNLOADS)
 
             async def _download_tile(
                 tile_idx: int,
                 feat: dict,
             ) -> Optional[Path]:
                 """Download a single STAC tile. Returns tile path or None."""
-                nonlocal download_errors, _auth_abort
+                nonlocal download_errors, _auth_abort, _tiles_completed
 
                 if _auth_abort:
                     return None
@@ -226,14 +751,28 @@ async def fetch_stac_elevation(
                 asset_url = data_asset["href"]
                 asset_size = data_asset.get("file:size", "unknown")
                 tile_id = feat.get("id", f"tile_{tile_idx}")
+                tile_path = Path(tmp_dir) / f"{tile_id}.tif"
+                cache_key = _tile_cache_key(feat, tile_id)
+
+                # Serve from the persistent tile cache when possible — skips
+                # the HTTP round-trip entirely on re-renders.
+                if cache_dir is not None:
+                    cached = _lookup_cached_tile(cache_dir, cache_key, asset_size)
+                    if cached is not None:
+                        _link_or_copy(cached, tile_path)
+                        logger.info(f"  Tile cache hit: {tile_id}")
+                        _tiles_completed += 1
+                        if job:
+                            job.add_log(
+                                f"Elevation tile {_tiles_completed}/{_total_tiles} "
+                                f"from cache: {tile_id}"
+                            )
+                        return tile_path
 
                 async with sem:
                     if _auth_abort:
                         return None
 
-                    # Small throttle per-connection to be polite
-                    await asyncio.sleep(0.15)
-
                     logger.info(
                         f"Downloading STAC tile: {tile_id} "
                         f"({asset_size} bytes) from {asset_url}"
@@ -246,21 +785,8 @@ async def fetch_stac_elevation(
                     )
 
                     if data_resp.status_code != 200:
-                        if data_resp.status_code == 403:
-                            logger.error(
-                                f"STAC Höjd tile download returned HTTP 403 Forbidden. "
-                                f"Your Lantmäteriet credentials are recognized but your "
-                                f"account is NOT authorized for Höjddata downloads. "
-                                f"You may need to subscribe to the 'Höjddata' product at "
-                                f"https://apimanager.lantmateriet.se/"
-                            )
-                            _auth_abort = True
-                            return None
-                        elif data_resp.status_code == 401:
-                            logger.error(
-                                f"STAC Höjd tile download returned HTTP 401 Unauthorized. "
-                                f"Check LANTMATERIET_USERNAME and LANTMATERIET_PASSWORD in .env"
-                            )
+                        if data_resp.status_code in (401, 403):
+                            _log_auth_failure(data_resp.status_code)
                             _auth_abort = True
                             return None
                         logger.warning(
@@ -280,23 +806,38 @@ async def fetch_stac_elevation(
                         download_errors += 1
                         return None
 
+                    # A truncated tile still starts with valid TIFF magic
+                    # but would corrupt the mosaic — compare against the
+                    # STAC `file:size` and drop it here instead.
+                    if isinstance(asset_size, int) and len(content) != asset_size:
+                        logger.warning(
+                            f"STAC tile {tile_id} size mismatch: got "
+                            f"{len(content)} bytes, expected {asset_size} "
+                            f"(truncated download?), skipping"
+                        )
+                        download_errors += 1
+                        return None
+
                     # Write tile to a temporary file on disk instead of
-                    # keeping it in a rasterio.MemoryFile.
-                    tile_path = Path(tmp_dir) / f"{tile_id}.tif"
-                    tile_path.write_bytes(content)
-
-                    # Quick validation — open and close immediately
-                    with rasterio.open(tile_path) as ds:
-                        logger.info(
-                            f"  Tile OK: {ds.width}x{ds.height} px, "
-                            f"CRS={ds.crs}, {len(content)} bytes"
+                    # keeping it in a rasterio.MemoryFile. The ~10 MB write
+                    # runs on a worker thread so slow disks don't stall the
+                    # event loop (and the other concurrent downloads on it).
+                    await asyncio.to_thread(tile_path.write_bytes, content)
+                    if cache_dir is not None:
+                        await asyncio.to_thread(
+                            _store_cached_tile, tile_path, cache_dir, cache_key
                         )
 
+                    # No per-tile rasterio.open() here: initialising a GDAL
+                    # dataset per tile just to log its shape is repeated for
+                    # every tile. The magic-byte check above rejects junk;
+                    # a corrupt TIFF surfaces when the mosaic is opened.
+                    logger.info(f"  Tile OK: {tile_id}, {len(content)} bytes")
+
                     # Release the download content from memory
                     del content
 
                     # Update activity log with download progress
-                    nonlocal _tiles_completed
                     _tiles_completed += 1
                     if job:
                         job.add_log(
@@ -336,130 +877,26 @@ async def fetch_stac_elevation(
                 f"Downloaded {len(tile_paths)} tiles to disk "
                 f"({download_errors} failed)"
             )
+            if cache_dir is not None:
+                _prune_tile_cache(
+                    cache_dir, LANTMATERIET_CONFIG.tile_cache_max_mb * 1024 * 1024
+                )
             if job:
                 job.add_log(f"Downloaded {len(tile_paths)} tiles, merging...")
 
-            # 3. Merge all tiles from disk-backed datasets
-            #    Open datasets from files (disk-backed, not in-memory).
-            datasets = [rasterio.open(p) for p in tile_paths]
-            try:
-                # Detect the source CRS from the first tile
-                # (Lantmäteriet tiles use EPSG:5845 = SWEREF 99 TM + RH 2000)
-                src_crs = str(datasets[0].crs)
-                logger.info(f"Source tile CRS: {src_crs}")
-
-                # Read nodata value from the tiles — needed for merge and
-                # reproject to correctly handle sea/void pixels.
-                nodata_val = datasets[0].nodata
-                logger.info(f"Source tile nodata value: {nodata_val}")
-
-                if len(datasets) == 1:
-                    merged_array = datasets[0].read()
-                    merged_transform = datasets[0].transform
-                    profile = datasets[0].profile.copy()
-                else:
-                    # rasterio_merge reads from disk-backed datasets,
-                    # only the output merged array lives in memory.
-                    # Pass nodata so the merge fills gaps correctly
-                    # instead of using 0 (which is valid sea-level elevation).
-                    merged_array, merged_transform = rasterio_merge(
-                        datasets, nodata=nodata_val
-                    )
-                    profile = datasets[0].profile.copy()
-                    profile.update(
-                        width=merged_array.shape[2],
-                        height=merged_array.shape[1],
-                        transform=merged_transform,
-                        count=merged_array.shape[0],
-                    )
-
-                logger.info(
-                    f"Merged {len(datasets)} tiles into "
-                    f"{merged_array.shape[2]}x{merged_array.shape[1]} px array"
-                )
-            finally:
-                # Close all tile datasets — we have the merged array now
-                for ds in datasets:
-                    try:
-                        ds.close()
-                    except Exception:
-                        pass
-
-            # 4. Reproject to target CRS (EPSG:3006) and crop to bbox
-            out_h, out_w = merged_array.shape[1], merged_array.shape[2]
-            needs_reproject = (
-                (target_width and target_height) or
-                (src_crs != crs and src_crs != f"EPSG:{crs.split(':')[1] if ':' in crs else crs}")
-            )
-
-            if target_width and target_height:
-                out_w, out_h = target_width, target_height
-
-            if needs_reproject:
-                if job:
-                    job.add_log(f"Reprojecting merged elevation to {crs}...")
-                from rasterio.enums import Resampling
-
-                target_transform = from_bounds(
-                    x_min, y_min, x_max, y_max, out_w, out_h
-                )
-                # Initialize with nodata value instead of np.empty() —
-                # np.empty() leaves garbage in pixels that reproject
-                # doesn't fill (sea areas, outside tile coverage).
-                fill_val = nodata_val if nodata_val is not None else 0
-                resampled = np.full(
-                    (merged_array.shape[0], out_h, out_w),
-                    fill_value=fill_val,
-                    dtype=merged_array.dtype,
-                )
-                import os
-                rasterio.warp.reproject(
-                    merged_array,
-                    resampled,
-                    src_transform=merged_transform,
-                    src_crs=src_crs,
-                    dst_transform=target_transform,
-                    dst_crs=crs,
-                    resampling=Resampling.bilinear,
-                    src_nodata=nodata_val,
-                    dst_nodata=nodata_val,
-                    num_threads=os.cpu_count() or 2,
-                )
-                # Free the merged array before writing output
-                del merged_array
-                merged_array = resampled
-                merged_transform = target_transform
-                profile.update(crs=crs, nodata=nodata_val)
-
-            # Release memory from the large merge/reproject buffers.
-            # Python's glibc allocator often holds freed memory as resident
-            # (RSS) instead of returning it to the OS, which can cause OOM
-            # kills when subsequent pipeline steps allocate large arrays.
-            # gc.collect() releases Python objects, and malloc_trim() tells
-            # glibc to return unused heap pages to the OS.
-            import gc
-            gc.collect()
-            try:
-                import ctypes
-                ctypes.CDLL("libc.so.6").malloc_trim(0)
-            except Exception:
-                pass  # Not on glibc (e.g. musl/macOS) — skip
-
-            # 5. Write merged GeoTIFF to bytes
-            #    Ensure nodata is preserved so downstream geotiff_to_array()
-            #    can identify and interpolate sea/void pixels.
-            profile.update(
-                width=out_w,
-                height=out_h,
-                transform=merged_transform,
-                count=merged_array.shape[0],
-                nodata=nodata_val,
+            # 3-5. Mosaic, reproject and write on a worker thread — these are
+            #      blocking GDAL calls that take seconds on large mosaics and
+            #      would otherwise stall every other request on the event loop.
+            merged_bytes, out_w, out_h = await asyncio.to_thread(
+                _merge_and_write,
+                tile_paths,
+                bbox_native,
+                crs,
+                target_width,
+                target_height,
+                tmp_dir,
+                job=job,
             )
-            output = io.BytesIO()
-            with rasterio.open(output, "w", **profile) as dst:
-                dst.write(merged_array)
-
-            merged_bytes = output.getvalue()
             logger.info(
                 f"STAC Höjd: merged {len(tile_paths)} tile(s) "
                 f"into {out_w}x{out_h} px GeoTIFF ({len(merged_bytes)} bytes)"
@@ -478,7 +915,6 @@ async def fetch_stac_elevation(
         return None
     except Exception as e:
         logger.error(f"Error fetching STAC elevation: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         return None
     finally:
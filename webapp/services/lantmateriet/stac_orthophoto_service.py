@@ -18,7 +18,7 @@ Workflow:
 1. POST /stac-bild/v1/search (open, no auth) — newest items first
 2. Build VSICURL paths for the "data" asset of each matching item
 3. Open all COGs in parallel via rasterio.Env(GDAL_HTTP_AUTH=BASIC, …) +
-   /vsicurl/ prefix (ThreadPoolExecutor, capped at 8 workers — small
+   /vsicurl/ prefix (ThreadPoolExecutor, up to 16 workers — small
    round-trips, server tolerates the burst)
 4. Read each tile's windowed intersection with the target bbox in two
    phases (RGB bands only — drops NIR band 4 — using COG overviews):
@@ -42,6 +42,7 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import io
 import logging
 import math
@@ -56,6 +57,12 @@ import httpx
 import numpy as np
 
 from config.lantmateriet import LANTMATERIET_CONFIG
+from services.lantmateriet.stac_cache import (
+    load_cached_search,
+    quantize_bbox_wgs84,
+    store_cached_search,
+    tile_cache_dir,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +72,17 @@ def _default_workers() -> int:
     return min(8, os.cpu_count() or 2)
 
 
+def _default_open_workers(n_hrefs: int) -> int:
+    """Worker count for the parallel COG header opens.
+
+    Each open is a single small range GET that spends its time waiting in
+    libcurl with the GIL released, so the pool is sized for I/O latency
+    rather than by CPU count — a 2-core container would otherwise open
+    50 tiles only two at a time.
+    """
+    return max(1, min(16, n_hrefs))
+
+
 def _default_read_workers() -> int:
     """Worker count for Phase 1 (parallel single-attempt) tile reads.
 
@@ -259,22 +277,116 @@ _SEARCH_HEADERS = {
 }
 
 
+@functools.lru_cache(maxsize=4)
+def _epsg_crs(code: int):
+    """Shared rasterio CRS per EPSG code (from_epsg hits the PROJ db each call)."""
+    from rasterio.crs import CRS
+
+    return CRS.from_epsg(code)
+
+
+def _wgs84_to_3006_transformer():
+    """Shared WGS84 → EPSG:3006 transformer (building one loads the PROJ db)."""
+    from services.utils.geo import cached_transformer
+
+    return cached_transformer("EPSG:4326", "EPSG:3006")
+
+
 def _wgs84_bbox_to_epsg3006_envelope(
     bbox_wgs84: tuple[float, float, float, float],
 ) -> tuple[float, float, float, float]:
     """
     Convert a WGS84 (west, south, east, north) bbox to the EPSG:3006 envelope
-    that fully contains its four corners. See fetch_stac_orthophoto() for why
-    SW+NE-only is insufficient.
-    """
-    from pyproj import Transformer
+    that fully contains it. See fetch_stac_orthophoto() for why SW+NE-only is
+    insufficient.
 
+    transform_bounds() densifies every edge (21 points each), so the
+    envelope also covers edges that bulge outward between the corners
+    after projection, not just the four corners themselves.
+    """
     w, s, e, n = bbox_wgs84
-    to_3006 = Transformer.from_crs("EPSG:4326", "EPSG:3006", always_xy=True)
-    corner_lons = [w, e, e, w]
-    corner_lats = [s, s, n, n]
-    xs, ys = to_3006.transform(corner_lons, corner_lats)
-    return (float(min(xs)), float(min(ys)), float(max(xs)), float(max(ys)))
+    x_min, y_min, x_max, y_max = _wgs84_to_3006_transformer().transform_bounds(
+        w, s, e, n, densify_pts=21
+    )
+    return (float(x_min), float(y_min), float(x_max), float(y_max))
+
+
+def _select_covering_features(
+    features: list[dict],
+    bbox_wgs84: tuple[float, float, float, float],
+) -> list[dict]:
+    """
+    Reduce newest-first STAC items to the ones that can contribute pixels.
+
+    The STAC bbox query returns every item whose bbox merely touches the
+    query, and each extra href costs a COG header fetch in _cog_merge_rgb.
+    Walking the items newest-first, an item is kept only if its footprint
+    (`geometry`, else `bbox`) adds area of the query box not already covered
+    by the newer items kept so far — under the first-wins composite an older
+    tile beneath full newer coverage never shows. Items are also de-duplicated
+    by `id`, and the walk stops once the query box is fully covered. Items
+    with no usable footprint are kept (and don't count as coverage).
+    """
+    from shapely.geometry import box, shape
+
+    query = box(*bbox_wgs84)
+    covered = None
+    seen_ids: set = set()
+    selected: list[dict] = []
+    for feat in features:
+        feat_id = feat.get("id")
+        if feat_id is not None:
+            if feat_id in seen_ids:
+                continue
+            seen_ids.add(feat_id)
+
+        try:
+            if feat.get("geometry"):
+                footprint = shape(feat["geometry"])
+            elif feat.get("bbox") and len(feat["bbox"]) >= 4:
+                fb = feat["bbox"]
+                footprint = box(fb[0], fb[1], fb[-2], fb[-1])
+            else:
+                footprint = None
+        except Exception:
+            footprint = None
+        if footprint is None:
+            selected.append(feat)
+            continue
+
+        contribution = footprint.intersection(query)
+        if contribution.area <= 0:
+            continue  # only touches the query box edge
+        if covered is not None and contribution.difference(covered).area <= 0:
+            continue  # fully hidden under newer tiles
+        selected.append(feat)
+        covered = contribution if covered is None else covered.union(contribution)
+        if covered.contains(query):
+            break
+    return selected
+
+
+def _snap_res_to_overview(
+    approx_res: float,
+    native_res: float,
+    overview_factors: list[int],
+    tolerance: float = 0.1,
+) -> float:
+    """
+    Snap a merge resolution up to a COG pyramid level within `tolerance`.
+
+    Returns the resolution of the finest level (native or overview) that is
+    at least `approx_res`, if it is no more than `tolerance` (10%) coarser;
+    otherwise `approx_res` unchanged. Never snaps to a finer level — that
+    would grow the in-memory mosaic by up to 4×.
+    """
+    levels = sorted(native_res * f for f in [1, *overview_factors])
+    for level_res in levels:
+        if level_res >= approx_res:
+            if level_res <= approx_res * (1 + tolerance):
+                return level_res
+            break
+    return approx_res
 
 
 def _gdal_vsicurl_env() -> dict:
@@ -302,6 +414,23 @@ def _gdal_vsicurl_env() -> dict:
         # request at the curl layer before bubbling the failure up.
         "GDAL_HTTP_MAX_RETRY": "3",
         "GDAL_HTTP_RETRY_DELAY": "1",
+        # Multiplex the range reads of every tile over one HTTP/2 TLS
+        # connection per host instead of serial HTTP/1.1 requests on
+        # separate connections. libcurl falls back to 1.1 if the server
+        # or the curl build (needs nghttp2) doesn't support h2.
+        "GDAL_HTTP_VERSION": "2TLS",
+        "GDAL_HTTP_MULTIPLEX": "YES",
+        "GDAL_HTTP_MULTIRANGE": "YES",
+        # Fetch the COG header + IFDs in one GET at open instead of
+        # several 16 KB round-trips, and read pixel data in 1 MB chunks
+        # that better match the COG tile layout.
+        "GDAL_INGESTED_BYTES_AT_OPEN": "32768",
+        "CPL_VSIL_CURL_CHUNK_SIZE": "1048576",
+        # Per-handle block cache so overlapping window reads don't
+        # re-fetch the same ranges. VSI_CACHE_SIZE applies per open
+        # file and dozens of tiles are open at once, so keep it modest.
+        "VSI_CACHE": "TRUE",
+        "VSI_CACHE_SIZE": str(64 * 1024 * 1024),
     }
 
 
@@ -341,7 +470,6 @@ def _cog_merge_rgb(
     """
     import rasterio
     from affine import Affine
-    from rasterio.crs import CRS
     from rasterio.env import Env
     from rasterio.enums import Resampling
     from rasterio.vrt import WarpedVRT
@@ -349,8 +477,8 @@ def _cog_merge_rgb(
 
     x_min, y_min, x_max, y_max = epsg3006_bounds
     n_hrefs = len(vsicurl_hrefs)
-    target_crs = CRS.from_epsg(3006)
-    workers = _default_workers()
+    target_crs = _epsg_crs(3006)
+    workers = _default_open_workers(n_hrefs)
     read_workers = _default_read_workers()
     max_serial_retries = _serial_retry_attempts()
 
@@ -473,6 +601,17 @@ def _cog_merge_rgb(
         (x_max - x_min) / max(target_width, 1),
         (y_max - y_min) / max(target_height, 1),
     )
+    # If a slightly coarser overview exists, read at exactly its resolution:
+    # GDAL otherwise picks the next *finer* level (up to 4× the bytes over
+    # HTTP) only to downsample it. All STAC Bild tiles share one pyramid
+    # layout, so the first tile's overviews stand in for all of them.
+    try:
+        ref = datasets[0]
+        approx_res = _snap_res_to_overview(
+            approx_res, ref.res[0], ref.overviews(1)
+        )
+    except Exception as exc:
+        logger.debug(f"STAC Bild: overview lookup failed ({exc}); using {approx_res:.2f} m/px")
 
     # Snap bounds to integer multiples of approx_res (equivalent to
     # rasterio.merge's target_aligned_pixels=True) so every tile resamples
@@ -510,6 +649,36 @@ def _cog_merge_rgb(
     # Phase 2 (serial retry). Tiles that overlap the output bbox but
     # legitimately have no pixels in range stay None — same as before.
     results: list[Optional[tuple]] = [None] * len(datasets)
+    # A tile is "settled" once it can no longer change: read ok, skipped,
+    # or permanently failed. Settled tiles are composited into `merged`
+    # as soon as every earlier (newer) tile is settled too, and their
+    # read buffer is released — instead of holding every tile's buffer
+    # (≈ another full mosaic) until the end of Phase 2.
+    settled = [False] * len(datasets)
+    next_composite = 0
+
+    def _settle(idx: int) -> None:
+        """Mark a tile settled and composite the settled prefix in order.
+
+        First-wins composite in newest-first input order: a pixel is filled
+        only if every band is still 0 (nodata). Matches rasterio.merge's
+        method='first' + nodata=0 semantics. Only ever called from the
+        orchestrating thread.
+        """
+        nonlocal next_composite
+        settled[idx] = True
+        while next_composite < len(datasets) and settled[next_composite]:
+            r = results[next_composite]
+            results[next_composite] = None
+            next_composite += 1
+            if r is None:
+                continue
+            _, rs, re_, cs, ce, buf, _ = r
+            region = merged[:, rs:re_, cs:ce]
+            is_nodata = (region == 0).all(axis=0)
+            if not is_nodata.any():
+                continue
+            np.copyto(region, buf, where=is_nodata[np.newaxis, :, :])
 
     watchdog = _MergeWatchdog(len(datasets), job=job)
     watchdog.start()
@@ -554,6 +723,11 @@ def _cog_merge_rgb(
                 src_window = window_from_bounds(
                     ix_min, iy_min, ix_max, iy_max, transform=ds.transform
                 )
+                # Band subset at read time is all GDAL needs: for a
+                # band-interleaved COG only bands 1-3 are range-requested,
+                # and for pixel-interleaved blocks every band shares the
+                # same bytes anyway — a 3-band VRT wrapper would not cut
+                # the transfer, only add a layer per tile.
                 buf = ds.read(
                     indexes=[1, 2, 3],
                     window=src_window,
@@ -617,9 +791,11 @@ def _cog_merge_rgb(
                         results[idx] = outcome[1:]   # (idx, rs, re, cs, ce, buf, elapsed)
                         watchdog.end_ok(idx)
                         phase1_ok += 1
+                        _settle(idx)
                     elif kind == "skip":
                         # Doesn't overlap output — count as done, no fail.
                         watchdog.end_ok(idx)
+                        _settle(idx)
                     else:  # "fail"
                         watchdog.end_attempt_fail(idx)
                         failed_in_phase1.append(fut_to_idx_ds[fut])
@@ -671,6 +847,7 @@ def _cog_merge_rgb(
                         if outcome[0] == "ok":
                             results[idx] = outcome[1:]
                             watchdog.end_ok(idx)
+                            _settle(idx)
                             recovered += 1
                             success = True
                             logger.info(
@@ -682,12 +859,14 @@ def _cog_merge_rgb(
                             # Shouldn't normally happen on retry (overlap
                             # is deterministic) but handle it cleanly.
                             watchdog.end_ok(idx)
+                            _settle(idx)
                             success = True
                             break
                         else:
                             watchdog.end_attempt_fail(idx)
                     if not success:
                         watchdog.end_perm_fail(idx)
+                        _settle(idx)
                         permanent_failures += 1
                         logger.warning(
                             f"STAC Bild: tile {idx + 1} permanently failed "
@@ -715,18 +894,11 @@ def _cog_merge_rgb(
                 )
                 return None, None
 
-            # ----- First-wins composite in newest-first input order.
-            # A pixel is filled only if every band is still 0 (nodata).
-            # Matches rasterio.merge's method='first' + nodata=0 semantics.
-            for r in results:
-                if r is None:
-                    continue
-                _, rs, re_, cs, ce, buf, _ = r
-                region = merged[:, rs:re_, cs:ce]
-                is_nodata = (region == 0).all(axis=0)
-                if not is_nodata.any():
-                    continue
-                np.copyto(region, buf, where=is_nodata[np.newaxis, :, :])
+            # ----- Composite whatever is still pending (tiles behind a
+            # Phase 1 failure are released here once Phase 2 settled it).
+            for idx in range(len(datasets)):
+                if not settled[idx]:
+                    _settle(idx)
     except Exception as exc:
         logger.error(f"STAC Bild: merge failed: {exc}")
         return None, None
@@ -811,10 +983,17 @@ async def fetch_stac_orthophoto(
     w, s, e, n = bbox_wgs84
     search_url = f"{LANTMATERIET_CONFIG.stac_bild_endpoint}search"
     query = {
-        "bbox": [w, s, e, n],
+        # Snapped outward to a 0.001° grid so repeat/adjacent jobs share a
+        # search cache entry; _select_covering_features() below still
+        # trims against the exact bbox.
+        "bbox": quantize_bbox_wgs84([w, s, e, n]),
         "sortby": [{"field": "properties.datetime", "direction": "desc"}],  # newest imagery first
         "limit": 50,
     }
+    # Shares the STAC Höjd on-disk search cache (same TTL); the endpoint is
+    # part of the key so Bild and Höjd responses never collide.
+    cache_dir = tile_cache_dir()
+    cache_key = {"endpoint": search_url, **query}
 
     # ------------------------------------------------------------------ #
     # 1. Search for tiles covering our bbox (open endpoint, no auth)
@@ -823,12 +1002,20 @@ async def fetch_stac_orthophoto(
         if job:
             job.add_log("Searching Lantmäteriet STAC Bild for recent orthophotos...")
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(
-                search_url, json=query, headers=_SEARCH_HEADERS
-            )
-            resp.raise_for_status()
-            features = resp.json().get("features", [])
+        # Disk I/O stays off the event loop like the merge/warp/encode steps.
+        cached = await asyncio.to_thread(load_cached_search, cache_dir, cache_key)
+        if cached is not None:
+            logger.info("STAC Bild: using cached search response")
+            features = cached.get("features", [])
+        else:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                resp = await client.post(
+                    search_url, json=query, headers=_SEARCH_HEADERS
+                )
+                resp.raise_for_status()
+                result = resp.json()
+            await asyncio.to_thread(store_cached_search, cache_dir, cache_key, result)
+            features = result.get("features", [])
 
     except Exception as exc:
         logger.warning(f"STAC Bild search failed: {exc}")
@@ -843,6 +1030,22 @@ async def fetch_stac_orthophoto(
 
     logger.info(f"STAC Bild: search returned {len(features)} item(s)")
 
+    # Drop items that only touch the bbox or sit entirely under newer
+    # coverage — each one would cost a COG header fetch for nothing.
+    selected = _select_covering_features(features, bbox_wgs84)
+    if len(selected) < len(features):
+        logger.info(
+            f"STAC Bild: {len(selected)}/{len(features)} item(s) needed to "
+            f"cover the bbox (newest first)"
+        )
+    features = selected
+    if not features:
+        logger.info(
+            f"STAC Bild: no orthophoto tile overlaps the interior of bbox "
+            f"[{w:.3f},{s:.3f},{e:.3f},{n:.3f}]"
+        )
+        return None
+
     # Items are already sorted newest-first. Find the most recent year
     # present in the results so we can report it in the log.
     newest_datetime = features[0].get("properties", {}).get("datetime", "")
@@ -924,17 +1127,21 @@ async def fetch_stac_orthophoto(
     try:
         import time as _time
 
-        from rasterio.crs import CRS
         from rasterio.enums import Resampling
         from rasterio.transform import from_bounds
         from rasterio.warp import reproject as warp_reproject
 
-        src_crs = CRS.from_epsg(3006)
-        dst_crs = CRS.from_epsg(4326)
+        src_crs = _epsg_crs(3006)
+        dst_crs = _epsg_crs(4326)
         dst_transform = from_bounds(w, s, e, n, width, height)
-        dst_array = np.zeros((3, height, width), dtype=np.uint8)
-
-        warp_workers = _default_workers()
+        # Allocate the destination pixel-interleaved (H, W, 3) — the layout
+        # PIL wants — and let GDAL warp into a (3, H, W) view of it, so the
+        # PNG encode needs no transpose copy.
+        dst_array = np.zeros((height, width, 3), dtype=np.uint8)
+
+        # The warp is pure CPU (the mosaic is already in memory), so use
+        # every core rather than the I/O pool's cap of 8.
+        warp_workers = os.cpu_count() or 2
         warp_start = _time.monotonic()
         logger.info(
             f"STAC Bild: warping EPSG:3006 → WGS84 (Lanczos), "
@@ -948,18 +1155,24 @@ async def fetch_stac_orthophoto(
 
         # Single multi-band reproject — GDAL parallelizes internally via
         # num_threads. Replaces the previous 3-iteration loop (one band at a
-        # time on serially-awaited worker threads, ~9s/band).
+        # time on serially-awaited worker threads, ~9s/band). A larger
+        # warp_mem_limit (MB) lets GDAL warp in fewer, bigger chunks instead
+        # of re-computing the source window per 64 MB default chunk.
         await asyncio.to_thread(
             warp_reproject,
             source=merged_rgb,
-            destination=dst_array,
+            destination=np.moveaxis(dst_array, -1, 0),
             src_transform=src_transform,
             src_crs=src_crs,
             dst_transform=dst_transform,
             dst_crs=dst_crs,
             resampling=Resampling.lanczos,
             num_threads=warp_workers,
+            warp_mem_limit=256,
         )
+        # The EPSG:3006 mosaic is no longer needed — drop it now so the
+        # PNG encode below doesn't run with both full-size buffers live.
+        del merged_rgb
 
         warp_elapsed = _time.monotonic() - warp_start
         logger.info(
@@ -990,9 +1203,12 @@ async def fetch_stac_orthophoto(
                 f"Encoding orthophoto to PNG ({width}×{height} px)..."
             )
         def _encode_png() -> bytes:
-            img = Image.fromarray(dst_array.transpose(1, 2, 0))  # (H, W, 3)
+            img = Image.fromarray(dst_array)  # already (H, W, 3)
             buf = io.BytesIO()
-            img.save(buf, format="PNG")
+            # The PNG is only a lossless hand-off — map_generator decodes
+            # and reprojects it again — so zlib level 1 is enough; the
+            # default level 6 dominated encode time on 4K+ outputs.
+            img.save(buf, format="PNG", compress_level=1, optimize=False)
             return buf.getvalue()
 
         png_bytes = await asyncio.to_thread(_encode_png)
@@ -20,19 +20,239 @@ import asyncio
 import json
 import logging
 import math
+import os
 import secrets
 import shutil
+import struct
 import threading
+import time
 import zipfile
+import zlib
+from collections import deque
+from contextvars import ContextVar
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+try:
+    import pyvips
+except (ImportError, OSError):  # pragma: no cover - OSError: libvips missing
+    pyvips = None
+
+# Steps 11-13 generators are imported eagerly (pure-Python, no
+# map_generator back-imports) so the first job doesn't pay their import
+# cost between 87% and 95%.
+from services.enfusion_project_generator import (
+    EnfusionProjectGenerator,
+    sanitize_project_name,
+)
+from services.export_service import export_relpath, organize_export_structure
+from services.job_log_handler import MAX_LOGS_PER_JOB
+from services.setup_guide_generator import SetupGuideGenerator
+
 logger = logging.getLogger(__name__)
 
 # Job ID length in bytes (16 bytes = 128 bits of entropy, URL-safe base64 encoded)
 JOB_ID_BYTES = 16
 
+# Temporary on-disk copy of the step 2 DEM, removed once step 4 has run.
+DEM_SPILL_FILENAME = "_dem.tif"
+
+
+def _json_default(obj):
+    """
+    Serialize the non-JSON-native values that can appear in pipeline output.
+
+    Explicit conversions for numpy scalars/arrays, datetimes and shapely
+    geometries (as GeoJSON via __geo_interface__) instead of a blanket
+    `default=str`, which turned e.g. a stray numpy int into the string "3".
+    Anything else still falls back to str() so a dump never fails.
+    """
+    import numpy as np
+
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    geo_interface = getattr(obj, "__geo_interface__", None)
+    if geo_interface is not None:
+        return geo_interface
+    return str(obj)
+
+
+def _write_json(path: Path, data, default=None) -> None:
+    """
+    Write `data` as compact JSON to `path`.
+
+    Uses orjson's C encoder when installed (several times faster than the
+    stdlib on float-heavy GeoJSON, one write per file) and falls back to
+    json.dump otherwise. `default` is passed through to either encoder.
+    """
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(
+            data,
+            default=default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ))
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, default=default)
+
+
+def _write_json_indented(path: Path, data) -> None:
+    """
+    Write a human-readable (indent=2) JSON file in a single write.
+
+    Same encoder choice as _write_json: orjson (UTF-8, numpy-aware) when
+    installed, else json.dumps + one write, which beats json.dump's many
+    small fp.write calls.
+    """
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(
+            data,
+            default=_json_default,
+            option=(
+                orjson.OPT_INDENT_2
+                | orjson.OPT_SERIALIZE_NUMPY
+                | orjson.OPT_NON_STR_KEYS
+            ),
+        ))
+    else:
+        path.write_text(json.dumps(data, indent=2, default=_json_default))
+
+
+# Export payloads that are already compressed (PNG/JPEG/TIFF rasters, nested
+# archives): DEFLATE spends most of step 13's CPU time on them for ~0% gain,
+# so they are stored as-is. Everything else (ASC heightmap, GeoJSON, CSV,
+# Enfusion text files) is deflated at level 1.
+_ZIP_STORED_SUFFIXES = frozenset({
+    ".png", ".jpg", ".jpeg", ".webp", ".tif", ".tiff", ".zip",
+})
+
+
+def _top_level_file_names(directory: Path) -> list[str]:
+    """Names of the regular files directly in directory (scandir, no extra stat)."""
+    with os.scandir(directory) as it:
+        return [entry.name for entry in it if entry.is_file()]
+
+
+def _list_files(root: Path) -> list[Path]:
+    """
+    All regular files below root. os.walk is scandir-based, so file type
+    comes from the directory listing instead of one stat() per entry as
+    with rglob("*") + is_file().
+    """
+    return [
+        Path(dirpath, name)
+        for dirpath, _dirnames, filenames in os.walk(root)
+        for name in filenames
+    ]
+
+
+def _zip_export_files(
+    zf: zipfile.ZipFile,
+    output_dir: Path,
+    top_dir: str,
+    written: set[str],
+    files: Optional[list[Path]] = None,
+) -> None:
+    """
+    Add files under output_dir (all of them, or just `files`) that are not
+    yet in `written` to zf, below top_dir/ and at their post-
+    organize_export_structure location, so this can run both before and
+    after the files are moved. `written` holds the relative paths already
+    added and is updated in place.
+
+    Runs in a worker thread (asyncio.to_thread), not a process pool: the
+    ZipFile is filled incrementally across two passes and can't be shipped
+    to another process, and the heavy parts -- file reads, zlib DEFLATE and
+    CRC-32 -- release the GIL, so other jobs' threads keep running.
+    """
+    if files is None:
+        files = _list_files(output_dir)
+    for fpath in files:
+        relpath = fpath.relative_to(output_dir).as_posix()
+        if "/" not in relpath:
+            relpath = export_relpath(relpath)
+            if relpath is None:
+                continue
+        if relpath in written:
+            continue
+        written.add(relpath)
+        arcname = f"{top_dir}/{relpath}"
+        if fpath.suffix.lower() in _ZIP_STORED_SUFFIXES:
+            zf.write(fpath, arcname, compress_type=zipfile.ZIP_STORED)
+        else:
+            zf.write(
+                fpath, arcname,
+                compress_type=zipfile.ZIP_DEFLATED, compresslevel=1,
+            )
+
+
+# (second, "YYYY-MM-DDTHH:MM:SS") for the most recent log timestamp. Replaced
+# as a whole tuple, so concurrent readers never see a torn pair.
+_ts_cache: tuple[int, str] = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """
+    Current UTC time in datetime.isoformat() style with microseconds.
+
+    add_log runs dozens of times per pipeline step; formatting the date part
+    once per second instead of building and formatting a datetime per entry
+    keeps it cheap.
+    """
+    global _ts_cache
+    now = time.time()
+    sec = int(now)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{int((now - sec) * 1e6):06d}"
+
+
+def _check_cancel(job: "MapGenerationJob") -> None:
+    """Abort run_generation at a step boundary if the job was cancelled."""
+    if job.cancelled:
+        raise asyncio.CancelledError()
+
+
+# Worker-thread tasks started by the running pipeline. run_generation binds
+# a fresh list here; tasks it spawns (the step 2 fetches) share that list.
+_worker_tasks_var: ContextVar[Optional[list]] = ContextVar(
+    "pipeline_worker_tasks", default=None
+)
+
+
+def _start_worker(func, /, *args, **kwargs) -> asyncio.Task:
+    """
+    Run `func` in a worker thread and register it with the pipeline.
+
+    Cancelling a to_thread task does not stop its thread, so run_generation
+    waits for every registered worker before it closes the ZIP or hands
+    output_dir to cleanup. Await the task through asyncio.shield() so that
+    cancelling the caller never cancels the task itself.
+    """
+    task = asyncio.create_task(asyncio.to_thread(func, *args, **kwargs))
+    tasks = _worker_tasks_var.get()
+    if tasks is not None:
+        tasks.append(task)
+    return task
+
+
+async def _run_worker(func, /, *args, **kwargs):
+    """Run `func` in a registered worker thread and return its result."""
+    return await asyncio.shield(_start_worker(func, *args, **kwargs))
+
 
 # ---------------------------------------------------------------------------
 # Job model and storage
@@ -51,8 +271,16 @@ class MapGenerationJob:
         self.status = "pending"
         self.progress = 0
         self.current_step = ""
-        self.steps_completed = []
-        self.logs = []  # Activity log messages for frontend display
+        # Immutable snapshot, replaced (not mutated) by complete_step, so
+        # to_dict can hand it to every status poll without copying.
+        self.steps_completed: tuple[dict, ...] = ()
+        # Activity log messages for frontend display. Bounded ring buffer;
+        # every entry carries a monotonically increasing "seq" so status
+        # polls can ask for only the entries after their cursor even once
+        # old entries have been evicted.
+        self.logs: deque[dict] = deque(maxlen=MAX_LOGS_PER_JOB)
+        self._log_seq = 0
+        self._log_lock = threading.Lock()
         self.errors = []
         self.result = None
         self.created_at = datetime.utcnow().isoformat()
@@ -62,6 +290,30 @@ class MapGenerationJob:
         # (e.g. "OpenStreetMap (Overpass)", "Lantmäteriet Hydrografi"). Surfaced
         # in metadata.json + the Data Sources appendix of SETUP_GUIDE.md.
         self.feature_sources: dict[str, str] = {}
+        # Cancellation: `cancelled` is checked between pipeline steps;
+        # `_task` is the pipeline's own task, set by launch_generation, so
+        # a cancel also interrupts whatever the current step is awaiting.
+        self.cancelled = False
+        self._task: Optional[asyncio.Task] = None
+
+    def cancel(self) -> bool:
+        """
+        Request cancellation of a pending/running job.
+
+        Must be called from the event loop thread (e.g. an API handler).
+        Finished jobs are left untouched. Returns True if the pipeline task
+        is still live: it then stops at the next step boundary (at once if
+        already running) and schedules removal of its own output after its
+        worker threads have finished, so the caller must not delete it.
+        """
+        if self.status not in ("pending", "running"):
+            return False
+        self.cancelled = True
+        live = self._task is not None and not self._task.done()
+        if live and self.status == "running":
+            # Not yet started: the first step boundary sees `cancelled`.
+            self._task.cancel()
+        return live
 
     def add_log(self, message: str, level: str = "info"):
         """
@@ -71,40 +323,104 @@ class MapGenerationJob:
             message: The log message
             level: Log level (info, success, warning, error)
         """
-        self.logs.append({
-            "timestamp": datetime.utcnow().isoformat(),
+        self.append_log_entry({
+            "timestamp": _utc_timestamp(),
             "level": level,
             "message": message,
         })
 
-    def to_dict(self) -> dict:
+    def append_log_entry(self, entry: dict) -> None:
+        """Stamp `entry` with the next sequence number and append it (thread-safe)."""
+        with self._log_lock:
+            self._append_log_locked(entry)
+
+    def _append_log_locked(self, entry: dict) -> None:
+        entry["seq"] = self._log_seq
+        self._log_seq += 1
+        self.logs.append(entry)
+
+    def begin_step(
+        self, step_name: str, progress: int, log: str | None = None, level: str = "info"
+    ) -> None:
+        """
+        Enter a pipeline step: set current_step and progress and, optionally,
+        add the step's opening log line — all under one lock acquisition, so
+        a status poll never sees the new step label with the old progress.
+        """
+        entry = None
+        if log is not None:
+            entry = {"timestamp": _utc_timestamp(), "level": level, "message": log}
+        with self._log_lock:
+            self.current_step = step_name
+            self.progress = progress
+            if entry is not None:
+                self._append_log_locked(entry)
+
+    def complete_step(self, step: str, **details) -> None:
+        """Record a finished step in steps_completed as {"step": step, **details}."""
+        self.steps_completed = (*self.steps_completed, {"step": step, **details})
+
+    @property
+    def logs_total(self) -> int:
+        """Number of log entries ever appended (the next entry's seq)."""
+        return self._log_seq
+
+    def logs_since(self, seq: int) -> tuple[list[dict], int]:
+        """
+        Retained log entries with sequence number >= `seq`, plus logs_total
+        taken under the same lock so a client cursor never skips an entry.
+        """
+        with self._log_lock:
+            first_seq = self._log_seq - len(self.logs)
+            entries = list(islice(self.logs, max(0, seq - first_seq), None))
+            return entries, self._log_seq
+
+    def to_dict(self, since: Optional[int] = None) -> dict:
+        # Shallow-copy the lists the pipeline keeps appending to (the
+        # steps_completed tuple is already immutable), so the status endpoint
+        # serializes a stable snapshot without holding any lock while the
+        # response is JSON-encoded. With `since`, only log
+        # entries from that sequence number on are included.
+        logs, logs_total = self.logs_since(since or 0)
         return {
             "job_id": self.job_id,
             "status": self.status,
             "progress": self.progress,
             "current_step": self.current_step,
             "steps_completed": self.steps_completed,
-            "logs": self.logs,
-            "errors": self.errors,
+            "logs": logs,
+            "logs_total": logs_total,
+            "errors": list(self.errors),
             "result": self.result,
             "created_at": self.created_at,
             "completed_at": self.completed_at,
         }
 
 
-# Global job storage (in production, use Redis or a database)
-_jobs: dict[str, MapGenerationJob] = {}
-_jobs_lock = threading.RLock()
+# Global job storage (in production, use Redis or a database).
+# Jobs are independent, so storage is striped: each job ID maps to one of
+# _STRIPES shards with its own lock. Status polls for different jobs (one per
+# second per active job from the frontend) then rarely contend on a lock.
+# Plain Locks: no code path re-acquires a stripe lock while holding it.
+_STRIPES = 16
+_jobs_shards: list[dict[str, MapGenerationJob]] = [{} for _ in range(_STRIPES)]
+_jobs_locks = [threading.Lock() for _ in range(_STRIPES)]
 
 # Track active downloads to prevent cleanup during file access
-_active_downloads: set[str] = set()
-_downloads_lock = threading.RLock()
+_downloads_shards: list[set[str]] = [set() for _ in range(_STRIPES)]
+_downloads_locks = [threading.Lock() for _ in range(_STRIPES)]
+
+
+def _shard(job_id: str) -> int:
+    """Index of the storage stripe holding job_id."""
+    return hash(job_id) % _STRIPES
 
 
 def get_job(job_id: str) -> Optional[MapGenerationJob]:
     """Get a job by ID (thread-safe)."""
-    with _jobs_lock:
-        return _jobs.get(job_id)
+    shard = _shard(job_id)
+    with _jobs_locks[shard]:
+        return _jobs_shards[shard].get(job_id)
 
 
 def create_job(
@@ -126,8 +442,9 @@ def create_job(
     job_id = secrets.token_urlsafe(JOB_ID_BYTES)
     job = MapGenerationJob(job_id, polygon_coords, options, session_id)
 
-    with _jobs_lock:
-        _jobs[job_id] = job
+    shard = _shard(job_id)
+    with _jobs_locks[shard]:
+        _jobs_shards[shard][job_id] = job
 
     logger.info(f"Created job {job_id[:8]}... for session {session_id[:8]}...")
     return job
@@ -140,8 +457,9 @@ def cleanup_job_session(job_id: str) -> None:
     This prevents issues where a job references a non-existent session.
     The job itself remains accessible via its ID for the cleanup period.
     """
-    with _jobs_lock:
-        job = _jobs.get(job_id)
+    shard = _shard(job_id)
+    with _jobs_locks[shard]:
+        job = _jobs_shards[shard].get(job_id)
         if job:
             logger.debug(f"Cleared session association for job {job_id[:8]}...")
             # Keep the job but clear the session reference
@@ -150,22 +468,25 @@ def cleanup_job_session(job_id: str) -> None:
 
 def mark_download_active(job_id: str) -> None:
     """Mark a job as having an active download."""
-    with _downloads_lock:
-        _active_downloads.add(job_id)
+    shard = _shard(job_id)
+    with _downloads_locks[shard]:
+        _downloads_shards[shard].add(job_id)
         logger.debug(f"Marked job {job_id[:8]}... as downloading")
 
 
 def mark_download_complete(job_id: str) -> None:
     """Mark a job download as complete."""
-    with _downloads_lock:
-        _active_downloads.discard(job_id)
+    shard = _shard(job_id)
+    with _downloads_locks[shard]:
+        _downloads_shards[shard].discard(job_id)
         logger.debug(f"Marked job {job_id[:8]}... download complete")
 
 
 def is_download_active(job_id: str) -> bool:
     """Check if a job has an active download."""
-    with _downloads_lock:
-        return job_id in _active_downloads
+    shard = _shard(job_id)
+    with _downloads_locks[shard]:
+        return job_id in _downloads_shards[shard]
 
 
 # ---------------------------------------------------------------------------
@@ -183,13 +504,26 @@ async def step_fetch_elevation(
     primary_country: str,
     job: Optional[MapGenerationJob] = None,
     max_pixels: int | None = None,
+    output_dir: Optional[Path] = None,
 ) -> dict:
-    """Step 2: Download elevation data from the best available source."""
+    """Step 2: Download elevation data from the best available source.
+
+    When output_dir is given, the GeoTIFF is spilled to output_dir/_dem.tif
+    and returned as result["data_path"] with result["data"] set to None, so
+    the raw bytes (~192 MB for Sweden STAC) are not held in memory while the
+    other fetches run and step 4 decodes the DEM. Step 4 reads the file
+    directly and the orchestrator deletes it afterwards.
+    """
     from services.elevation_service import fetch_elevation
 
     result = await fetch_elevation(bbox, primary_country, job, max_pixels=max_pixels)
     if not result["data"]:
         raise RuntimeError("Failed to fetch elevation data from any source")
+    if output_dir is not None:
+        dem_path = output_dir / DEM_SPILL_FILENAME
+        await _run_worker(dem_path.write_bytes, result["data"])
+        result["data_path"] = dem_path
+        result["data"] = None
     return result
 
 
@@ -204,8 +538,7 @@ async def step_fetch_osm(
     osm_data = await fetch_all_features(bbox, job)
 
     for name, data in osm_data.items():
-        with open(output_dir / f"osm_{name}.geojson", "w") as f:
-            json.dump(data, f)
+        _write_json(output_dir / f"osm_{name}.geojson", data)
 
     if job is not None:
         osm_label = "OpenStreetMap (Overpass)"
@@ -289,6 +622,7 @@ async def _fetch_features_sweden(
         fetch_buildings,
         fetch_land_use,
         probe_overpass_mirrors,
+        rotate_endpoints,
     )
 
     bbox_tuple = (bbox["west"], bbox["south"], bbox["east"], bbox["north"])
@@ -298,7 +632,7 @@ async def _fetch_features_sweden(
             "Sweden detected — using Lantmäteriet official data for water and "
             "land cover (OSM for roads and buildings)..."
         )
-        job.progress = 27
+        job.progress = max(job.progress, 27)
 
     # Probe the Overpass mirror pool once; the ranked order is reused for the
     # OSM roads/buildings fetches and any land-cover fallbacks further down.
@@ -310,7 +644,10 @@ async def _fetch_features_sweden(
     lm_water_task = fetch_lantmateriet_water(bbox_tuple, job)
     lm_land_cover_task = fetch_lantmateriet_land_cover(bbox_tuple, job)
     osm_roads_task = fetch_roads(bbox, job, overpass_endpoints)
-    osm_buildings_task = fetch_buildings(bbox, job, overpass_endpoints)
+    # Started together with roads, so begin on a different mirror.
+    osm_buildings_task = fetch_buildings(
+        bbox, job, rotate_endpoints(overpass_endpoints, 1)
+    )
 
     lm_water, lm_land_cover, osm_roads, osm_buildings = await asyncio.gather(
         lm_water_task,
@@ -381,8 +718,7 @@ async def _fetch_features_sweden(
 
     # Save GeoJSON files (same naming as OSM path for downstream compatibility)
     for name, data in result.items():
-        with open(output_dir / f"osm_{name}.geojson", "w") as f:
-            json.dump(data, f)
+        _write_json(output_dir / f"osm_{name}.geojson", data)
 
     if job is not None:
         job.feature_sources = sources
@@ -391,7 +727,7 @@ async def _fetch_features_sweden(
 
 
 def step_generate_heightmap(
-    dem_bytes: bytes,
+    dem_bytes: bytes | Path,
     osm_data: dict,
     target_size: int | tuple[int, int],
     target_resolution: float,
@@ -405,6 +741,8 @@ def step_generate_heightmap(
             - int: square heightmap (size x size)
             - tuple (size_x, size_z): non-square heightmap (width x height)
 
+        dem_bytes: Raw GeoTIFF bytes or the path step 2 spilled them to.
+
     Returns result dict including '_elevation_array' and '_dem_metadata'
     for reuse in step 5 (avoids re-parsing the DEM).
     """
@@ -468,30 +806,125 @@ def step_process_roads(
 
     # Export original WGS84 GeoJSON
     road_geojson = export_roads_geojson(road_result)
-    with open(output_dir / "roads_enfusion.geojson", "w") as f:
-        json.dump(road_geojson, f)
+    _write_json(output_dir / "roads_enfusion.geojson", road_geojson)
 
     # Export with local coordinates if transformer is available
     if transformer:
         road_geojson_local = export_roads_geojson_local(road_result, transformer)
-        with open(output_dir / "roads_enfusion_local.geojson", "w") as f:
-            json.dump(road_geojson_local, f)
+        _write_json(output_dir / "roads_enfusion_local.geojson", road_geojson_local)
 
     # Export CSV (with local coords + elevation if transformer available)
-    road_csv = export_roads_spline_csv(
-        road_result, transformer=transformer, elevation_array=elevation_array,
-    )
-    with open(output_dir / "roads_splines.csv", "w") as f:
-        f.write(road_csv)
+    # Rows are streamed straight to disk through a 1 MiB buffer rather than
+    # joined into one string first (large networks run to tens of MB).
+    with open(output_dir / "roads_splines.csv", "w", buffering=1 << 20) as f:
+        export_roads_spline_csv(
+            road_result, transformer=transformer, elevation_array=elevation_array,
+            fp=f,
+        )
 
     # Export roads reference CSV for manual prefab setup in Workbench
-    reference_csv = export_roads_reference_csv(road_result)
-    with open(output_dir / "roads_reference.csv", "w") as f:
-        f.write(reference_csv)
+    with open(output_dir / "roads_reference.csv", "w", buffering=1 << 20) as f:
+        export_roads_reference_csv(road_result, fp=f)
 
     return road_result
 
 
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_ihdr(data: bytes) -> tuple[int, int, int, int] | None:
+    """
+    (width, height, bit_depth, colour_type) from a PNG's IHDR chunk, which
+    sits at a fixed offset after the signature; None if `data` is not a PNG.
+    """
+    if len(data) < 33 or not data.startswith(_PNG_SIGNATURE) or data[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">IIBB", data[16:26])
+
+
+def _png_with_dpi(data: bytes, width: int, height: int, dpi: int = 96) -> bytes | None:
+    """
+    Stamp DPI metadata onto an already-correct PNG without re-encoding it.
+
+    Returns the PNG with a pHYs chunk (replacing any existing one) inserted
+    right after IHDR when `data` is an 8-bit RGB PNG of exactly width×height,
+    or None when the image needs the full PIL decode/convert/resize path.
+    Skipping the libpng decode + re-encode matters for 8k satellite textures.
+    A PNG that already carries exactly this pHYs is returned as-is (no copy).
+    """
+    if _png_ihdr(data) != (width, height, 8, 2):
+        return None
+
+    # Same rounding PIL uses for dpi=(96, 96) → 3780 pixels per metre.
+    ppm = int(dpi / 0.0254 + 0.5)
+    phys_data = struct.pack(">IIB", ppm, ppm, 1)
+    phys_chunk = (
+        struct.pack(">I", len(phys_data))
+        + b"pHYs"
+        + phys_data
+        + struct.pack(">I", zlib.crc32(b"pHYs" + phys_data))
+    )
+
+    # Slice through a memoryview so only the final join copies the payload.
+    view = memoryview(data)
+    ihdr_end = 8 + 4 + 4 + 13 + 4
+    parts = [view[:ihdr_end], phys_chunk]
+    pos = ihdr_end
+    existing_phys = []
+    # pHYs must precede IDAT; drop any existing one so there is exactly one.
+    while pos + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", view[pos:pos + 8])
+        chunk_end = pos + 12 + length
+        if chunk_type == b"pHYs":
+            existing_phys.append(bytes(view[pos:chunk_end]))
+        else:
+            parts.append(view[pos:chunk_end])
+        pos = chunk_end
+    if existing_phys == [phys_chunk]:
+        return data
+    return b"".join(parts)
+
+
+def _save_satellite_png_vips(data: bytes, path: Path, width: int, height: int) -> bool:
+    """
+    Decode, resize to exactly width×height (Lanczos3) and save as a 96 DPI
+    RGB PNG with libvips. Returns False when pyvips is unavailable or the
+    image needs handling the PIL path does better (non-8-bit samples), so the
+    caller can fall back.
+
+    libvips streams the image in strips through multi-threaded SIMD kernels,
+    which makes the resize of an 8k satellite texture several times faster
+    than Pillow's single-threaded LANCZOS and avoids holding the full decoded
+    source and the resized copy in memory at once.
+    """
+    if pyvips is None:
+        return False
+    try:
+        img = pyvips.Image.new_from_buffer(data, "", access="sequential")
+        if img.format != "uchar":
+            return False
+        if img.interpretation not in ("srgb", "rgb"):
+            # Greyscale and CMYK (e.g. Adobe JPEGs) need a real conversion;
+            # taking the first three CMYK bands would give wrong colours.
+            img = img.colourspace("srgb")
+        if img.bands > 3:
+            # Drop alpha like PIL's convert("RGB").
+            img = img.extract_band(0, n=3)
+        if (img.width, img.height) != (width, height):
+            logger.info(
+                f"Resizing satellite image from {img.width}x{img.height} "
+                f"to {width}x{height} to match heightmap (libvips)"
+            )
+            img = img.thumbnail_image(width, height=height, size="force")
+        # libvips resolution is pixels per millimetre.
+        img = img.copy(xres=96 / 25.4, yres=96 / 25.4)
+        img.pngsave(str(path))
+    except pyvips.Error as e:
+        logger.warning(f"libvips could not convert satellite image ({e}), falling back to PIL")
+        return False
+    return True
+
+
 async def step_fetch_satellite_imagery(
     bbox: dict,
     target_size_x: int,
@@ -526,35 +959,51 @@ async def step_fetch_satellite_imagery(
         # Validate and convert to proper PNG — WMS may return JPEG
         # despite FORMAT=image/png request.
         # Also ensure correct dimensions and DPI metadata for Enfusion import.
-        try:
-            from PIL import Image
-            import io
-
-            img = Image.open(io.BytesIO(satellite_data))
-            original_format = img.format  # e.g. "JPEG", "PNG"
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Resize to match heightmap dimensions if different
-            if img.size != (width, height):
+        fast_png = _png_with_dpi(satellite_data, width, height)
+        if fast_png is not None:
+            # A payload larger than the file buffer goes straight to write(2).
+            satellite_path.write_bytes(fast_png)
+            actual_dims = f"{width}x{height}"
+            logger.info(f"Saved satellite image as PNG ({actual_dims}, dpi=96, no re-encode)")
+        elif await _run_worker(
+            _save_satellite_png_vips, satellite_data, satellite_path, width, height,
+        ):
+            actual_dims = f"{width}x{height}"
+            logger.info(f"Saved satellite image as PNG ({actual_dims}, dpi=96, libvips)")
+        else:
+            try:
+                from PIL import Image
+                import io
+
+                img = Image.open(io.BytesIO(satellite_data))
+                original_format = img.format  # e.g. "JPEG", "PNG"
+                if img.mode != "RGB":
+                    img = img.convert("RGB")
+
+                # Resize to match heightmap dimensions if different
+                if img.size != (width, height):
+                    logger.info(
+                        f"Resizing satellite image from {img.size[0]}x{img.size[1]} "
+                        f"to {width}x{height} to match heightmap"
+                    )
+                    img = img.resize((width, height), Image.LANCZOS)
+
+                # Save with DPI metadata (required by Enfusion Workbench for import).
+                # zlib level 1 is several times faster than the default 6 on
+                # multi-megapixel imagery for a modestly larger file.
+                img.save(
+                    str(satellite_path), format="PNG", dpi=(96, 96),
+                    optimize=False, compress_level=1,
+                )
+                actual_dims = f"{img.size[0]}x{img.size[1]}"
                 logger.info(
-                    f"Resizing satellite image from {img.size[0]}x{img.size[1]} "
-                    f"to {width}x{height} to match heightmap"
+                    f"Saved satellite image as PNG ({actual_dims}, dpi=96, "
+                    f"original format: {original_format})"
                 )
-                img = img.resize((width, height), Image.LANCZOS)
-
-            # Save with DPI metadata (required by Enfusion Workbench for import)
-            img.save(str(satellite_path), format="PNG", dpi=(96, 96))
-            actual_dims = f"{img.size[0]}x{img.size[1]}"
-            logger.info(
-                f"Saved satellite image as PNG ({actual_dims}, dpi=96, "
-                f"original format: {original_format})"
-            )
-        except Exception as e:
-            logger.warning(f"Failed to validate/convert satellite image: {e}, saving raw bytes")
-            with open(satellite_path, "wb") as f:
-                f.write(satellite_data)
-            actual_dims = f"{width}x{height}"
+            except Exception as e:
+                logger.warning(f"Failed to validate/convert satellite image: {e}, saving raw bytes")
+                satellite_path.write_bytes(satellite_data)
+                actual_dims = f"{width}x{height}"
 
         return {
             "success": True,
@@ -579,8 +1028,7 @@ def step_extract_features(osm_data: dict, primary_country: str, output_dir: Path
 
     features = extract_all_features(osm_data, primary_country, job)
 
-    with open(output_dir / "features.json", "w") as f:
-        json.dump(features, f, default=str)
+    _write_json(output_dir / "features.json", features, default=_json_default)
 
     return features
 
@@ -699,10 +1147,61 @@ def build_metadata(
     return metadata
 
 
+def step_validate_rasters(
+    output_dir: Path,
+    heightmap_result: dict,
+    job: Optional[MapGenerationJob] = None,
+) -> Optional[dict]:
+    """Step 10b: Validate the raster dimension/encoding contract and harden
+    PNG encodings. A mismatched mask/heightmap size or an unexpected
+    channel/profile is a documented first-paint crash trigger
+    (#100/#111/#115/#138). Non-fatal: logs loudly and returns the report for
+    metadata, or None if validation could not run.
+    """
+    try:
+        from services.raster_contract import validate_and_harden_rasters
+
+        hm_w, hm_h = heightmap_result["dimensions_px"]
+        raster_report = validate_and_harden_rasters(
+            output_dir, hm_w - 1, hm_h - 1, job=job
+        )
+    except Exception as exc:  # noqa: BLE001 - validation must never abort
+        logger.warning(f"Raster contract validation skipped: {exc}")
+        return None
+
+    if job:
+        if raster_report["fixes"]:
+            job.add_log(
+                f"Hardened raster encodings: {', '.join(raster_report['fixes'])}",
+                "info",
+            )
+        if raster_report["ok"]:
+            job.add_log("Raster dimension/encoding contract OK", "success")
+        else:
+            job.add_log(
+                f"Raster contract found {len(raster_report['issues'])} "
+                f"issue(s) — see metadata.json raster_validation",
+                "warning",
+            )
+    return raster_report
+
+
 # ---------------------------------------------------------------------------
 # Orchestrator
 # ---------------------------------------------------------------------------
 
+def launch_generation(job: MapGenerationJob) -> asyncio.Task:
+    """
+    Start run_generation for `job` in a task of its own and keep the handle.
+
+    The pipeline must not run as the request's background task: that one
+    lives inside the HTTP middleware stack, and job.cancel() has to cancel
+    exactly the pipeline and nothing else.
+    """
+    job._task = asyncio.create_task(run_generation(job))
+    return job._task
+
+
 async def run_generation(job: MapGenerationJob):
     """
     Execute the full map generation pipeline.
@@ -722,26 +1221,39 @@ async def run_generation(job: MapGenerationJob):
     # in the outer finally block.
     job_token = current_job_var.set(job)
 
+    # Steps started ahead of the point where their results are consumed
+    # (network fetches in step 2). Cancelled on failure so a failed step
+    # does not leave the others running.
+    pending_tasks: list[asyncio.Task] = []
+    # Worker-thread steps (see _start_worker). Cancelling their task would
+    # not stop the thread, only orphan it while it keeps writing into
+    # output_dir or the ZIP, so on failure they are awaited instead.
+    thread_tasks: list[asyncio.Task] = []
+    workers_token = _worker_tasks_var.set(thread_tasks)
+    # Export ZIP, opened once steps 1-11 have produced their final files.
+    # The raw file is kept so its final size is known without a stat().
+    export_zip: Optional[zipfile.ZipFile] = None
+    export_zip_raw = None
+
     try:
         job.status = "running"
 
         # Step 1: Detect countries (0% -> 10%)
-        job.current_step = "Detecting countries..."
-        job.progress = 0
         logger.info(f"[{job.job_id}] Step 1: Country detection")
-        job.add_log("Detecting countries in selected area...")
+        _check_cancel(job)
+        job.begin_step("Detecting countries...", 0, "Detecting countries in selected area...")
 
         country_info = await step_detect_countries(job.polygon_coords)
         primary_country = country_info["primary_country"]
         bbox = country_info["bbox"]
 
         job.progress = 10
-        job.steps_completed.append({
-            "step": "country_detection",
-            "countries": country_info["countries"],
-            "primary_country": primary_country,
-            "crs": country_info["crs"],
-        })
+        job.complete_step(
+            "country_detection",
+            countries=country_info["countries"],
+            primary_country=primary_country,
+            crs=country_info["crs"],
+        )
         logger.info(
             f"[{job.job_id}] Countries: {country_info['countries']}, "
             f"Primary: {primary_country}, CRS: {country_info['crs']}"
@@ -752,10 +1264,13 @@ async def run_generation(job: MapGenerationJob):
         )
 
         # Step 2: Fetch elevation data (10% -> 25%)
-        job.current_step = f"Downloading elevation data ({primary_country})..."
-        job.progress = 10
         logger.info(f"[{job.job_id}] Step 2: Elevation acquisition")
-        job.add_log(f"Downloading elevation data ({primary_country})...")
+        _check_cancel(job)
+        job.begin_step(
+            f"Downloading elevation data ({primary_country})...",
+            10,
+            f"Downloading elevation data ({primary_country})...",
+        )
 
         # Terrain grid size = faces per axis = real-world metres ÷ grid cell
         # size, snapped to a valid tile multiple (×128). The heightmap PNG is
@@ -793,16 +1308,104 @@ async def run_generation(job: MapGenerationJob):
         # the merge step.  We cap elevation to 2× the heightmap vertices so
         # there is still quality headroom for the later bicubic resample.
         max_vertex = max(target_size_x, target_size_z)
-        elevation_result = await step_fetch_elevation(
-            bbox, primary_country, job, max_pixels=max_vertex * 2,
+
+        # Coordinate transformer + satellite fetch parameters.
+        # The transformer is needed BEFORE the satellite fetch so we can compute
+        # the WGS84 envelope of the projected terrain rectangle and fetch a region
+        # that fully covers it. Without this, the WGS84-axis-aligned fetch bbox
+        # leaves two corners of the projected destination uncovered (see #58).
+        from services.coordinate_transformer import CoordinateTransformer
+
+        # The heightmap is resampled to exactly target_size, so its terrain
+        # extent (faces × cell) is known before step 4 runs.
+        terrain_size_m = (
+            float(round(faces_x * cell_size)),
+            float(round(faces_z * cell_size)),
+        )
+        transformer = CoordinateTransformer(
+            bbox=bbox,
+            crs=country_info["crs"],
+            terrain_size_m=terrain_size_m,
         )
 
-        job.progress = 25
-        job.steps_completed.append({
-            "step": "elevation_download",
-            "source": elevation_result["source"],
-            "resolution_m": elevation_result["resolution_m"],
-        })
+        # Render the satellite texture at higher resolution than the heightmap.
+        # The diffuse texture imported via Terrain Tool > Import Satellite Map
+        # is independent of the heightmap vertex grid, so we can preserve much
+        # more of the source detail (Lantmäteriet STAC Bild is 0.16 m/px, vs
+        # the heightmap's ~2.4 m/px at 2049 vertices on a 5 km map — fixes #67).
+        from services.satellite_service import (
+            SATELLITE_MAX_DIM,
+            compute_satellite_target_dims,
+        )
+
+        sat_target_x, sat_target_z = compute_satellite_target_dims(
+            target_size_x, target_size_z,
+        )
+
+        # If the transformer uses a projected CRS, expand the WGS84 fetch box to
+        # the envelope of the projected rectangle and scale the fetch dimensions
+        # proportionally to keep the same pixel density. This fixes the diagonal
+        # tilt / corner crop caused by source-extent mismatch in reprojection.
+        sat_fetch_bbox = bbox
+        sat_fetch_w = sat_target_x
+        sat_fetch_h = sat_target_z
+        if transformer._use_pyproj:
+            env_w, env_s, env_e, env_n = transformer.wgs84_envelope_of_projected_extent()
+            sat_fetch_bbox = {
+                "west": env_w,
+                "south": env_s,
+                "east": env_e,
+                "north": env_n,
+            }
+            orig_lon_span = bbox["east"] - bbox["west"]
+            orig_lat_span = bbox["north"] - bbox["south"]
+            if orig_lon_span > 0 and orig_lat_span > 0:
+                ratio_x = (env_e - env_w) / orig_lon_span
+                ratio_y = (env_n - env_s) / orig_lat_span
+                sat_fetch_w = min(SATELLITE_MAX_DIM, int(math.ceil(sat_target_x * ratio_x)))
+                sat_fetch_h = min(SATELLITE_MAX_DIM, int(math.ceil(sat_target_z * ratio_y)))
+
+        # Elevation (step 2), map features (step 3) and satellite imagery
+        # (step 6) only depend on the bbox and country from step 1, and all
+        # three spend most of their time waiting on remote servers. Start
+        # them together so their latencies overlap instead of summing; the
+        # satellite task is awaited later, just before its results are used.
+        job.current_step = "Downloading elevation, map features and satellite imagery..."
+        job.add_log("Fetching map features (roads, water, forests, buildings)...")
+        if primary_country == "SE":
+            job.add_log("Downloading satellite imagery (trying Lantmäteriet historical orthophotos, then Sentinel-2)...")
+        else:
+            job.add_log("Downloading satellite imagery from Sentinel-2 Cloudless...")
+
+        elev_task = asyncio.create_task(step_fetch_elevation(
+            bbox, primary_country, job, max_pixels=max_vertex * 2,
+            output_dir=output_dir,
+        ))
+        osm_task = asyncio.create_task(step_fetch_features(
+            bbox, primary_country, output_dir, job=job
+        ))
+        sat_task = asyncio.create_task(step_fetch_satellite_imagery(
+            bbox=sat_fetch_bbox,
+            target_size_x=sat_fetch_w,
+            target_size_z=sat_fetch_h,
+            output_dir=output_dir,
+            country_codes=country_info.get("countries", []),
+            job=job,
+        ))
+        pending_tasks.extend([elev_task, osm_task, sat_task])
+
+        elevation_result, osm_data = await asyncio.gather(elev_task, osm_task)
+
+        # The elevation and feature fetches report progress from their old
+        # sequential ranges (12-23 and 27-35) while running interleaved, so
+        # every write in them only ever raises the bar: max() keeps it
+        # monotonic.
+        job.progress = max(job.progress, 25)
+        job.complete_step(
+            "elevation_download",
+            source=elevation_result["source"],
+            resolution_m=elevation_result["resolution_m"],
+        )
         logger.info(f"[{job.job_id}] Elevation: {elevation_result['source']} ({elevation_result['resolution_m']}m)")
         job.add_log(
             f"Downloaded elevation data from {elevation_result['source']} ({elevation_result['resolution_m']}m resolution)",
@@ -812,14 +1415,8 @@ async def run_generation(job: MapGenerationJob):
         # Step 3: Fetch geographic features (25% -> 40%)
         # For Sweden: Lantmäteriet APIs (primary) + OSM (roads/buildings)
         # For others: OSM Overpass (all features)
-        job.current_step = "Downloading map features (roads, water, forests, buildings)..."
-        job.progress = 25
+        # (Fetched concurrently with step 2 above.)
         logger.info(f"[{job.job_id}] Step 3: Geographic feature extraction")
-        job.add_log("Fetching map features (roads, water, forests, buildings)...")
-
-        osm_data = await step_fetch_features(
-            bbox, primary_country, output_dir, job=job
-        )
 
         if osm_data is None:
             raise RuntimeError(
@@ -828,8 +1425,8 @@ async def run_generation(job: MapGenerationJob):
             )
 
         job.progress = 40
-        feature_counts = {k: len(v.get("features", [])) for k, v in osm_data.items()}
-        job.steps_completed.append({"step": "osm_features", "feature_counts": feature_counts})
+        feature_counts = {k: len(v.get("features") or ()) for k, v in osm_data.items()}
+        job.complete_step("osm_features", feature_counts=feature_counts)
         logger.info(f"[{job.job_id}] Geographic features: {feature_counts}")
 
         # Detect total OSM/Lantmäteriet failure (every collection empty).
@@ -861,10 +1458,9 @@ async def run_generation(job: MapGenerationJob):
         )
 
         # Step 4: Generate heightmap (40% -> 60%)
-        job.current_step = "Generating heightmap..."
-        job.progress = 40
         logger.info(f"[{job.job_id}] Step 4: Heightmap generation")
-        job.add_log("Generating heightmap from elevation data...")
+        _check_cancel(job)
+        job.begin_step("Generating heightmap...", 40, "Generating heightmap from elevation data...")
 
         # target_size (heightmap pixels) was derived from the bbox in step 2.
         target_resolution = cell_size
@@ -872,8 +1468,9 @@ async def run_generation(job: MapGenerationJob):
         from services.heightmap_generator import ElevationTruncatedError
 
         try:
-            heightmap_result = step_generate_heightmap(
-                dem_bytes=elevation_result["data"],
+            heightmap_result = await _run_worker(
+                step_generate_heightmap,
+                dem_bytes=elevation_result["data_path"],
                 osm_data=osm_data,
                 target_size=target_size,
                 target_resolution=target_resolution,
@@ -918,7 +1515,8 @@ async def run_generation(job: MapGenerationJob):
             job.add_log(f"Downloaded fallback elevation from {fallback_source_label} (30m)", "success")
 
             try:
-                heightmap_result = step_generate_heightmap(
+                heightmap_result = await _run_worker(
+                    step_generate_heightmap,
                     dem_bytes=fallback_data,
                     osm_data=osm_data,
                     target_size=target_size,
@@ -939,18 +1537,19 @@ async def run_generation(job: MapGenerationJob):
                 "warning"
             )
 
-        # Free raw GeoTIFF bytes from elevation_result — no longer needed.
-        # For Sweden STAC this can be ~192 MB. The heightmap pipeline has
-        # already extracted the numpy array, so we only keep the metadata.
+        # The heightmap pipeline has extracted the numpy array; drop the
+        # spilled DEM so it is not packaged into the export ZIP, and any
+        # fallback bytes so only the metadata is kept.
+        elevation_result["data_path"].unlink(missing_ok=True)
         elevation_result["data"] = None
 
         job.progress = 60
-        job.steps_completed.append({
-            "step": "heightmap",
-            "dimensions": heightmap_result["dimensions"],
-            "terrain_size": heightmap_result["terrain_size_m"],
-            "elevation_range": f"{heightmap_result['min_elevation']:.1f}m - {heightmap_result['max_elevation']:.1f}m",
-        })
+        job.complete_step(
+            "heightmap",
+            dimensions=heightmap_result["dimensions"],
+            terrain_size=heightmap_result["terrain_size_m"],
+            elevation_range=f"{heightmap_result['min_elevation']:.1f}m - {heightmap_result['max_elevation']:.1f}m",
+        )
         logger.info(
             f"[{job.job_id}] Heightmap generated: {heightmap_result['dimensions']} pixels, "
             f"{heightmap_result['terrain_size_m']}m terrain, "
@@ -964,20 +1563,28 @@ async def run_generation(job: MapGenerationJob):
 
         # Step 5: Generate surface masks (60% -> 75%)
         # Reuses the elevation array from step 4 — no DEM re-parsing needed.
-        job.current_step = "Generating surface masks..."
-        job.progress = 60
         logger.info(f"[{job.job_id}] Step 5: Surface mask generation")
-        job.add_log("Generating surface masks (9 types: grass, forest, pine, asphalt, gravel, dirt, rock, sand, water edge)...")
+        _check_cancel(job)
+        job.begin_step(
+            "Generating surface masks...",
+            60,
+            "Generating surface masks (9 types: grass, forest, pine, asphalt, gravel, dirt, rock, sand, water edge)...",
+        )
 
         # Heightmap is at vertex resolution (N+1); surface weight masks must be
         # at face resolution (N). At vertex resolution, Workbench's NVTT bake
         # crashes in nvtt::CubeSurface::toGamma on the first manual paint
         # stroke after import. (Issue #100)
-        hm_dims_str = heightmap_result["dimensions"]
-        hm_w, hm_h = (int(p) for p in hm_dims_str.split("x"))
+        hm_w, hm_h = heightmap_result["dimensions_px"]
         mask_dims = (hm_w - 1, hm_h - 1)
 
-        surface_result = step_generate_surface_masks(
+        # Surface masks, road processing (step 8) and feature extraction
+        # (step 9) only read osm_data / the elevation array and write
+        # separate files, so they run side by side in worker threads; the
+        # rasterization and scipy work they do releases the GIL, and the
+        # event loop stays free to finish the satellite download.
+        surface_task = _start_worker(
+            step_generate_surface_masks,
             elevation_array=heightmap_result["_elevation_array"],
             osm_data=osm_data,
             bbox=bbox,
@@ -987,13 +1594,25 @@ async def run_generation(job: MapGenerationJob):
             heightmap_dimensions=mask_dims,
             job=job,
         )
+        roads_task = _start_worker(
+            step_process_roads,
+            osm_data, primary_country, output_dir,
+            transformer=transformer,
+            elevation_array=heightmap_result.get("_elevation_array"),
+            job=job,
+        )
+        features_task = _start_worker(
+            step_extract_features, osm_data, primary_country, output_dir, job,
+        )
+
+        surface_result = await asyncio.shield(surface_task)
 
         job.progress = 75
-        job.steps_completed.append({
-            "step": "surface_masks",
-            "mask_count": surface_result["mask_count"],
-            "surfaces": surface_result["surfaces"],
-        })
+        job.complete_step(
+            "surface_masks",
+            mask_count=surface_result["mask_count"],
+            surfaces=surface_result["surfaces"],
+        )
         logger.info(
             f"[{job.job_id}] Surface masks: {surface_result['mask_count']} masks "
             f"({', '.join(surface_result['surfaces'])})"
@@ -1003,86 +1622,23 @@ async def run_generation(job: MapGenerationJob):
             "success"
         )
 
-        # Step 6: Coordinate transformer + satellite imagery (75% -> 77%)
-        # The transformer is needed BEFORE the satellite fetch so we can compute
-        # the WGS84 envelope of the projected terrain rectangle and fetch a region
-        # that fully covers it. Without this, the WGS84-axis-aligned fetch bbox
-        # leaves two corners of the projected destination uncovered (see #58).
-        from services.coordinate_transformer import CoordinateTransformer
-
-        terrain_size_m = (
-            float(heightmap_result["terrain_size_m"].split("x")[0]),
-            float(heightmap_result["terrain_size_m"].split("x")[1]),
-        )
-        transformer = CoordinateTransformer(
-            bbox=bbox,
-            crs=country_info["crs"],
-            terrain_size_m=terrain_size_m,
-        )
-
-        # Render the satellite texture at higher resolution than the heightmap.
-        # The diffuse texture imported via Terrain Tool > Import Satellite Map
-        # is independent of the heightmap vertex grid, so we can preserve much
-        # more of the source detail (Lantmäteriet STAC Bild is 0.16 m/px, vs
-        # the heightmap's ~2.4 m/px at 2049 vertices on a 5 km map — fixes #67).
-        from services.satellite_service import (
-            SATELLITE_MAX_DIM,
-            compute_satellite_target_dims,
-        )
-
-        sat_target_x, sat_target_z = compute_satellite_target_dims(
-            target_size_x, target_size_z,
-        )
-
-        # If the transformer uses a projected CRS, expand the WGS84 fetch box to
-        # the envelope of the projected rectangle and scale the fetch dimensions
-        # proportionally to keep the same pixel density. This fixes the diagonal
-        # tilt / corner crop caused by source-extent mismatch in reprojection.
-        sat_fetch_bbox = bbox
-        sat_fetch_w = sat_target_x
-        sat_fetch_h = sat_target_z
-        if transformer._use_pyproj:
-            env_w, env_s, env_e, env_n = transformer.wgs84_envelope_of_projected_extent()
-            sat_fetch_bbox = {
-                "west": env_w,
-                "south": env_s,
-                "east": env_e,
-                "north": env_n,
-            }
-            orig_lon_span = bbox["east"] - bbox["west"]
-            orig_lat_span = bbox["north"] - bbox["south"]
-            if orig_lon_span > 0 and orig_lat_span > 0:
-                ratio_x = (env_e - env_w) / orig_lon_span
-                ratio_y = (env_n - env_s) / orig_lat_span
-                sat_fetch_w = min(SATELLITE_MAX_DIM, int(math.ceil(sat_target_x * ratio_x)))
-                sat_fetch_h = min(SATELLITE_MAX_DIM, int(math.ceil(sat_target_z * ratio_y)))
-
-        job.current_step = "Downloading satellite imagery..."
-        job.progress = 75
+        # Step 6: Satellite imagery (75% -> 77%)
+        # (Fetch was started alongside steps 2 and 3.)
         logger.info(f"[{job.job_id}] Step 6: Satellite imagery")
-        if primary_country == "SE":
-            job.add_log("Downloading satellite imagery (trying Lantmäteriet historical orthophotos, then Sentinel-2)...")
-        else:
-            job.add_log("Downloading satellite imagery from Sentinel-2 Cloudless...")
+        _check_cancel(job)
+        job.begin_step("Downloading satellite imagery...", 75)
 
-        satellite_result = await step_fetch_satellite_imagery(
-            bbox=sat_fetch_bbox,
-            target_size_x=sat_fetch_w,
-            target_size_z=sat_fetch_h,
-            output_dir=output_dir,
-            country_codes=country_info.get("countries", []),
-            job=job,
-        )
+        satellite_result = await sat_task
 
         job.progress = 77
         sat_source = satellite_result.get("source", "Sentinel-2 Cloudless")
         if satellite_result["success"]:
-            job.steps_completed.append({
-                "step": "satellite_imagery",
-                "file": satellite_result["file"],
-                "dimensions": satellite_result["dimensions"],
-                "source": sat_source,
-            })
+            job.complete_step(
+                "satellite_imagery",
+                file=satellite_result["file"],
+                dimensions=satellite_result["dimensions"],
+                source=sat_source,
+            )
             logger.info(f"[{job.job_id}] Satellite imagery: {satellite_result['file']} ({satellite_result['dimensions']}) from {sat_source}")
             job.add_log(
                 f"Downloaded satellite imagery from {sat_source}: {satellite_result['file']} ({satellite_result['dimensions']})",
@@ -1094,9 +1650,9 @@ async def run_generation(job: MapGenerationJob):
 
         # Step 7: Coordinate transformation logging (77% -> 78%)
         # (Transformer was created above, before the satellite fetch.)
-        job.current_step = "Setting up coordinate transformation..."
-        job.progress = 77
         logger.info(f"[{job.job_id}] Step 7: Coordinate transformation")
+        _check_cancel(job)
+        job.begin_step("Setting up coordinate transformation...", 77)
 
         coord_verification = transformer.get_verification_data()
         job.add_log(
@@ -1104,11 +1660,11 @@ async def run_generation(job: MapGenerationJob):
             f"projected {coord_verification['projected_width_m']:.0f}m x {coord_verification['projected_depth_m']:.0f}m",
             "success"
         )
-        job.steps_completed.append({
-            "step": "coordinate_transform",
-            "method": coord_verification["method"],
-            "crs": country_info["crs"],
-        })
+        job.complete_step(
+            "coordinate_transform",
+            method=coord_verification["method"],
+            crs=country_info["crs"],
+        )
 
         # Step 7b: Reproject satellite image to terrain CRS (fixes road/satellite alignment)
         # The satellite is fetched in WGS84 (linear lat/lon). Roads and the heightmap use
@@ -1129,7 +1685,8 @@ async def run_generation(job: MapGenerationJob):
                     transformer._ne_projected[0],
                     transformer._ne_projected[1],
                 )
-                reproject_ok = reproject_satellite_to_terrain_crs(
+                reproject_ok = await _run_worker(
+                    reproject_satellite_to_terrain_crs,
                     satellite_path=satellite_path,
                     src_bbox=(
                         sat_fetch_bbox["west"],
@@ -1155,27 +1712,25 @@ async def run_generation(job: MapGenerationJob):
                     )
 
         # Step 8: Process roads (78% -> 82%)
-        job.current_step = "Processing road network..."
-        job.progress = 78
         logger.info(f"[{job.job_id}] Step 8: Road processing")
-        job.add_log("Processing road network and classifying road types...")
-
-        road_result = step_process_roads(
-            osm_data, primary_country, output_dir,
-            transformer=transformer,
-            elevation_array=heightmap_result.get("_elevation_array"),
-            job=job,
+        _check_cancel(job)
+        job.begin_step(
+            "Processing road network...",
+            78,
+            "Processing road network and classifying road types...",
         )
 
+        road_result = await asyncio.shield(roads_task)
+
         job.progress = 82
         road_stats = road_result.get("stats", {})
         road_total = road_stats.get("total", 0)
         road_by_surface = road_stats.get("by_surface", {})
-        job.steps_completed.append({
-            "step": "road_processing",
-            "road_count": road_total,
-            "by_surface": road_by_surface,
-        })
+        job.complete_step(
+            "road_processing",
+            road_count=road_total,
+            by_surface=road_by_surface,
+        )
         surface_breakdown = ", ".join([f"{k}: {v}" for k, v in road_by_surface.items()])
         logger.info(
             f"[{job.job_id}] Roads: {road_total} segments "
@@ -1187,15 +1742,18 @@ async def run_generation(job: MapGenerationJob):
         )
 
         # Step 9: Extract features (82% -> 86%)
-        job.current_step = "Extracting map features..."
-        job.progress = 82
         logger.info(f"[{job.job_id}] Step 9: Feature extraction")
-        job.add_log("Extracting water bodies, forests, and building details...")
+        _check_cancel(job)
+        job.begin_step(
+            "Extracting map features...",
+            82,
+            "Extracting water bodies, forests, and building details...",
+        )
 
-        features = step_extract_features(osm_data, primary_country, output_dir, job)
+        features = await asyncio.shield(features_task)
 
         job.progress = 86
-        job.steps_completed.append({"step": "feature_extraction", "summary": features["summary"]})
+        job.complete_step("feature_extraction", summary=features["summary"])
         logger.info(f"[{job.job_id}] Features: {features['summary']}")
         summary = features["summary"]
         job.add_log(
@@ -1205,8 +1763,8 @@ async def run_generation(job: MapGenerationJob):
         )
 
         # Step 10: Build metadata (86% -> 87%)
-        job.current_step = "Building metadata..."
-        job.progress = 86
+        _check_cancel(job)
+        job.begin_step("Building metadata...", 86)
 
         map_name = job.options.get("map_name", "")
         if not map_name:
@@ -1230,46 +1788,22 @@ async def run_generation(job: MapGenerationJob):
             feature_sources=job.feature_sources,
         )
 
-        # Step 10b: Validate the raster dimension/encoding contract and harden
-        # PNG encodings. A mismatched mask/heightmap size or an unexpected
-        # channel/profile is a documented first-paint crash trigger
-        # (#100/#111/#115/#138). Non-fatal: log loudly, record in metadata.
-        try:
-            from services.raster_contract import validate_and_harden_rasters
-
-            grid = str(heightmap_result.get("terrain_grid_size", "")).split("x")
-            faces_x = int(grid[0])
-            faces_z = int(grid[1]) if len(grid) > 1 else faces_x
-            raster_report = validate_and_harden_rasters(
-                output_dir, faces_x, faces_z, job=job
-            )
-            metadata["raster_validation"] = raster_report
-            if raster_report["fixes"]:
-                job.add_log(
-                    f"Hardened raster encodings: {', '.join(raster_report['fixes'])}",
-                    "info",
-                )
-            if raster_report["ok"]:
-                job.add_log("Raster dimension/encoding contract OK", "success")
-            else:
-                job.add_log(
-                    f"Raster contract found {len(raster_report['issues'])} "
-                    f"issue(s) — see metadata.json raster_validation",
-                    "warning",
-                )
-        except Exception as exc:  # noqa: BLE001 - validation must never abort
-            logger.warning(f"[{job.job_id}] Raster contract validation skipped: {exc}")
-
-        with open(output_dir / "metadata.json", "w") as f:
-            json.dump(metadata, f, indent=2)
+        # Step 10b: Validate the raster contract in a worker thread alongside
+        # step 11. The validator only touches the PNG/ASC rasters and step 11
+        # only writes project text files, so neither depends on the other's
+        # output; the report is merged into metadata once both are done.
+        raster_task = _start_worker(
+            step_validate_rasters, output_dir, heightmap_result, job,
+        )
 
         # Step 11: Generate Enfusion project files (87% -> 92%)
-        job.current_step = "Generating Enfusion project files..."
-        job.progress = 87
         logger.info(f"[{job.job_id}] Step 11: Enfusion project generation")
-        job.add_log("Generating Enfusion Workbench project files...")
-
-        from services.enfusion_project_generator import EnfusionProjectGenerator, sanitize_project_name
+        _check_cancel(job)
+        job.begin_step(
+            "Generating Enfusion project files...",
+            87,
+            "Generating Enfusion Workbench project files...",
+        )
 
         sanitized_name = sanitize_project_name(map_name)
         enfusion_gen = EnfusionProjectGenerator(
@@ -1283,34 +1817,40 @@ async def run_generation(job: MapGenerationJob):
             building_data=features.get("buildings"),
             country_codes=country_info.get("countries", []),
         )
-        enfusion_files = enfusion_gen.generate_all(output_dir, job=job)
+        enfusion_files = await _run_worker(
+            enfusion_gen.generate_all, output_dir, job=job
+        )
+
+        raster_report = await asyncio.shield(raster_task)
+        if raster_report is not None:
+            metadata["raster_validation"] = raster_report
+
+        await _run_worker(
+            _write_json_indented, output_dir / "metadata.json", metadata
+        )
 
         # Emit surface_assignments.json sidecar (Atlas 2 / v1.4.0).
         # Maps every emitted spline name to the surface mask it is expected
         # to ride on. The Setup Guide references this file; an automation /
         # future surface-painting tool can read it to attach masks to the
         # right entities without re-deriving the mapping.
-        import json as _json
         from config.enfusion import SURFACE_IMPORT_ORDER as _SURFACE_ORDER
-        surface_assignments_path = output_dir / "surface_assignments.json"
-        with open(surface_assignments_path, "w", encoding="utf-8") as _sa:
-            _json.dump(
-                {
-                    "splines_to_surfaces": enfusion_gen.surface_assignments,
-                    "surface_import_order": list(_SURFACE_ORDER),
-                    "atlas2_rule": (
-                        "Import dirt-type surfaces (forest_floor, pine_floor, "
-                        "asphalt, gravel, dirt, water_edge, sand) before grass "
-                        "so the parallax map composites correctly."
-                    ),
-                    "ambient_prefab": enfusion_gen.ambient_prefab,
-                    "country_codes": enfusion_gen.country_codes,
-                    "bootstrap_entity_count": 12,
-                },
-                _sa,
-                indent=2,
-                ensure_ascii=False,
-            )
+        await _run_worker(
+            _write_json_indented,
+            output_dir / "surface_assignments.json",
+            {
+                "splines_to_surfaces": enfusion_gen.surface_assignments,
+                "surface_import_order": list(_SURFACE_ORDER),
+                "atlas2_rule": (
+                    "Import dirt-type surfaces (forest_floor, pine_floor, "
+                    "asphalt, gravel, dirt, water_edge, sand) before grass "
+                    "so the parallax map composites correctly."
+                ),
+                "ambient_prefab": enfusion_gen.ambient_prefab,
+                "country_codes": enfusion_gen.country_codes,
+                "bootstrap_entity_count": 12,
+            },
+        )
         job.add_log(
             f"Wrote surface_assignments.json "
             f"({len(enfusion_gen.surface_assignments)} spline→surface mappings)",
@@ -1322,60 +1862,73 @@ async def run_generation(job: MapGenerationJob):
             f"Generated {len(enfusion_files)} Enfusion project files (addon.gproj, world, layers, mission)",
             "success"
         )
-        job.steps_completed.append({
-            "step": "enfusion_project",
-            "map_name": sanitized_name,
-            "files_created": len(enfusion_files),
-            "bootstrap_entities": 12,
-            "ambient_prefab": enfusion_gen.ambient_prefab,
-            "surface_assignments": len(enfusion_gen.surface_assignments),
-        })
+        job.complete_step(
+            "enfusion_project",
+            map_name=sanitized_name,
+            files_created=len(enfusion_files),
+            bootstrap_entities=12,
+            ambient_prefab=enfusion_gen.ambient_prefab,
+            surface_assignments=len(enfusion_gen.surface_assignments),
+        )
+
+        # Every file from steps 1-11 is final now (rasters were hardened by
+        # step 10b), so start the export ZIP in a worker thread while steps
+        # 12-13 run. Step 13 then only has to add the files written since.
+        # The ZIP has {sanitized_name}/ as its top-level folder so the user
+        # can copy that named folder straight into their addons directory,
+        # matching the SETUP_GUIDE "Copy the {map_name}/ folder" instruction.
+        # Only the files present now are added: step 12 writes alongside.
+        zip_file = OUTPUT_DIR / f"map_{job.job_id}.zip"
+        export_zip_raw = open(zip_file, "wb")
+        export_zip = zipfile.ZipFile(export_zip_raw, "w", allowZip64=True)
+        zipped: set[str] = set()
+        zip_task = _start_worker(
+            _zip_export_files, export_zip, output_dir, sanitized_name, zipped,
+            _list_files(output_dir),
+        )
 
         # Step 12: Generate SETUP_GUIDE.md (92% -> 93%)
-        job.current_step = "Generating setup guide..."
-        job.progress = 92
         logger.info(f"[{job.job_id}] Step 12: Setup guide generation")
-
-        from services.setup_guide_generator import SetupGuideGenerator
+        _check_cancel(job)
+        job.begin_step("Generating setup guide...", 92)
 
         guide_gen = SetupGuideGenerator(sanitized_name, metadata)
-        guide_gen.generate(output_dir)
+        await _run_worker(guide_gen.generate, output_dir)
         job.add_log("Generated comprehensive SETUP_GUIDE.md", "success")
-        job.steps_completed.append({
-            "step": "setup_guide",
-        })
+        job.complete_step("setup_guide")
 
         # Step 13: Organize export and create ZIP (93% -> 95%)
-        job.current_step = "Organizing export and creating ZIP..."
-        job.progress = 93
         logger.info(f"[{job.job_id}] Step 13: Export packaging")
-        job.add_log("Organizing files into Enfusion project structure...")
+        _check_cancel(job)
+        job.begin_step(
+            "Organizing export and creating ZIP...",
+            93,
+            "Organizing files into Enfusion project structure...",
+        )
 
-        from services.export_service import organize_export_structure
-        organize_export_structure(output_dir, sanitized_name, job=job)
+        # The early ZIP pass must be done before files start moving.
+        await asyncio.shield(zip_task)
+        await _run_worker(
+            organize_export_structure, output_dir, sanitized_name, job=job
+        )
 
         job.progress = 95
         job.add_log("Creating ZIP archive...")
-        zip_file = OUTPUT_DIR / f"map_{job.job_id}.zip"
+        await _run_worker(
+            _zip_export_files, export_zip, output_dir, sanitized_name, zipped,
+        )
+        export_zip.close()
+        export_zip = None
+        # close() wrote the central directory, so the offset is the file size
+        zip_size = export_zip_raw.tell()
+        export_zip_raw.close()
+        export_zip_raw = None
 
-        # Write ZIP with {sanitized_name}/ as top-level folder so the user
-        # can copy that named folder straight into their addons directory,
-        # matching the SETUP_GUIDE "Copy the {map_name}/ folder" instruction.
-        with zipfile.ZipFile(str(zip_file), "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for fpath in output_dir.rglob("*"):
-                if fpath.is_file():
-                    arcname = sanitized_name + "/" + str(fpath.relative_to(output_dir))
-                    zf.write(str(fpath), arcname)
-
-        if not zip_file.exists():
-            raise RuntimeError("ZIP file was not created successfully")
-
-        job.add_log(f"ZIP file created: {zip_file.stat().st_size / (1024*1024):.1f} MB", "success")
-        job.steps_completed.append({
-            "step": "export_organized",
-        })
+        job.add_log(f"ZIP file created: {zip_size / (1024*1024):.1f} MB", "success")
+        job.complete_step("export_organized")
 
         # Done
+        _check_cancel(job)
         job.progress = 100
         job.status = "completed"
         job.current_step = "Generation complete!"
@@ -1384,7 +1937,7 @@ async def run_generation(job: MapGenerationJob):
             "output_dir": str(output_dir),
             "zip_file": f"map_{job.job_id}.zip",
             "metadata": metadata,
-            "files": [f.name for f in output_dir.iterdir() if f.is_file()],
+            "files": _top_level_file_names(output_dir),
         }
 
         logger.info(f"[{job.job_id}] Generation complete! Output: {output_dir}")
@@ -1393,12 +1946,50 @@ async def run_generation(job: MapGenerationJob):
         # Schedule cleanup now that generation is complete
         # This gives users the full retention time from completion, not from job creation
         from main import schedule_cleanup, FILE_RETENTION_MINUTES
-        asyncio.create_task(schedule_cleanup(job.job_id, FILE_RETENTION_MINUTES))
-
+        schedule_cleanup(job.job_id, FILE_RETENTION_MINUTES)
+
+    except asyncio.CancelledError:
+        if not job.cancelled:
+            # Server shutdown or similar - not ours to swallow.
+            raise
+        task = asyncio.current_task()
+        if task is not None:
+            task.uncancel()
+        logger.info(f"[{job.job_id}] Generation cancelled")
+        job.status = "cancelled"
+        job.current_step = "Cancelled"
+        job.completed_at = datetime.utcnow().isoformat()
+        job.add_log("Map generation cancelled", "warning")
     except Exception as e:
         logger.exception(f"[{job.job_id}] Generation failed: {e}")
         job.status = "failed"
         job.current_step = f"Error: {str(e)}"
         job.errors.append(str(e))
     finally:
+        for task in pending_tasks:
+            if not task.done():
+                task.cancel()
+        # Wait until every started step has really stopped before the ZIP is
+        # closed or the output directory is handed to cleanup. The fetch
+        # tasks go first: they may still register workers while unwinding.
+        if pending_tasks:
+            await asyncio.gather(*pending_tasks, return_exceptions=True)
+        if thread_tasks:
+            await asyncio.gather(*thread_tasks, return_exceptions=True)
+        _worker_tasks_var.reset(workers_token)
+        if export_zip_raw is not None:
+            # Failed or cancelled mid-export: drop the partial archive.
+            try:
+                if export_zip is not None:
+                    export_zip.close()
+            except Exception:  # noqa: BLE001 - best-effort cleanup
+                pass
+            export_zip_raw.close()
+            Path(export_zip_raw.name).unlink(missing_ok=True)
+        if job.status == "cancelled":
+            # delete_job left the output to us (see MapGenerationJob.cancel);
+            # nothing can be writing into it any more.
+            from main import schedule_cleanup
+            schedule_cleanup(job.job_id, 0)
+        job._task = None
         current_job_var.reset(job_token)
@@ -16,17 +16,32 @@ first instead of relying on a fixed (and quickly stale) priority list.
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import importlib.util
 import json
 import logging
+import os
+import random
 import time
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 import httpx
 
+try:
+    # Several times faster than the stdlib on multi-MB Overpass responses; optional.
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - depends on installed extras
+    _json_loads = json.loads
+
 from config import (
     OVERPASS_ENDPOINTS, OVERPASS_TIMEOUT, OVERPASS_HTTP_TIMEOUT,
-    OVERPASS_PROBE_TIMEOUT,
+    OVERPASS_PROBE_TIMEOUT, OVERPASS_MIRROR_COOLDOWN,
+    OVERPASS_CACHE_DIR, OVERPASS_CACHE_TTL_S, OVERPASS_CACHE_MAX_MB,
 )
 from services.utils.geo import bbox_to_overpass_str
 from services.utils.geojson import (
@@ -38,6 +53,97 @@ from services.utils.geojson import (
 
 logger = logging.getLogger(__name__)
 
+# Lets the shared Overpass client negotiate HTTP/2 (httpx needs h2 for it);
+# without it the client stays on HTTP/1.1. Optional.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+# One client for every Overpass request (probes, queries, retries, jobs), so
+# keep-alive connections to the mirrors are reused instead of paying a TCP +
+# TLS handshake per attempt. The probe warms the connection the following
+# query then uses. Created lazily inside the running event loop and closed
+# by close_overpass_client() on application shutdown.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _overpass_client() -> httpx.AsyncClient:
+    """Return the shared Overpass client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=OVERPASS_HTTP_TIMEOUT,
+            http2=_HTTP2,
+            # httpx already sends Accept-Encoding: gzip, deflate, and the
+            # mirrors gzip their JSON, so responses arrive compressed.
+            headers={"User-Agent": "ArmaReforgerMapGenerator/1.0"},
+            limits=httpx.Limits(
+                max_connections=len(OVERPASS_ENDPOINTS) * 4,
+                max_keepalive_connections=len(OVERPASS_ENDPOINTS) * 2,
+                keepalive_expiry=300,
+            ),
+        )
+    return _client
+
+
+async def close_overpass_client() -> None:
+    """Close the shared Overpass client (application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Mirrors that recently failed a query: {endpoint: monotonic time the
+# cooldown ends}. The probe ranks mirrors once per job; this keeps a mirror
+# that 429s or 504s mid-job from being tried first again by the retry pass,
+# the per-category fallback or the next query.
+_mirror_cooldown: dict[str, float] = {}
+
+
+def _cool_down(endpoint: str, seconds: float = OVERPASS_MIRROR_COOLDOWN) -> None:
+    """Move a failing mirror to the back of the order for `seconds`."""
+    _mirror_cooldown[endpoint] = time.monotonic() + seconds
+
+
+def _retry_after_seconds(resp: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP-date), if any."""
+    value = resp.headers.get("retry-after", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def rotate_endpoints(endpoints: list[str], k: int) -> list[str]:
+    """
+    Start the k-th of several concurrent queries on a different mirror.
+
+    The public mirrors allow only a couple of concurrent requests per IP, so
+    queries sent at the same time to the same mirror queue up behind each
+    other (or get 429s). Rotating the ranked order spreads them across
+    mirrors; the rest of the order stays as the fallback, and mirrors on
+    cooldown still go last in _run_overpass_query.
+    """
+    if not endpoints:
+        return endpoints
+    k %= len(endpoints)
+    return endpoints[k:] + endpoints[:k]
+
+
+def _order_by_cooldown(endpoints: list[str]) -> list[str]:
+    """Keep the given order, but put mirrors still cooling down last."""
+    now = time.monotonic()
+    ready = [ep for ep in endpoints if _mirror_cooldown.get(ep, 0.0) <= now]
+    cooling = [ep for ep in endpoints if _mirror_cooldown.get(ep, 0.0) > now]
+    return ready + cooling
+
 
 def _polygon_to_overpass_poly(coords: list[list[float]]) -> str:
     """
@@ -126,12 +232,11 @@ async def _probe_one_mirror(endpoint: str) -> tuple[str, bool, float]:
     label = _endpoint_label(endpoint)
     start = time.monotonic()
     try:
-        async with httpx.AsyncClient(timeout=OVERPASS_PROBE_TIMEOUT) as client:
-            resp = await client.post(
-                endpoint,
-                data={"data": _PROBE_QUERY},
-                headers={"User-Agent": "ArmaReforgerMapGenerator/1.0"},
-            )
+        resp = await _overpass_client().post(
+            endpoint,
+            data={"data": _PROBE_QUERY},
+            timeout=OVERPASS_PROBE_TIMEOUT,
+        )
         latency = time.monotonic() - start
         if resp.status_code != 200:
             logger.info(
@@ -165,7 +270,9 @@ async def probe_overpass_mirrors(job=None) -> list[str]:
     fails the probe.
 
     Cheap — a node(1) query is ~0.3s on a healthy mirror — and run once per
-    generation, just before the five real feature queries.
+    generation, just before the real feature queries. Mirrors that fail the
+    probe are also put on cooldown, so a rotated order (rotate_endpoints)
+    still tries them last.
     """
     results = await asyncio.gather(
         *(_probe_one_mirror(ep) for ep in OVERPASS_ENDPOINTS)
@@ -184,6 +291,9 @@ async def probe_overpass_mirrors(job=None) -> list[str]:
         return list(OVERPASS_ENDPOINTS)
 
     ordered = _rank_mirrors(list(results))
+    for endpoint, ok, _ in results:
+        if not ok:
+            _cool_down(endpoint)
     best = _endpoint_label(ordered[0])
     logger.info(
         f"Overpass probe: {healthy_count}/{len(OVERPASS_ENDPOINTS)} mirrors healthy — "
@@ -194,11 +304,159 @@ async def probe_overpass_mirrors(job=None) -> list[str]:
     return ordered
 
 
+def _overpass_cache_path(query: str) -> Optional[Path]:
+    """
+    On-disk cache file for one Overpass query, or None if disabled.
+
+    Keyed on the full query text, which includes the exact bbox, so a cached
+    response is never a superset of the request; re-generating the same map
+    selection is the common repeat case.
+    """
+    if not OVERPASS_CACHE_DIR:
+        return None
+    return Path(OVERPASS_CACHE_DIR).expanduser() / f"{_query_key(query)}.json"
+
+
+def _load_cached_response(path: Optional[Path]) -> Optional[dict]:
+    """Return a cached Overpass response younger than the cache TTL, or None."""
+    if path is None:
+        return None
+    try:
+        if time.time() - path.stat().st_mtime > OVERPASS_CACHE_TTL_S:
+            return None
+        return _json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_response(path: Optional[Path], body: bytearray) -> None:
+    """Write a validated response body to the cache and prune it."""
+    if path is None:
+        return
+    part_path = path.with_suffix(f".{os.getpid()}.part")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part_path.write_bytes(body)
+        os.replace(part_path, path)
+    except OSError as exc:
+        logger.debug(f"Could not cache Overpass response: {exc}")
+        part_path.unlink(missing_ok=True)
+        return
+    _prune_overpass_cache(path.parent, OVERPASS_CACHE_MAX_MB * 1024 * 1024)
+
+
+def _prune_overpass_cache(cache_dir: Path, max_bytes: int) -> None:
+    """
+    Drop expired responses, then evict the oldest until the cache fits.
+
+    Responses can be tens of MB, so the TTL alone doesn't bound the cache
+    on a busy server.
+    """
+    cutoff = time.time() - OVERPASS_CACHE_TTL_S
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                st = entry.stat()
+                if st.st_mtime < cutoff:
+                    Path(entry.path).unlink(missing_ok=True)
+                else:
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+    for _, size, entry_path in sorted(entries):
+        try:
+            Path(entry_path).unlink()
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+async def _read_body(resp: httpx.Response) -> bytearray:
+    """
+    Read a streamed response body into one growing buffer.
+
+    resp.read() keeps every chunk and then joins them, so a large Overpass
+    response briefly exists twice in memory; appending to a bytearray
+    avoids that copy. Both json and orjson parse a bytearray directly.
+    """
+    body = bytearray()
+    async for chunk in resp.aiter_bytes():
+        body += chunk
+    return body
+
+
+def _preview(body: bytearray, limit: int) -> str:
+    """First `limit` bytes of a response body, for log messages."""
+    return body[:limit].decode("utf-8", errors="replace")
+
+
+# Single-flight map: {query key: [fetch task, number of callers awaiting it]}.
+# Identical queries in flight at the same time (two jobs for the same map
+# selection, or a fallback overlapping a still-running fetch) share one
+# request instead of each spending Overpass quota on it.
+_inflight: dict[str, list] = {}
+
+
+def _query_key(query: str) -> str:
+    return hashlib.sha1(query.encode("utf-8")).hexdigest()
+
+
 async def _run_overpass_query(
     query: str,
     max_retries: int = 2,
     job=None,
     endpoints: Optional[list[str]] = None,
+    query_type: str = "features",
+    sections: int = 0,
+) -> Optional[dict]:
+    """
+    Execute an Overpass query, joining an identical one already in flight.
+
+    Arguments as for _fetch_overpass_query, which does the work; a caller
+    that joins an existing fetch gets its result (the returned dict is
+    shared, so treat it as read-only). The shared fetch is cancelled only
+    once every caller awaiting it has been cancelled, so cancelling one
+    job never fails another job's fetch.
+    """
+    key = _query_key(query)
+    flight = _inflight.get(key)
+    if flight is None or flight[0].cancelling():
+        task = asyncio.create_task(_fetch_overpass_query(
+            query, max_retries, job, endpoints, query_type, sections,
+        ))
+        flight = _inflight[key] = [task, 0]
+        task.add_done_callback(
+            lambda t: _inflight.pop(key, None) if _inflight.get(key) is flight else None
+        )
+    else:
+        logger.info(f"Joining in-flight Overpass query for {query_type}")
+
+    flight[1] += 1
+    try:
+        return await asyncio.shield(flight[0])
+    except asyncio.CancelledError:
+        if flight[1] == 1:
+            flight[0].cancel()
+        raise
+    finally:
+        flight[1] -= 1
+
+
+async def _fetch_overpass_query(
+    query: str,
+    max_retries: int = 2,
+    job=None,
+    endpoints: Optional[list[str]] = None,
+    query_type: str = "features",
+    sections: int = 0,
 ) -> Optional[dict]:
     """
     Execute an Overpass API query against a pool of public mirrors.
@@ -212,24 +470,25 @@ async def _run_overpass_query(
         max_retries: Number of full passes through the endpoint pool
         endpoints: Ordered endpoint list (e.g. from probe_overpass_mirrors);
             defaults to the configured pool order when omitted.
+        query_type: Label for log messages (e.g. "roads").
+        sections: Number of ``out count;`` sentinels a complete response
+            carries (combined queries). A response with fewer was cut off
+            mid-output and is retried on the next mirror.
     """
     endpoints = endpoints or OVERPASS_ENDPOINTS
 
-    # Extract query type for logging (first element type in the query)
-    query_type = "features"
-    if "highway" in query:
-        query_type = "roads"
-    elif "natural" in query and "water" in query:
-        query_type = "water"
-    elif "natural" in query and ("wood" in query or "forest" in query):
-        query_type = "forests"
-    elif "building" in query:
-        query_type = "buildings"
-    elif "landuse" in query:
-        query_type = "land use"
+    cache_path = _overpass_cache_path(query)
+    cached = await asyncio.to_thread(_load_cached_response, cache_path)
+    if cached is not None:
+        logger.info(
+            f"Using cached Overpass response for {query_type}: "
+            f"{len(cached.get('elements', []))} elements"
+        )
+        return cached
 
     for attempt in range(max_retries):
-        for endpoint_idx, endpoint in enumerate(endpoints):
+        order = _order_by_cooldown(endpoints)
+        for endpoint_idx, endpoint in enumerate(order):
             label = _endpoint_label(endpoint)
             try:
                 logger.debug(
@@ -237,100 +496,137 @@ async def _run_overpass_query(
                     f"(endpoint {endpoint_idx + 1}/{len(endpoints)}, "
                     f"attempt {attempt + 1}/{max_retries})"
                 )
-                async with httpx.AsyncClient(timeout=OVERPASS_HTTP_TIMEOUT) as client:
-                    resp = await client.post(
-                        endpoint,
-                        data={"data": query},
-                        headers={"User-Agent": "ArmaReforgerMapGenerator/1.0"},
-                    )
-                    if resp.status_code == 200:
-                        # Validate that the response is actually JSON before parsing
-                        content_type = resp.headers.get("content-type", "").lower()
-                        if "application/json" not in content_type:
+                async with _overpass_client().stream(
+                    "POST",
+                    endpoint,
+                    data={"data": query},
+                ) as resp:
+                    body = await _read_body(resp)
+                if resp.status_code == 200:
+                    # Validate that the response is actually JSON before parsing
+                    content_type = resp.headers.get("content-type", "").lower()
+                    if "application/json" not in content_type:
+                        logger.warning(
+                            f"Overpass [{label}] returned non-JSON response "
+                            f"(Content-Type: {content_type}), trying next..."
+                        )
+                        logger.debug(f"Response preview: {_preview(body, 500)}")
+                        continue
+
+                    try:
+                        # Decoded off the event loop: a large bbox returns
+                        # hundreds of thousands of elements.
+                        result = await asyncio.to_thread(_json_loads, body)
+                        element_count = len(result.get("elements", []))
+                        data_size_kb = len(body) / 1024
+
+                        # Reject broken/stale mirrors: timestamp_osm_base must be a parseable
+                        # ISO date. Observed 2026-05-18 (issue #131): overpass.osm.ch returned
+                        # 200 OK with `timestamp_osm_base: "114277"` and zero elements for every
+                        # query, masking a genuine result on the next mirror.
+                        timestamp = result.get("osm3s", {}).get("timestamp_osm_base", "")
+                        if not _is_valid_iso_timestamp(timestamp):
+                            _cool_down(endpoint)
                             logger.warning(
-                                f"Overpass [{label}] returned non-JSON response "
-                                f"(Content-Type: {content_type}), trying next..."
+                                f"Overpass [{label}] returned corrupt timestamp_osm_base "
+                                f"({timestamp!r}) — treating as broken mirror, trying next..."
                             )
-                            logger.debug(f"Response preview: {resp.text[:500]}")
+                            if job:
+                                job.add_log(
+                                    f"Overpass mirror [{label}] returned corrupt data, trying next...",
+                                    "warning",
+                                )
                             continue
 
-                        try:
-                            result = resp.json()
-                            element_count = len(result.get("elements", []))
-                            data_size_kb = len(resp.content) / 1024
-
-                            # Reject broken/stale mirrors: timestamp_osm_base must be a parseable
-                            # ISO date. Observed 2026-05-18 (issue #131): overpass.osm.ch returned
-                            # 200 OK with `timestamp_osm_base: "114277"` and zero elements for every
-                            # query, masking a genuine result on the next mirror.
-                            timestamp = result.get("osm3s", {}).get("timestamp_osm_base", "")
-                            if not _is_valid_iso_timestamp(timestamp):
-                                logger.warning(
-                                    f"Overpass [{label}] returned corrupt timestamp_osm_base "
-                                    f"({timestamp!r}) — treating as broken mirror, trying next..."
+                        # Soft-error detection: Overpass returns 200 OK with a `remark` field
+                        # for runtime errors (timeouts, memory limits). If elements is empty
+                        # AND remark is present, treat as failure rather than "no data here".
+                        remark = result.get("remark", "")
+                        if element_count == 0 and remark:
+                            logger.warning(
+                                f"Overpass [{label}] returned 0 elements with remark "
+                                f"({remark!r}) — treating as soft failure, trying next..."
+                            )
+                            if job:
+                                job.add_log(
+                                    f"Overpass mirror [{label}] soft error: {remark}",
+                                    "warning",
                                 )
-                                if job:
-                                    job.add_log(
-                                        f"Overpass mirror [{label}] returned corrupt data, trying next...",
-                                        "warning",
-                                    )
-                                continue
+                            continue
 
-                            # Soft-error detection: Overpass returns 200 OK with a `remark` field
-                            # for runtime errors (timeouts, memory limits). If elements is empty
-                            # AND remark is present, treat as failure rather than "no data here".
-                            remark = result.get("remark", "")
-                            if element_count == 0 and remark:
+                        # A combined query that hit the server timeout or
+                        # memory limit stops part-way through its output
+                        # sets; the missing categories would look empty.
+                        if sections:
+                            found = sum(
+                                1 for el in result.get("elements", ())
+                                if el.get("type") == "count"
+                            )
+                            if found < sections:
                                 logger.warning(
-                                    f"Overpass [{label}] returned 0 elements with remark "
-                                    f"({remark!r}) — treating as soft failure, trying next..."
+                                    f"Overpass [{label}] returned {found}/{sections} "
+                                    f"output sets ({remark!r}) — treating as soft "
+                                    f"failure, trying next..."
                                 )
                                 if job:
                                     job.add_log(
-                                        f"Overpass mirror [{label}] soft error: {remark}",
+                                        f"Overpass mirror [{label}] returned incomplete "
+                                        f"data, trying next...",
                                         "warning",
                                     )
                                 continue
 
-                            logger.info(
-                                f"Successfully fetched {query_type} from Overpass [{label}]: "
-                                f"{element_count} elements, {data_size_kb:.1f} KB"
-                            )
-                            return result
-                        except json.JSONDecodeError as json_err:
-                            logger.error(
-                                f"Overpass [{label}] returned invalid JSON: {json_err}"
-                            )
-                            logger.debug(f"Response preview: {resp.text[:500]}")
-                            continue
-                    elif resp.status_code == 429:
-                        logger.warning(f"Overpass [{label}] rate limited (429), trying next...")
-                        if job:
-                            job.add_log(f"Overpass mirror [{label}] rate limited, trying next...", "warning")
-                        continue
-                    elif resp.status_code == 504:
-                        logger.warning(f"Overpass [{label}] timeout (504), trying next...")
-                        if job:
-                            job.add_log(f"Overpass mirror [{label}] timed out, trying next...", "warning")
-                        continue
-                    elif resp.status_code in (502, 503):
-                        logger.warning(f"Overpass [{label}] unavailable ({resp.status_code}), trying next...")
-                        if job:
-                            job.add_log(f"Overpass mirror [{label}] unavailable ({resp.status_code}), trying next...", "warning")
-                        continue
-                    else:
-                        logger.error(f"Overpass [{label}] error {resp.status_code}: {resp.text[:300]}")
+                        logger.info(
+                            f"Successfully fetched {query_type} from Overpass [{label}]: "
+                            f"{element_count} elements, {data_size_kb:.1f} KB"
+                        )
+                        await asyncio.to_thread(_store_cached_response, cache_path, body)
+                        return result
+                    except ValueError as json_err:  # json/orjson JSONDecodeError
+                        logger.error(
+                            f"Overpass [{label}] returned invalid JSON: {json_err}"
+                        )
+                        logger.debug(f"Response preview: {_preview(body, 500)}")
                         continue
+                elif resp.status_code == 429:
+                    _cool_down(endpoint, _retry_after_seconds(resp) or OVERPASS_MIRROR_COOLDOWN)
+                    logger.warning(f"Overpass [{label}] rate limited (429), trying next...")
+                    if job:
+                        job.add_log(f"Overpass mirror [{label}] rate limited, trying next...", "warning")
+                    continue
+                elif resp.status_code == 504:
+                    _cool_down(endpoint, _retry_after_seconds(resp) or OVERPASS_MIRROR_COOLDOWN)
+                    logger.warning(f"Overpass [{label}] timeout (504), trying next...")
+                    if job:
+                        job.add_log(f"Overpass mirror [{label}] timed out, trying next...", "warning")
+                    continue
+                elif resp.status_code in (502, 503):
+                    _cool_down(endpoint, _retry_after_seconds(resp) or OVERPASS_MIRROR_COOLDOWN)
+                    logger.warning(f"Overpass [{label}] unavailable ({resp.status_code}), trying next...")
+                    if job:
+                        job.add_log(f"Overpass mirror [{label}] unavailable ({resp.status_code}), trying next...", "warning")
+                    continue
+                else:
+                    logger.error(f"Overpass [{label}] error {resp.status_code}: {_preview(body, 300)}")
+                    continue
             except Exception as e:
+                _cool_down(endpoint)
                 logger.error(f"Overpass [{label}] request failed: {e}")
                 continue
 
         # All endpoints failed on this attempt; wait before retrying
         if attempt < max_retries - 1:
-            wait = 10 * (2 ** attempt)  # exponential: 10s, 20s, ...
+            # Exponential (10s, 20s, ... capped at 60s) plus jitter so
+            # concurrent jobs don't retry in lockstep; cut short when a
+            # Retry-After says a mirror is ready again sooner.
+            wait = min(60, 10 * (2 ** attempt)) + random.uniform(0, 1)
+            now = time.monotonic()
+            ends = [_mirror_cooldown.get(ep, 0.0) for ep in endpoints]
+            if all(end > now for end in ends):
+                wait = min(wait, max(1.0, min(ends) - now))
             logger.warning(
                 f"All {len(endpoints)} Overpass endpoints failed for {query_type}, "
-                f"retrying in {wait}s (attempt {attempt + 1}/{max_retries})"
+                f"retrying in {wait:.1f}s (attempt {attempt + 1}/{max_retries})"
             )
             await asyncio.sleep(wait)
 
@@ -338,43 +634,91 @@ async def _run_overpass_query(
     return None
 
 
+# Overpass QL selectors per feature category. Shared by the single-category
+# fetch_* functions and the combined query in fetch_all_features.
+_ROADS_SELECTORS = """
+      way["highway"~"^(motorway|motorway_link|trunk|trunk_link|primary|primary_link|secondary|secondary_link|tertiary|tertiary_link|residential|unclassified|service|track|path|footway|cycleway|bridleway|living_street)$"];
+"""
+
+_WATER_SELECTORS = """
+      // Lakes, ponds, reservoirs (polygons)
+      way["natural"="water"];
+      relation["natural"="water"];
+      // Rivers and streams (lines)
+      way["waterway"~"^(river|stream|canal|ditch|drain)$"];
+      // Coastline
+      way["natural"="coastline"];
+      // Wetlands
+      way["natural"="wetland"];
+      relation["natural"="wetland"];
+"""
+
+_FORESTS_SELECTORS = """
+      way["natural"="wood"];
+      relation["natural"="wood"];
+      way["landuse"="forest"];
+      relation["landuse"="forest"];
+      way["natural"="scrub"];
+      way["natural"="heath"];
+      way["natural"="tree_row"];
+"""
+
+_BUILDINGS_SELECTORS = """
+      way["building"];
+      relation["building"];
+"""
+
+_LAND_USE_SELECTORS = """
+      way["landuse"~"^(farmland|meadow|orchard|vineyard|residential|industrial|commercial|retail|quarry|cemetery|allotments|recreation_ground|military|farmyard)$"];
+      relation["landuse"~"^(farmland|meadow|orchard|vineyard|residential|industrial|commercial|retail|quarry|cemetery|allotments|recreation_ground|military|farmyard)$"];
+      way["leisure"~"^(park|garden|pitch|playground|golf_course)$"];
+      way["natural"~"^(beach|sand|bare_rock|scree|grassland|fell)$"];
+"""
+
+
+def _single_query(bbox_str: str, selectors: str) -> str:
+    """Build a one-category Overpass query from its selectors."""
+    return f"""
+    [out:json][timeout:{OVERPASS_TIMEOUT}][bbox:{bbox_str}];
+    ({selectors}    );
+    out body geom;
+    """
+
+
 async def fetch_roads(bbox: dict, job = None, endpoints = None) -> Optional[dict]:
     """
     Fetch road network from OSM.
     Returns all highway features with classification, surface, width, etc.
     """
     bbox_str = _bbox_to_overpass(bbox)
-    query = f"""
-    [out:json][timeout:{OVERPASS_TIMEOUT}][bbox:{bbox_str}];
-    (
-      way["highway"~"^(motorway|motorway_link|trunk|trunk_link|primary|primary_link|secondary|secondary_link|tertiary|tertiary_link|residential|unclassified|service|track|path|footway|cycleway|bridleway|living_street)$"];
-    );
-    out body geom;
-    """
+    query = _single_query(bbox_str, _ROADS_SELECTORS)
 
     logger.info(f"Fetching roads from Overpass API (bbox: {bbox_str})...")
-    result = await _run_overpass_query(query, job=job, endpoints=endpoints)
+    result = await _run_overpass_query(
+        query, job=job, endpoints=endpoints, query_type="roads"
+    )
 
     if result and "elements" in result:
-        roads = _process_road_elements(result["elements"])
-        # Count road types
-        road_types = {}
-        for road in roads:
-            highway_type = road["properties"].get("highway", "unknown")
-            road_types[highway_type] = road_types.get(highway_type, 0) + 1
+        return _roads_collection(result["elements"], job)
 
-        top_types = dict(sorted(road_types.items(), key=lambda x: x[1], reverse=True)[:5])
-        logger.info(f"Fetched {len(roads)} road segments across {len(road_types)} types: {top_types}")
+    logger.warning("No road data returned from Overpass API")
+    return None
 
-        if job:
-            # Format road type breakdown for activity log
-            type_details = ", ".join([f"{k}: {v}" for k, v in list(top_types.items())[:5]])
-            job.add_log(f"✓ Roads: {len(roads)} segments ({type_details})", "success")
 
-        return {"type": "FeatureCollection", "features": roads}
+def _roads_collection(elements: list, job=None) -> dict:
+    """Build the roads FeatureCollection and log its type breakdown."""
+    roads = _process_road_elements(elements)
+    # Count road types
+    road_types = Counter(r["properties"].get("highway", "unknown") for r in roads)
+    top_types = dict(road_types.most_common(5))
+    logger.info(f"Fetched {len(roads)} road segments across {len(road_types)} types: {top_types}")
 
-    logger.warning("No road data returned from Overpass API")
-    return None
+    if job:
+        # Format road type breakdown for activity log
+        type_details = ", ".join([f"{k}: {v}" for k, v in list(top_types.items())[:5]])
+        job.add_log(f"✓ Roads: {len(roads)} segments ({type_details})", "success")
+
+    return {"type": "FeatureCollection", "features": roads}
 
 
 def _process_road_elements(elements: list) -> list:
@@ -384,35 +728,25 @@ def _process_road_elements(elements: list) -> list:
         if elem.get("type") != "way" or "geometry" not in elem:
             continue
 
-        tags = elem.get("tags", {})
-        highway_type = tags.get("highway", "unclassified")
-        surface = tags.get("surface", "")
-        width = tags.get("width", "")
-        name = tags.get("name", "")
-        bridge = tags.get("bridge", "no")
-        tunnel = tags.get("tunnel", "no")
-        lanes = tags.get("lanes", "")
-
-        coords = extract_coords_from_geometry(elem["geometry"])
-
-        feature = {
+        # Bound once: roads are the largest category, 8 tag reads each
+        tags_get = elem.get("tags", {}).get
+        features.append({
             "type": "Feature",
             "geometry": {
                 "type": "LineString",
-                "coordinates": coords,
+                "coordinates": extract_coords_from_geometry(elem["geometry"]),
             },
             "properties": {
                 "osm_id": elem["id"],
-                "highway": highway_type,
-                "surface": surface,
-                "width": width,
-                "name": name,
-                "bridge": bridge,
-                "tunnel": tunnel,
-                "lanes": lanes,
+                "highway": tags_get("highway", "unclassified"),
+                "surface": tags_get("surface", ""),
+                "width": tags_get("width", ""),
+                "name": tags_get("name", ""),
+                "bridge": tags_get("bridge", "no"),
+                "tunnel": tags_get("tunnel", "no"),
+                "lanes": tags_get("lanes", ""),
             },
-        }
-        features.append(feature)
+        })
 
     return features
 
@@ -423,45 +757,34 @@ async def fetch_water(bbox: dict, job = None, endpoints = None) -> Optional[dict
     Includes lakes, rivers, streams, ponds, reservoirs, coastline.
     """
     bbox_str = _bbox_to_overpass(bbox)
-    query = f"""
-    [out:json][timeout:{OVERPASS_TIMEOUT}][bbox:{bbox_str}];
-    (
-      // Lakes, ponds, reservoirs (polygons)
-      way["natural"="water"];
-      relation["natural"="water"];
-      // Rivers and streams (lines)
-      way["waterway"~"^(river|stream|canal|ditch|drain)$"];
-      // Coastline
-      way["natural"="coastline"];
-      // Wetlands
-      way["natural"="wetland"];
-      relation["natural"="wetland"];
-    );
-    out body geom;
-    """
+    query = _single_query(bbox_str, _WATER_SELECTORS)
 
     logger.info(f"Fetching water features from Overpass API (bbox: {bbox_str})...")
-    result = await _run_overpass_query(query, job=job, endpoints=endpoints)
+    result = await _run_overpass_query(
+        query, job=job, endpoints=endpoints, query_type="water"
+    )
 
     if result and "elements" in result:
-        features = _process_water_elements(result["elements"])
-        # Count water types
-        water_types = {}
-        for feat in features:
-            water_type = feat["properties"].get("water_type", "unknown")
-            water_types[water_type] = water_types.get(water_type, 0) + 1
+        return _water_collection(result["elements"], job)
 
-        logger.info(f"Fetched {len(features)} water features: {water_types}")
+    logger.warning("No water data returned from Overpass API")
+    return None
 
-        if job:
-            # Format water type breakdown for activity log
-            type_details = ", ".join([f"{k}: {v}" for k, v in water_types.items()])
-            job.add_log(f"✓ Water: {len(features)} features ({type_details})", "success")
 
-        return {"type": "FeatureCollection", "features": features}
+def _water_collection(elements: list, job=None) -> dict:
+    """Build the water FeatureCollection and log its type breakdown."""
+    features = _process_water_elements(elements)
+    # Count water types
+    water_types = dict(Counter(f["properties"].get("water_type", "unknown") for f in features))
 
-    logger.warning("No water data returned from Overpass API")
-    return None
+    logger.info(f"Fetched {len(features)} water features: {water_types}")
+
+    if job:
+        # Format water type breakdown for activity log
+        type_details = ", ".join([f"{k}: {v}" for k, v in water_types.items()])
+        job.add_log(f"✓ Water: {len(features)} features ({type_details})", "success")
+
+    return {"type": "FeatureCollection", "features": features}
 
 
 def _process_water_elements(elements: list) -> list:
@@ -535,42 +858,34 @@ async def fetch_forests(bbox: dict, job = None, endpoints = None) -> Optional[di
     Includes forest, wood, scrub, and tree rows.
     """
     bbox_str = _bbox_to_overpass(bbox)
-    query = f"""
-    [out:json][timeout:{OVERPASS_TIMEOUT}][bbox:{bbox_str}];
-    (
-      way["natural"="wood"];
-      relation["natural"="wood"];
-      way["landuse"="forest"];
-      relation["landuse"="forest"];
-      way["natural"="scrub"];
-      way["natural"="heath"];
-      way["natural"="tree_row"];
-    );
-    out body geom;
-    """
+    query = _single_query(bbox_str, _FORESTS_SELECTORS)
 
     logger.info(f"Fetching forests from Overpass API (bbox: {bbox_str})...")
-    result = await _run_overpass_query(query, job=job, endpoints=endpoints)
+    result = await _run_overpass_query(
+        query, job=job, endpoints=endpoints, query_type="forests"
+    )
 
     if result and "elements" in result:
-        features = _process_area_elements(result["elements"], "forest")
-        # Count forest types
-        forest_types = {}
-        for feat in features:
-            area_type = feat["properties"].get("type", "unknown")
-            forest_types[area_type] = forest_types.get(area_type, 0) + 1
+        return _forests_collection(result["elements"], job)
 
-        logger.info(f"Fetched {len(features)} forest/woodland features: {forest_types}")
+    logger.warning("No forest data returned from Overpass API")
+    return None
 
-        if job:
-            # Format forest type breakdown for activity log
-            type_details = ", ".join([f"{k}: {v}" for k, v in forest_types.items()])
-            job.add_log(f"✓ Forests: {len(features)} areas ({type_details})", "success")
 
-        return {"type": "FeatureCollection", "features": features}
+def _forests_collection(elements: list, job=None) -> dict:
+    """Build the forests FeatureCollection and log its type breakdown."""
+    features = _process_area_elements(elements, "forest")
+    # Count forest types
+    forest_types = dict(Counter(f["properties"].get("type", "unknown") for f in features))
 
-    logger.warning("No forest data returned from Overpass API")
-    return None
+    logger.info(f"Fetched {len(features)} forest/woodland features: {forest_types}")
+
+    if job:
+        # Format forest type breakdown for activity log
+        type_details = ", ".join([f"{k}: {v}" for k, v in forest_types.items()])
+        job.add_log(f"✓ Forests: {len(features)} areas ({type_details})", "success")
+
+    return {"type": "FeatureCollection", "features": features}
 
 
 async def fetch_buildings(bbox: dict, job = None, endpoints = None) -> Optional[dict]:
@@ -579,38 +894,34 @@ async def fetch_buildings(bbox: dict, job = None, endpoints = None) -> Optional[
     Includes building type, height, levels.
     """
     bbox_str = _bbox_to_overpass(bbox)
-    query = f"""
-    [out:json][timeout:{OVERPASS_TIMEOUT}][bbox:{bbox_str}];
-    (
-      way["building"];
-      relation["building"];
-    );
-    out body geom;
-    """
+    query = _single_query(bbox_str, _BUILDINGS_SELECTORS)
 
     logger.info(f"Fetching buildings from Overpass API (bbox: {bbox_str})...")
-    result = await _run_overpass_query(query, job=job, endpoints=endpoints)
+    result = await _run_overpass_query(
+        query, job=job, endpoints=endpoints, query_type="buildings"
+    )
 
     if result and "elements" in result:
-        features = _process_building_elements(result["elements"])
-        # Count building types
-        building_types = {}
-        for feat in features:
-            bld_type = feat["properties"].get("building_type", "unknown")
-            building_types[bld_type] = building_types.get(bld_type, 0) + 1
+        return _buildings_collection(result["elements"], job)
 
-        top_types = dict(sorted(building_types.items(), key=lambda x: x[1], reverse=True)[:5])
-        logger.info(f"Fetched {len(features)} building footprints. Top types: {top_types}")
+    logger.warning("No building data returned from Overpass API")
+    return None
 
-        if job:
-            # Format building type breakdown for activity log
-            type_details = ", ".join([f"{k}: {v}" for k, v in list(top_types.items())[:5]])
-            job.add_log(f"✓ Buildings: {len(features)} structures ({type_details})", "success")
 
-        return {"type": "FeatureCollection", "features": features}
+def _buildings_collection(elements: list, job=None) -> dict:
+    """Build the buildings FeatureCollection and log its type breakdown."""
+    features = _process_building_elements(elements)
+    # Count building types
+    building_types = Counter(f["properties"].get("building_type", "unknown") for f in features)
+    top_types = dict(building_types.most_common(5))
+    logger.info(f"Fetched {len(features)} building footprints. Top types: {top_types}")
 
-    logger.warning("No building data returned from Overpass API")
-    return None
+    if job:
+        # Format building type breakdown for activity log
+        type_details = ", ".join([f"{k}: {v}" for k, v in list(top_types.items())[:5]])
+        job.add_log(f"✓ Buildings: {len(features)} structures ({type_details})", "success")
+
+    return {"type": "FeatureCollection", "features": features}
 
 
 def _process_building_elements(elements: list) -> list:
@@ -676,66 +987,58 @@ async def fetch_land_use(bbox: dict, job = None, endpoints = None) -> Optional[d
     Includes farmland, meadow, residential, industrial, commercial, etc.
     """
     bbox_str = _bbox_to_overpass(bbox)
-    query = f"""
-    [out:json][timeout:{OVERPASS_TIMEOUT}][bbox:{bbox_str}];
-    (
-      way["landuse"~"^(farmland|meadow|orchard|vineyard|residential|industrial|commercial|retail|quarry|cemetery|allotments|recreation_ground|military|farmyard)$"];
-      relation["landuse"~"^(farmland|meadow|orchard|vineyard|residential|industrial|commercial|retail|quarry|cemetery|allotments|recreation_ground|military|farmyard)$"];
-      way["leisure"~"^(park|garden|pitch|playground|golf_course)$"];
-      way["natural"~"^(beach|sand|bare_rock|scree|grassland|fell)$"];
-    );
-    out body geom;
-    """
+    query = _single_query(bbox_str, _LAND_USE_SELECTORS)
 
     logger.info(f"Fetching land use from Overpass API (bbox: {bbox_str})...")
-    result = await _run_overpass_query(query, job=job, endpoints=endpoints)
+    result = await _run_overpass_query(
+        query, job=job, endpoints=endpoints, query_type="land use"
+    )
 
     if result and "elements" in result:
-        features = _process_area_elements(result["elements"], "land_use")
-        # Count land use types
-        land_use_types = {}
-        for feat in features:
-            lu_type = feat["properties"].get("type", "unknown")
-            land_use_types[lu_type] = land_use_types.get(lu_type, 0) + 1
+        return _land_use_collection(result["elements"], job)
 
-        top_types = dict(sorted(land_use_types.items(), key=lambda x: x[1], reverse=True)[:5])
-        logger.info(f"Fetched {len(features)} land use features. Top types: {top_types}")
+    logger.warning("No land use data returned from Overpass API")
+    return None
 
-        if job:
-            # Format land use type breakdown for activity log
-            type_details = ", ".join([f"{k}: {v}" for k, v in list(top_types.items())[:5]])
-            job.add_log(f"✓ Land use: {len(features)} areas ({type_details})", "success")
 
-        return {"type": "FeatureCollection", "features": features}
+def _land_use_collection(elements: list, job=None) -> dict:
+    """Build the land use FeatureCollection and log its type breakdown."""
+    features = _process_area_elements(elements, "land_use")
+    # Count land use types
+    land_use_types = Counter(f["properties"].get("type", "unknown") for f in features)
+    top_types = dict(land_use_types.most_common(5))
+    logger.info(f"Fetched {len(features)} land use features. Top types: {top_types}")
 
-    logger.warning("No land use data returned from Overpass API")
-    return None
+    if job:
+        # Format land use type breakdown for activity log
+        type_details = ", ".join([f"{k}: {v}" for k, v in list(top_types.items())[:5]])
+        job.add_log(f"✓ Land use: {len(features)} areas ({type_details})", "success")
+
+    return {"type": "FeatureCollection", "features": features}
 
 
 def _process_area_elements(elements: list, category: str) -> list:
     """Generic processor for area elements (forests, land use, etc.)."""
     features = []
     for elem in elements:
-        tags = elem.get("tags", {})
+        tags_get = elem.get("tags", {}).get
+        elem_type = elem.get("type")
+        # Same for ways and relations; an empty tag value counts as missing.
+        area_type = (
+            tags_get("landuse")
+            or tags_get("natural")
+            or tags_get("leisure")
+            or "unknown"
+        )
 
-        if elem.get("type") == "way" and "geometry" in elem:
+        if elem_type == "way" and "geometry" in elem:
             coords = extract_coords_from_geometry(elem["geometry"])
             if len(coords) < 4:
                 continue
 
             close_ring(coords)
 
-            area_type = (
-                tags.get("landuse", "")
-                or tags.get("natural", "")
-                or tags.get("leisure", "")
-                or "unknown"
-            )
-
-            leaf_type = tags.get("leaf_type", "")
-            wood_type = tags.get("wood", "")
-
-            feature = {
+            features.append({
                 "type": "Feature",
                 "geometry": {
                     "type": "Polygon",
@@ -745,77 +1048,153 @@ def _process_area_elements(elements: list, category: str) -> list:
                     "osm_id": elem["id"],
                     "category": category,
                     "type": area_type,
-                    "leaf_type": leaf_type,
-                    "wood_type": wood_type,
-                    "name": tags.get("name", ""),
+                    "leaf_type": tags_get("leaf_type", ""),
+                    "wood_type": tags_get("wood", ""),
+                    "name": tags_get("name", ""),
                 },
-            }
-            features.append(feature)
+            })
 
-        elif elem.get("type") == "relation" and "members" in elem:
+        elif elem_type == "relation" and "members" in elem:
             outer_rings = extract_outer_rings_from_relation(elem)
 
             if outer_rings:
-                area_type = (
-                    tags.get("landuse", "")
-                    or tags.get("natural", "")
-                    or tags.get("leisure", "")
-                    or "unknown"
-                )
-
-                feature = {
+                features.append({
                     "type": "Feature",
                     "geometry": make_polygon_or_multi(outer_rings),
                     "properties": {
                         "osm_id": elem["id"],
                         "category": category,
                         "type": area_type,
-                        "leaf_type": tags.get("leaf_type", ""),
-                        "name": tags.get("name", ""),
+                        "leaf_type": tags_get("leaf_type", ""),
+                        "name": tags_get("name", ""),
                     },
-                }
-                features.append(feature)
+                })
 
     return features
 
 
+# Output sets of the combined query in fetch_all_features, in output order:
+# name -> (selectors, FeatureCollection builder).
+_FEATURE_SETS = {
+    "roads": (_ROADS_SELECTORS, _roads_collection),
+    "water": (_WATER_SELECTORS, _water_collection),
+    "forests": (_FORESTS_SELECTORS, _forests_collection),
+    "buildings": (_BUILDINGS_SELECTORS, _buildings_collection),
+    "land_use": (_LAND_USE_SELECTORS, _land_use_collection),
+}
+
+
+def _multi_query(bbox_str: str, names: list[str]) -> str:
+    """
+    Build one Overpass query that outputs several named result sets.
+
+    Each set is followed by ``out count;``: its single "count" element marks
+    where that set's elements end in the flat JSON response, so the client
+    can split by set without guessing from tags (an element may be in more
+    than one set, e.g. a way tagged both building=* and landuse=*).
+    """
+    header = f"[out:json][timeout:{OVERPASS_TIMEOUT}][bbox:{bbox_str}];\n"
+    return header + _multi_query_body(tuple(names))
+
+
+@lru_cache(maxsize=None)
+def _multi_query_body(names: tuple[str, ...]) -> str:
+    """Everything in a combined query after the header; only the bbox varies."""
+    return "\n".join(
+        f"({_FEATURE_SETS[name][0]})->.{name};\n"
+        f".{name} out body geom;\n"
+        f".{name} out count;"
+        for name in names
+    )
+
+
+def _split_multi_output(elements: list, names: list[str]) -> dict[str, list]:
+    """Split a combined query's elements into per-set lists at each count sentinel."""
+    buckets: dict[str, list] = {name: [] for name in names}
+    idx = 0
+    for elem in elements:
+        if elem.get("type") == "count":
+            idx += 1
+        elif idx < len(names):
+            buckets[names[idx]].append(elem)
+    return buckets
+
+
+async def _run_overpass_query_multi(
+    bbox: dict,
+    names: list[str],
+    job=None,
+    endpoints: Optional[list[str]] = None,
+) -> Optional[dict[str, list]]:
+    """
+    Fetch several feature categories with a single Overpass request.
+
+    One POST instead of one per category: the public mirrors allow only a
+    couple of concurrent requests per IP, so parallel per-category queries
+    were largely serialized server-side anyway, and each paid its own
+    connection setup and bbox walk. Returns the raw elements per set name,
+    or None if no mirror returned a complete response.
+    """
+    bbox_str = _bbox_to_overpass(bbox)
+    query = _multi_query(bbox_str, names)
+
+    logger.info(f"Fetching {', '.join(names)} from Overpass API in one query (bbox: {bbox_str})...")
+    # One pass through the mirrors; the caller falls back to per-category
+    # queries, which are lighter if the combined one is too heavy.
+    result = await _run_overpass_query(
+        query, max_retries=1, job=job, endpoints=endpoints,
+        query_type="all features", sections=len(names),
+    )
+    if not result or "elements" not in result:
+        return None
+    return _split_multi_output(result["elements"], names)
+
+
 async def fetch_all_features(bbox: dict, job = None) -> dict:
     """
     Fetch all OSM features for a bounding box.
     Returns dict with roads, water, forests, buildings, land_use collections.
 
-    Probes the mirror pool once, then runs all 5 queries concurrently
-    against the fastest healthy mirror with asyncio.gather.
+    Probes the mirror pool once, then fetches all 5 categories with one
+    combined query against the fastest healthy mirror. If that fails, the
+    categories are fetched with separate concurrent queries instead.
     """
     if job:
         job.add_log("Checking Overpass mirror health...")
     endpoints = await probe_overpass_mirrors(job)
 
     if job:
-        job.add_log("Fetching roads from OpenStreetMap...")
-        job.progress = 27
-    roads_task = fetch_roads(bbox, job, endpoints)
-    if job:
-        job.add_log("Fetching water features from OpenStreetMap...")
-        job.progress = 29
-    water_task = fetch_water(bbox, job, endpoints)
-    if job:
-        job.add_log("Fetching forests from OpenStreetMap...")
-        job.progress = 31
-    forests_task = fetch_forests(bbox, job, endpoints)
-    if job:
-        job.add_log("Fetching buildings from OpenStreetMap...")
-        job.progress = 33
-    buildings_task = fetch_buildings(bbox, job, endpoints)
+        job.add_log(
+            "Fetching roads, water, forests, buildings and land use from OpenStreetMap..."
+        )
+        job.progress = max(job.progress, 27)
+    names = list(_FEATURE_SETS)
+    elements_by_set = await _run_overpass_query_multi(bbox, names, job, endpoints)
+
+    if elements_by_set is not None:
+        # pop() drops each category's raw elements (one dict per geometry
+        # point) as soon as they are converted, so the raw response and
+        # the finished collections never all coexist in memory.
+        fetched = [
+            _FEATURE_SETS[name][1](elements_by_set.pop(name), job) for name in names
+        ]
+    else:
+        if job:
+            job.add_log(
+                "Combined OpenStreetMap query failed, fetching each feature type separately...",
+                "warning",
+            )
+        fetched = await asyncio.gather(
+            fetch_roads(bbox, job, rotate_endpoints(endpoints, 0)),
+            fetch_water(bbox, job, rotate_endpoints(endpoints, 1)),
+            fetch_forests(bbox, job, rotate_endpoints(endpoints, 2)),
+            fetch_buildings(bbox, job, rotate_endpoints(endpoints, 3)),
+            fetch_land_use(bbox, job, rotate_endpoints(endpoints, 4)),
+            return_exceptions=True,
+        )
     if job:
-        job.add_log("Fetching land use data from OpenStreetMap...")
-        job.progress = 35
-    land_use_task = fetch_land_use(bbox, job, endpoints)
-
-    roads, water, forests, buildings, land_use = await asyncio.gather(
-        roads_task, water_task, forests_task, buildings_task, land_use_task,
-        return_exceptions=True,
-    )
+        job.progress = max(job.progress, 35)
+    roads, water, forests, buildings, land_use = fetched
 
     def _safe_result(result, name):
         if isinstance(result, Exception):
@@ -9,7 +9,7 @@ Processes OSM road data into Arma Reforger spline data:
 """
 
 import logging
-from typing import Optional
+from typing import Iterable, Iterator, Optional, TextIO
 
 import numpy as np
 
@@ -305,8 +305,58 @@ def export_roads_geojson(processed_roads: dict) -> dict:
     }
 
 
+def _emit_csv_lines(lines: Iterable[str], fp: Optional[TextIO]) -> Optional[str]:
+    """
+    Join CSV lines with "\n" (no trailing newline), either into a string or
+    streamed row by row to *fp* so the full CSV is never held in memory.
+    """
+    if fp is None:
+        return "\n".join(lines)
+    first = True
+    for line in lines:
+        if not first:
+            fp.write("\n")
+        fp.write(line)
+        first = False
+    return None
+
+
+def _iter_spline_csv_lines(processed_roads: dict, transformer,
+                           elevation_array) -> Iterator[str]:
+    if transformer:
+        yield "road_id,prefab,name,surface,width_m,point_index,local_x,local_z,elevation"
+        roads = processed_roads.get("roads", [])
+        # Use transform_points to get local coords with elevation — one
+        # batched call for all roads, sliced back per road below.
+        all_local = transformer.transform_points(
+            [p for road in roads for p in road["spline_points"]],
+            elevation_array=elevation_array,
+        )
+        start = 0
+        for i, road in enumerate(roads):
+            end = start + len(road["spline_points"])
+            local_pts = all_local[start:end]
+            start = end
+            for j, lp in enumerate(local_pts):
+                yield (
+                    f"{road['osm_id']},{road['enfusion_prefab']},"
+                    f"\"{road['name']}\",{road['surface']},{road['width_m']},"
+                    f"{j},{lp['x']:.3f},{lp['z']:.3f},{lp['y']:.2f}"
+                )
+    else:
+        yield "road_id,prefab,name,surface,width_m,point_index,longitude,latitude,elevation"
+        for i, road in enumerate(processed_roads.get("roads", [])):
+            for j, point in enumerate(road["spline_points"]):
+                yield (
+                    f"{road['osm_id']},{road['enfusion_prefab']},"
+                    f"\"{road['name']}\",{road['surface']},{road['width_m']},"
+                    f"{j},{point['x']:.8f},{point['y']:.8f},{point['z']:.2f}"
+                )
+
+
 def export_roads_spline_csv(processed_roads: dict, transformer=None,
-                            elevation_array=None) -> str:
+                            elevation_array=None,
+                            fp: Optional[TextIO] = None) -> Optional[str]:
     """
     Export road spline data as CSV for potential scripted import.
 
@@ -320,34 +370,15 @@ def export_roads_spline_csv(processed_roads: dict, transformer=None,
         transformer: Optional CoordinateTransformer for local coordinates.
         elevation_array: Optional DEM array (metres, north-up).  Used with
             *transformer* to sample terrain elevation at each spline point.
+        fp: Optional open text file. When given, rows are streamed to it
+            and nothing is returned.
 
     Returns:
-        CSV string with road spline data.
+        CSV string with road spline data, or None when written to *fp*.
     """
-    if transformer:
-        lines = ["road_id,prefab,name,surface,width_m,point_index,local_x,local_z,elevation"]
-        for i, road in enumerate(processed_roads.get("roads", [])):
-            # Use transform_points to get local coords with elevation
-            local_pts = transformer.transform_points(
-                road["spline_points"],
-                elevation_array=elevation_array,
-            )
-            for j, lp in enumerate(local_pts):
-                lines.append(
-                    f"{road['osm_id']},{road['enfusion_prefab']},"
-                    f"\"{road['name']}\",{road['surface']},{road['width_m']},"
-                    f"{j},{lp['x']:.3f},{lp['z']:.3f},{lp['y']:.2f}"
-                )
-    else:
-        lines = ["road_id,prefab,name,surface,width_m,point_index,longitude,latitude,elevation"]
-        for i, road in enumerate(processed_roads.get("roads", [])):
-            for j, point in enumerate(road["spline_points"]):
-                lines.append(
-                    f"{road['osm_id']},{road['enfusion_prefab']},"
-                    f"\"{road['name']}\",{road['surface']},{road['width_m']},"
-                    f"{j},{point['x']:.8f},{point['y']:.8f},{point['z']:.2f}"
-                )
-    return "\n".join(lines)
+    return _emit_csv_lines(
+        _iter_spline_csv_lines(processed_roads, transformer, elevation_array), fp,
+    )
 
 
 def export_roads_geojson_local(processed_roads: dict, transformer) -> dict:
@@ -361,12 +392,24 @@ def export_roads_geojson_local(processed_roads: dict, transformer) -> dict:
     Returns:
         GeoJSON FeatureCollection with local coordinates.
     """
+    roads = processed_roads.get("roads", [])
+    # Project every spline point of every road in one batched call, then
+    # slice the flat result back per road.
+    all_points = [p for road in roads for p in road["spline_points"]]
+    local_x, local_z = transformer.wgs84_to_local_arrays(
+        [p["x"] for p in all_points], [p["y"] for p in all_points]
+    )
+    flat_coords = [
+        [round(x, 3), round(z, 3)]
+        for x, z in zip(local_x.tolist(), local_z.tolist())
+    ]
+
     features = []
-    for road in processed_roads.get("roads", []):
-        coords = []
-        for p in road["spline_points"]:
-            local_x, local_z = transformer.wgs84_to_local(p["x"], p["y"])
-            coords.append([round(local_x, 3), round(local_z, 3)])
+    start = 0
+    for road in roads:
+        end = start + len(road["spline_points"])
+        coords = flat_coords[start:end]
+        start = end
 
         feature = {
             "type": "Feature",
@@ -394,7 +437,19 @@ def export_roads_geojson_local(processed_roads: dict, transformer) -> dict:
     }
 
 
-def export_roads_reference_csv(processed_roads: dict) -> str:
+def _iter_reference_csv_lines(processed_roads: dict) -> Iterator[str]:
+    yield "road_index,osm_id,name,highway_type,surface,width_m,suggested_prefab,point_count"
+    for i, road in enumerate(processed_roads.get("roads", [])):
+        name = road.get("name", "").replace('"', "'").replace(",", " ")
+        yield (
+            f'{i},{road["osm_id"]},"{name}",{road["highway_type"]},'
+            f'{road["surface"]},{road["width_m"]},{road["enfusion_prefab"]},'
+            f'{road["point_count"]}'
+        )
+
+
+def export_roads_reference_csv(processed_roads: dict,
+                               fp: Optional[TextIO] = None) -> Optional[str]:
     """
     Export a roads reference CSV for manual prefab setup in Enfusion World Editor.
 
@@ -403,16 +458,10 @@ def export_roads_reference_csv(processed_roads: dict) -> str:
 
     Args:
         processed_roads: Output from process_roads().
+        fp: Optional open text file. When given, rows are streamed to it
+            and nothing is returned.
 
     Returns:
-        CSV string content.
+        CSV string content, or None when written to *fp*.
     """
-    lines = ["road_index,osm_id,name,highway_type,surface,width_m,suggested_prefab,point_count"]
-    for i, road in enumerate(processed_roads.get("roads", [])):
-        name = road.get("name", "").replace('"', "'").replace(",", " ")
-        lines.append(
-            f'{i},{road["osm_id"]},"{name}",{road["highway_type"]},'
-            f'{road["surface"]},{road["width_m"]},{road["enfusion_prefab"]},'
-            f'{road["point_count"]}'
-        )
-    return "\n".join(lines)
+    return _emit_csv_lines(_iter_reference_csv_lines(processed_roads), fp)
@@ -114,8 +114,7 @@ class SetupGuideGenerator:
         content = "\n\n".join(sections)
 
         guide_path = output_dir / "SETUP_GUIDE.md"
-        with open(guide_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        guide_path.write_text(content, encoding="utf-8")
 
         logger.info(f"Generated SETUP_GUIDE.md: {guide_path}")
         return guide_path
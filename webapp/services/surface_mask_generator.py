@@ -398,12 +398,17 @@ def generate_surface_masks(
             # normalization redistributed that to pine/forest_floor and
             # produced the dark "frame" artifact reported as issue #115.
             if (w, h) == (target_w + 1, target_h + 1):
-                elevation = 0.25 * (
-                    elevation[:-1, :-1].astype(np.float32)
-                    + elevation[1:, :-1].astype(np.float32)
-                    + elevation[:-1, 1:].astype(np.float32)
-                    + elevation[1:, 1:].astype(np.float32)
-                )
+                # The array is step 4's heightmap result, handed over by
+                # reference. Accumulate into a single output buffer instead
+                # of four astype() copies plus temporaries; the summation
+                # order (and so the float32 result) is unchanged.
+                src = elevation.astype(np.float32, copy=False)
+                faces = src[:-1, :-1].copy()
+                faces += src[1:, :-1]
+                faces += src[:-1, 1:]
+                faces += src[1:, 1:]
+                faces *= 0.25
+                elevation = faces
             else:
                 # Fallback for any unexpected non-(N+1→N) call: use a
                 # boundary-preserving spline resample. mode='reflect' mirrors
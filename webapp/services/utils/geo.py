@@ -8,16 +8,36 @@ and distance/dimension estimations.
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 
 from pyproj import Transformer
 
 
+@lru_cache(maxsize=64)
+def cached_transformer(src_crs: str, dst_crs: str, always_xy: bool = True) -> Transformer:
+    """
+    Process-wide cached pyproj Transformer for a (src, dst) CRS pair.
+
+    Building a Transformer loads the PROJ database and resolves the operation
+    pipeline (tens to hundreds of ms), while the set of CRS pairs a server
+    ever sees is small (WGS84 ↔ a handful of national/UTM grids). Every
+    module that needs a Transformer goes through here, so consecutive jobs
+    over the same country reuse one instance. Transformers are safe to share
+    across threads (pyproj >= 3.1). Call ``cached_transformer.cache_clear()``
+    to release them.
+    """
+    return Transformer.from_crs(src_crs, dst_crs, always_xy=always_xy)
+
+
 def transform_bbox_to_crs(
     bbox_wgs84: tuple[float, float, float, float],
     target_crs: str,
 ) -> tuple[float, float, float, float]:
     """Transform a WGS84 bbox (west, south, east, north) to a target CRS."""
-    transformer = Transformer.from_crs("EPSG:4326", target_crs, always_xy=True)
+    if target_crs.upper() in ("EPSG:4326", "4326"):
+        # Identity: skip the PROJ round trip (and any no-op pipeline rounding)
+        return tuple(bbox_wgs84)
+    transformer = cached_transformer("EPSG:4326", target_crs)
     x_min, y_min = transformer.transform(bbox_wgs84[0], bbox_wgs84[1])
     x_max, y_max = transformer.transform(bbox_wgs84[2], bbox_wgs84[3])
     return (x_min, y_min, x_max, y_max)
@@ -227,7 +227,41 @@ def _coords_to_pixels(
     width: int,
     height: int,
 ) -> list[tuple[int, int]]:
-    """Convert geographic coordinates to pixel coordinates."""
+    """Convert geographic coordinates to pixel coordinates.
+
+    Every mask and heightmap rasterization walks the same GeoJSON rings, so
+    this is vectorized: the ring becomes one (N, 2+) float array and the
+    scale/truncate/clamp runs as numpy column ops. Ragged or malformed
+    rings (mixed 2D/3D positions, stray scalars) fall back to the
+    per-coordinate loop, which skips invalid positions.
+    """
+    try:
+        arr = np.asarray(coords, dtype=np.float64)
+    except (TypeError, ValueError):
+        arr = None
+    if arr is None or arr.ndim != 2 or arr.shape[1] < 2:
+        return _coords_to_pixels_slow(
+            coords, west, north, lng_range, lat_range, width, height,
+        )
+
+    # astype truncates toward zero, matching int() in the slow path.
+    px = ((arr[:, 0] - west) / lng_range * width).astype(np.int64)
+    py = ((north - arr[:, 1]) / lat_range * height).astype(np.int64)
+    np.clip(px, 0, width - 1, out=px)
+    np.clip(py, 0, height - 1, out=py)
+    return list(zip(px.tolist(), py.tolist()))
+
+
+def _coords_to_pixels_slow(
+    coords: list,
+    west: float,
+    north: float,
+    lng_range: float,
+    lat_range: float,
+    width: int,
+    height: int,
+) -> list[tuple[int, int]]:
+    """Per-coordinate fallback for rings numpy cannot pack into a 2-D array."""
     pixels = []
     for coord in coords:
         if isinstance(coord, (list, tuple)) and len(coord) >= 2:
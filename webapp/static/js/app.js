@@ -260,8 +260,9 @@ let currentAccessToken = null;  // Access token for downloads
 let pollInterval = null;
 let lastLoggedStepCount = 0;
 let lastCurrentStep = '';
-// Cursor: index of the next log entry we want from the server.
-// Server returns logs[since:], so we advance by the number of entries received.
+// Cursor: sequence number of the next log entry we want from the server.
+// Server returns entries from `since` on plus `logs_total`, which becomes the
+// next cursor (entries evicted from the server's ring buffer are skipped).
 let logsSinceCursor = 0;
 
 // ===========================================================================
@@ -599,6 +600,11 @@ function startPolling(jobId) {
                 pollInterval = null;
                 hideProgress();
                 alert('Generation failed: ' + errorMsg);
+            } else if (job.status === 'cancelled') {
+                addConsoleLog('Generation cancelled', 'warning');
+                clearInterval(pollInterval);
+                pollInterval = null;
+                hideProgress();
             }
         } catch (err) {
             console.error('Polling error:', err);
@@ -670,7 +676,9 @@ function updateProgress(job) {
         for (const logEntry of job.logs) {
             addConsoleLog(logEntry.message, logEntry.level);
         }
-        logsSinceCursor += job.logs.length;
+    }
+    if (typeof job.logs_total === 'number') {
+        logsSinceCursor = job.logs_total;
     }
 
     document.getElementById('progress-step').textContent = job.current_step;
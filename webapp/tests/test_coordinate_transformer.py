@@ -86,3 +86,36 @@ class TestWgs84EnvelopeOfProjectedExtent:
             env_n - bbox["north"],
         )
         assert expansion > 1e-4, f"envelope barely expanded ({expansion}°)"
+
+
+class TestBatchedTransforms:
+    """Batched (array) transforms must match the per-point path exactly."""
+
+    @pytest.mark.parametrize("crs", ["EPSG:3006", "EPSG:4326"])
+    def test_arrays_match_scalar(self, crs):
+        bbox = _bbox(15.0, 58.5, 15.2, 58.6)
+        t = CoordinateTransformer(bbox=bbox, crs=crs, terrain_size_m=(8192.0, 8192.0))
+        lons = [15.0, 15.05, 15.123, 15.2]
+        lats = [58.5, 58.55, 58.577, 58.6]
+
+        xs, zs = t.wgs84_to_local_arrays(lons, lats)
+
+        for i, (lon, lat) in enumerate(zip(lons, lats)):
+            assert (xs[i], zs[i]) == t.wgs84_to_local(lon, lat)
+
+    def test_transform_points_samples_elevation(self):
+        import numpy as np
+
+        bbox = _bbox(15.0, 58.5, 15.2, 58.6)
+        t = CoordinateTransformer(bbox=bbox, crs="EPSG:4326", terrain_size_m=(100.0, 100.0))
+        elev = np.arange(9, dtype=np.float32).reshape(3, 3)
+
+        pts = t.transform_points(
+            [{"x": 15.0, "y": 58.5}, {"x": 15.16, "y": 58.58}], elevation_array=elev
+        )
+
+        # Array is north-up: the south-west corner samples the bottom-left
+        # pixel; a point at 80% east / 80% north samples the centre pixel.
+        assert pts[0] == {"x": 0.0, "y": 6.0, "z": 0.0}
+        assert pts[1]["y"] == 4.0
+        assert t.transform_points([]) == []
@@ -190,3 +190,37 @@ class TestUtmCrsFromCentroid:
         from services.country_detector import _utm_crs_from_centroid
         crs = _utm_crs_from_centroid(18.4, -33.9)
         assert crs.startswith("EPSG:327")
+
+
+class TestDetectCountriesCache:
+    @pytest.mark.asyncio
+    async def test_jittered_resubmission_hits_cache_with_exact_bbox(self):
+        from unittest.mock import patch
+
+        from services import country_detector
+
+        polygon = [
+            [21.54, 63.34],
+            [21.60, 63.34],
+            [21.60, 63.37],
+            [21.54, 63.37],
+            [21.54, 63.34],
+        ]
+        jittered = [[x + 1e-7, y] for x, y in polygon]
+        country_detector._country_cache.clear()
+
+        first = await country_detector.detect_countries(polygon)
+        with patch.object(
+            country_detector, "_detect_countries_uncached",
+            side_effect=AssertionError("cache miss"),
+        ):
+            second = await country_detector.detect_countries(jittered)
+
+        assert second["countries"] == first["countries"] == ["FI"]
+        assert second["crs"] == first["crs"]
+        assert second["bbox"]["west"] == pytest.approx(21.54 + 1e-7, abs=1e-12)
+
+        # Callers may mutate the result; the cached entry must not change.
+        second["countries"].append("XX")
+        third = await country_detector.detect_countries(polygon)
+        assert third["countries"] == ["FI"]
@@ -0,0 +1,46 @@
+"""
+Export layout: organize_export_structure and the export_relpath mapping the
+export ZIP uses to add files before they are moved.
+"""
+
+from services.export_service import export_relpath, organize_export_structure
+
+
+class TestExportRelpath:
+    def test_sourcefiles_and_reference(self):
+        assert export_relpath("heightmap.asc") == "Sourcefiles/heightmap.asc"
+        assert export_relpath("surface_grass.png") == "Sourcefiles/surface_grass.png"
+        assert export_relpath("metadata.json") == "Reference/metadata.json"
+        assert export_relpath("osm_water.geojson") == "Reference/osm_water.geojson"
+
+    def test_top_level_and_dropped(self):
+        assert export_relpath("addon.gproj") == "addon.gproj"
+        assert export_relpath("SETUP_GUIDE.md") == "SETUP_GUIDE.md"
+        assert export_relpath("IMPORT_GUIDE.md") is None
+
+
+class TestOrganizeExportStructure:
+    def test_files_end_up_where_export_relpath_says(self, tmp_path):
+        names = [
+            "heightmap.png", "satellite_map.png", "roads_splines.csv",
+            "osm_roads.geojson", "addon.gproj", "surface_assignments.json",
+        ]
+        for name in names:
+            (tmp_path / name).write_text(name)
+        (tmp_path / "IMPORT_GUIDE.md").write_text("old")
+
+        organize_export_structure(tmp_path, "Test")
+
+        for name in names:
+            dst = tmp_path / export_relpath(name)
+            assert dst.read_text() == name
+        assert not (tmp_path / "IMPORT_GUIDE.md").exists()
+
+    def test_does_not_overwrite_existing(self, tmp_path):
+        (tmp_path / "Reference").mkdir()
+        (tmp_path / "Reference" / "metadata.json").write_text("kept")
+        (tmp_path / "metadata.json").write_text("new")
+
+        organize_export_structure(tmp_path, "Test")
+
+        assert (tmp_path / "Reference" / "metadata.json").read_text() == "kept"
@@ -13,8 +13,9 @@ from __future__ import annotations
 import base64
 import os
 import sys
+import time
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
 
@@ -96,6 +97,18 @@ class TestLantmaterietConfig:
         assert config.elevation_resolution_m == 1.0
         assert config.max_tile_size == 4096
 
+    def test_config_tile_cache_from_env(self):
+        """Test the STAC Höjd tile cache location is configurable."""
+        with patch.dict(os.environ, {
+            "LANTMATERIET_TILE_CACHE_DIR": "/srv/cache/tiles",
+            "LANTMATERIET_TILE_CACHE_MAX_MB": "512",
+        }):
+            from config.lantmateriet import _load_config
+            config = _load_config()
+
+            assert config.tile_cache_dir == "/srv/cache/tiles"
+            assert config.tile_cache_max_mb == 512
+
 
 # ---------------------------------------------------------------------------
 # Auth tests
@@ -327,6 +340,131 @@ class TestLantmaterietIntegration:
         assert forests["type"] == "FeatureCollection"
 
 
+# ---------------------------------------------------------------------------
+# OGC Features client unit tests
+# ---------------------------------------------------------------------------
+
+
+class TestOgcFeaturesPagination:
+    """Test fetch_ogc_collection() page handling (no network)."""
+
+    @staticmethod
+    def _run(pages: dict, page_size: int = 2, max_features: int = 100, cache_dir: str = ""):
+        import asyncio
+        import json
+        from services.lantmateriet import ogc_features_client as ogc
+
+        requested = []
+
+        async def get(url, headers=None, params=None):
+            offset = int(params["offset"])
+            requested.append(offset)
+            page = pages.get(offset)
+            if page is None:
+                return MagicMock(status_code=500, text="boom")
+            return MagicMock(status_code=200, content=json.dumps(page).encode())
+
+        client = MagicMock()
+        client.get = get
+        ctx = MagicMock()
+        ctx.__aenter__ = AsyncMock(return_value=client)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+
+        with patch.object(ogc, "get_authenticated_headers", return_value={"Authorization": "x"}), \
+                patch.object(ogc.httpx, "AsyncClient", return_value=ctx), \
+                patch.object(ogc.LANTMATERIET_CONFIG, "tile_cache_dir", cache_dir):
+            result = asyncio.run(ogc.fetch_ogc_collection(
+                "https://example", "C", (0, 0, 1, 1),
+                max_features=max_features, page_size=page_size,
+            ))
+        return result, requested
+
+    @staticmethod
+    def _page(ids, matched=None):
+        page = {"features": [{"id": i} for i in ids], "numberReturned": len(ids)}
+        if matched is not None:
+            page["numberMatched"] = matched
+        return page
+
+    def test_remaining_pages_fetched_concurrently_in_order(self):
+        pages = {
+            0: self._page([0, 1], matched=5),
+            2: self._page([2, 3], matched=5),
+            4: self._page([4], matched=5),
+        }
+        result, requested = self._run(pages)
+
+        assert [f["id"] for f in result] == [0, 1, 2, 3, 4]
+        assert sorted(requested) == [0, 2, 4]
+
+    def test_failed_page_truncates_result(self):
+        pages = {
+            0: self._page([0, 1], matched=6),
+            4: self._page([4, 5], matched=6),
+        }
+        result, _ = self._run(pages)
+
+        assert [f["id"] for f in result] == [0, 1]
+
+    def test_without_number_matched_pages_serially(self):
+        pages = {0: self._page([0, 1]), 2: self._page([2])}
+        with patch("asyncio.sleep", AsyncMock()):
+            result, requested = self._run(pages)
+
+        assert [f["id"] for f in result] == [0, 1, 2]
+        assert requested == [0, 2]
+
+    def test_shared_client_is_used_and_left_open(self):
+        import asyncio
+        import json
+        from services.lantmateriet import ogc_features_client as ogc
+
+        page = json.dumps(self._page([0])).encode()
+        shared = MagicMock()
+        shared.get = AsyncMock(return_value=MagicMock(status_code=200, content=page))
+        shared.aclose = AsyncMock()
+
+        with patch.object(ogc, "get_authenticated_headers", return_value={"Authorization": "x"}), \
+                patch.object(ogc.httpx, "AsyncClient") as new_client, \
+                patch.object(ogc.LANTMATERIET_CONFIG, "tile_cache_dir", ""):
+            result = asyncio.run(ogc.fetch_ogc_collection(
+                "https://example", "C", (0, 0, 1, 1), page_size=2, client=shared,
+            ))
+
+        assert [f["id"] for f in result] == [0]
+        new_client.assert_not_called()
+        shared.aclose.assert_not_called()
+
+    def test_complete_fetch_is_cached_partial_is_not(self, tmp_path):
+        pages = {0: self._page([0, 1], matched=3), 2: self._page([2], matched=3)}
+        first, _ = self._run(pages, cache_dir=str(tmp_path))
+        second, requested = self._run({}, cache_dir=str(tmp_path))
+
+        assert second == first
+        assert requested == []
+
+        partial = {0: self._page([0, 1], matched=4)}
+        self._run(partial, max_features=50, cache_dir=str(tmp_path))
+        _, requested = self._run(partial, max_features=50, cache_dir=str(tmp_path))
+        assert requested  # nothing was cached for the partial query
+
+    def test_features_cache_evicts_oldest_and_expired(self, tmp_path):
+        from services.lantmateriet.ogc_features_client import _prune_features_cache
+
+        for i, name in enumerate(("old", "mid", "new")):
+            path = tmp_path / f"{name}.json"
+            path.write_bytes(b"x" * 100)
+            mtime = time.time() - 300 + i * 100
+            os.utime(path, (mtime, mtime))
+        expired = tmp_path / "expired.json"
+        expired.write_bytes(b"x")
+        os.utime(expired, (1000, 1000))
+
+        _prune_features_cache(tmp_path, max_bytes=200)
+
+        assert sorted(p.stem for p in tmp_path.iterdir()) == ["mid", "new"]
+
+
 # ---------------------------------------------------------------------------
 # Hydrografi service unit tests
 # ---------------------------------------------------------------------------
@@ -821,6 +959,56 @@ class TestMarktackeTranslation:
         assert "name" in props
 
 
+# ---------------------------------------------------------------------------
+# Orthophoto WMS retry unit tests
+# ---------------------------------------------------------------------------
+
+
+class TestOrthophotoRetry:
+    """Test fetch_historical_orthophoto() retry logging and cancellation."""
+
+    @staticmethod
+    def _client(get):
+        client = MagicMock()
+        client.get = get
+        ctx = MagicMock()
+        ctx.__aenter__ = AsyncMock(return_value=client)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        return ctx
+
+    @pytest.mark.asyncio
+    async def test_retry_logs_attempt_as_structured_field(self, caplog):
+        import asyncio
+        from services.lantmateriet import orthophoto_service as svc
+
+        busy = MagicMock(status_code=503)
+        ok = MagicMock(status_code=200, content=b"png", headers={"content-type": "image/png"})
+        get = AsyncMock(side_effect=[busy, ok])
+
+        with patch.object(svc, "get_authenticated_headers", return_value={"Authorization": "x"}), \
+                patch.object(svc.httpx, "AsyncClient", return_value=self._client(get)), \
+                patch.object(asyncio, "sleep", AsyncMock()):
+            caplog.set_level("INFO", logger=svc.logger.name)
+            assert await svc.fetch_historical_orthophoto((18.0, 59.0, 18.1, 59.1), 64, 64) == b"png"
+
+        retry = [r for r in caplog.records if r.getMessage().startswith("Retrying in")]
+        assert len(retry) == 1
+        assert retry[0].attempt == 2
+        assert retry[0].max_retries == svc.MAX_RETRIES
+
+    @pytest.mark.asyncio
+    async def test_cancellation_is_not_swallowed(self):
+        import asyncio
+        from services.lantmateriet import orthophoto_service as svc
+
+        get = AsyncMock(side_effect=asyncio.CancelledError())
+        with patch.object(svc, "get_authenticated_headers", return_value={"Authorization": "x"}), \
+                patch.object(svc.httpx, "AsyncClient", return_value=self._client(get)):
+            with pytest.raises(asyncio.CancelledError):
+                await svc.fetch_historical_orthophoto((18.0, 59.0, 18.1, 59.1), 64, 64)
+        assert get.await_count == 1
+
+
 # ---------------------------------------------------------------------------
 # STAC Höjd asset filtering unit tests
 # ---------------------------------------------------------------------------
@@ -873,6 +1061,305 @@ class TestStacElevationAssetFilter:
         assert _is_raster_asset({}) is False
 
 
+# ---------------------------------------------------------------------------
+# STAC Höjd bbox conversion unit tests
+# ---------------------------------------------------------------------------
+
+
+class TestStacElevationBboxToWgs84:
+    """Test _bbox_to_wgs84() — the STAC search needs a WGS84 bbox."""
+
+    def test_wgs84_input_passes_through(self):
+        from services.lantmateriet.stac_elevation import _bbox_to_wgs84
+
+        bbox = (15.0, 58.0, 15.1, 58.1)
+        with patch(
+            "services.lantmateriet.stac_elevation._get_transformer"
+        ) as get_transformer:
+            assert _bbox_to_wgs84(bbox, "EPSG:4326") == bbox
+            assert _bbox_to_wgs84(bbox, "epsg:4326") == bbox
+            get_transformer.assert_not_called()
+
+    def test_sweref99_is_projected(self):
+        pytest.importorskip("pyproj")
+        from services.lantmateriet.stac_elevation import _bbox_to_wgs84
+
+        lon_min, lat_min, lon_max, lat_max = _bbox_to_wgs84(
+            (500000.0, 6500000.0, 510000.0, 6510000.0), "EPSG:3006"
+        )
+        # SWEREF99 TM central meridian is 15°E; northing 6.5e6 ≈ 58.6°N
+        assert lon_min == pytest.approx(15.0, abs=1e-6)
+        assert 58.5 < lat_min < lat_max < 58.8
+        assert lon_min < lon_max
+
+    def test_sweref99_closed_form_matches_pyproj(self):
+        pyproj = pytest.importorskip("pyproj")
+        from services.lantmateriet.stac_elevation import _bbox_to_wgs84
+
+        bbox = (266000.0, 6170000.0, 900000.0, 7600000.0)
+        with patch(
+            "services.lantmateriet.stac_elevation._get_transformer"
+        ) as get_transformer:
+            result = _bbox_to_wgs84(bbox, "EPSG:3006")
+            get_transformer.assert_not_called()
+
+        t = pyproj.Transformer.from_crs("EPSG:3006", "EPSG:4326", always_xy=True)
+        expected = (*t.transform(bbox[0], bbox[1]), *t.transform(bbox[2], bbox[3]))
+        assert result == pytest.approx(expected, abs=1e-8)
+
+
+class TestStacElevationFeatureFilter:
+    """Test _filter_features_to_bbox() — drop tiles outside the native bbox."""
+
+    def test_drops_disjoint_and_orders_by_distance(self):
+        pytest.importorskip("pyproj")
+        from services.lantmateriet.stac_elevation import (
+            _bbox_to_wgs84,
+            _filter_features_to_bbox,
+        )
+
+        bbox = (500000.0, 6500000.0, 510000.0, 6510000.0)
+
+        def feat(fid, native):
+            return {"id": fid, "bbox": list(_bbox_to_wgs84(native, "EPSG:3006"))}
+
+        features = [
+            feat("edge", (508000.0, 6508000.0, 512000.0, 6512000.0)),
+            feat("far", (530000.0, 6500000.0, 540000.0, 6510000.0)),
+            feat("centre", (503000.0, 6503000.0, 507000.0, 6507000.0)),
+            {"id": "no-bbox"},
+        ]
+        result = [f["id"] for f in _filter_features_to_bbox(features, bbox, "EPSG:3006")]
+
+        assert result == ["no-bbox", "centre", "edge"]
+
+    def test_wgs84_bbox_compares_directly(self):
+        from services.lantmateriet.stac_elevation import _filter_features_to_bbox
+
+        features = [
+            {"id": "in", "bbox": [15.0, 58.0, 15.1, 58.1]},
+            {"id": "out", "bbox": [16.0, 58.0, 16.1, 58.1]},
+        ]
+        result = _filter_features_to_bbox(features, (15.05, 58.05, 15.2, 58.2), "EPSG:4326")
+
+        assert [f["id"] for f in result] == ["in"]
+
+
+# ---------------------------------------------------------------------------
+# STAC Höjd tile/search cache unit tests
+# ---------------------------------------------------------------------------
+
+
+class TestStacElevationTileCache:
+    """Test the persistent tile and search-response cache helpers."""
+
+    def test_store_then_lookup_round_trip(self, tmp_path):
+        from services.lantmateriet.stac_elevation import (
+            _lookup_cached_tile, _store_cached_tile,
+        )
+
+        tile = tmp_path / "tile.tif"
+        tile.write_bytes(b"II*\x00" + b"\x00" * 96)
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+
+        _store_cached_tile(tile, cache_dir, "mhm-65_5_t1")
+        hit = _lookup_cached_tile(cache_dir, "mhm-65_5_t1", 100)
+
+        assert hit is not None
+        assert hit.read_bytes() == tile.read_bytes()
+
+    def test_size_mismatch_is_a_miss(self, tmp_path):
+        from services.lantmateriet.stac_elevation import _lookup_cached_tile
+
+        (tmp_path / "t1.tif").write_bytes(b"x" * 10)
+
+        assert _lookup_cached_tile(tmp_path, "t1", 20) is None
+        # Unknown STAC size still accepts the cached tile
+        assert _lookup_cached_tile(tmp_path, "t1", "unknown") is not None
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        from services.lantmateriet.stac_elevation import _prune_tile_cache
+
+        for i, name in enumerate(("old", "mid", "new")):
+            path = tmp_path / f"{name}.tif"
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (1000 + i, 1000 + i))
+
+        _prune_tile_cache(tmp_path, max_bytes=200)
+
+        assert sorted(p.stem for p in tmp_path.glob("*.tif")) == ["mid", "new"]
+
+    def test_prune_drops_expired_search_responses(self, tmp_path):
+        from services.lantmateriet.stac_elevation import _prune_tile_cache
+
+        stale = tmp_path / "search_stale.json"
+        stale.write_text("{}")
+        os.utime(stale, (1000, 1000))
+        (tmp_path / "search_fresh.json").write_text("{}")
+
+        _prune_tile_cache(tmp_path, max_bytes=1024)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["search_fresh.json"]
+
+    def test_quantized_bbox_only_grows(self):
+        from services.lantmateriet.stac_cache import quantize_bbox_wgs84
+
+        bbox = [15.12345, 58.98761, 15.2001, 59.0004]
+        q = quantize_bbox_wgs84(bbox)
+
+        assert q == [15.123, 58.987, 15.201, 59.001]
+        assert q[0] <= bbox[0] and q[1] <= bbox[1]
+        assert q[2] >= bbox[2] and q[3] >= bbox[3]
+
+    def test_search_cache_round_trip(self, tmp_path):
+        from services.lantmateriet.stac_cache import (
+            load_cached_search, store_cached_search,
+        )
+
+        query = {"bbox": [15.0, 58.0, 15.1, 58.1], "limit": 100}
+        result = {"features": [{"id": "t1"}]}
+
+        assert load_cached_search(tmp_path, query) is None
+        store_cached_search(tmp_path, query, result)
+        assert load_cached_search(tmp_path, query) == result
+        assert load_cached_search(None, query) is None
+
+
+# ---------------------------------------------------------------------------
+# STAC Höjd mosaic/reproject/write unit tests
+# ---------------------------------------------------------------------------
+
+
+class TestStacElevationMergeAndWrite:
+    """Test _merge_and_write() on a single synthetic tile (no network, no VRT)."""
+
+    @staticmethod
+    def _write_tile(path):
+        rasterio = pytest.importorskip("rasterio")
+        import numpy as np
+        from rasterio.transform import from_origin
+
+        # 0.00–624.99 m, in 1 cm steps
+        data = (np.arange(250 * 250, dtype=np.float32) / 100).reshape(1, 250, 250)
+        data[0, 0, 0] = -9999
+        with rasterio.open(
+            path, "w", driver="GTiff", width=250, height=250, count=1,
+            dtype="float32", crs="EPSG:3006", nodata=-9999,
+            transform=from_origin(500000, 6502500, 10, 10),
+        ) as dst:
+            dst.write(data)
+
+    def _read(self, data: bytes):
+        from rasterio.io import MemoryFile
+
+        with MemoryFile(data) as mem, mem.open() as ds:
+            return ds.read(1), ds.profile, ds.scales[0]
+
+    def test_resamples_to_target_dimensions(self, tmp_path):
+        from services.lantmateriet.stac_elevation import _merge_and_write
+
+        tile = tmp_path / "t0.tif"
+        self._write_tile(tile)
+        bbox = (500100.0, 6500100.0, 502000.0, 6502000.0)
+
+        data, w, h = _merge_and_write([tile], bbox, "EPSG:3006", 200, 100, str(tmp_path))
+        arr, profile, scale = self._read(data)
+
+        assert (w, h) == (200, 100)
+        assert arr.shape == (100, 200)
+        assert profile["dtype"] == "int16"
+        assert profile["nodata"] == -32768
+        assert profile["compress"] == "deflate"
+        assert scale == pytest.approx(0.1)
+
+    def test_native_resolution_reads_bbox_window_only(self, tmp_path):
+        from services.lantmateriet.stac_elevation import _merge_and_write
+
+        tile = tmp_path / "t0.tif"
+        self._write_tile(tile)
+        bbox = (500100.0, 6500100.0, 502000.0, 6502000.0)
+
+        data, w, h = _merge_and_write([tile], bbox, "EPSG:3006", None, None, str(tmp_path))
+        arr, _, scale = self._read(data)
+
+        # 1900 m at 10 m/px, cropped from the 250×250 tile
+        assert (w, h) == (190, 190)
+        # Top-left pixel is row 50, col 10 of the source tile, in decimetres
+        assert arr[0, 0] * scale == pytest.approx((50 * 250 + 10) / 100, abs=0.05)
+
+    def test_nodata_maps_to_int16_sentinel(self, tmp_path):
+        from services.lantmateriet.stac_elevation import _merge_and_write
+
+        tile = tmp_path / "t0.tif"
+        self._write_tile(tile)
+        # bbox starting at the tile origin so the -9999 pixel is included
+        bbox = (500000.0, 6500600.0, 500500.0, 6502500.0)
+
+        data, _, _ = _merge_and_write([tile], bbox, "EPSG:3006", None, None, str(tmp_path))
+        arr, _, _ = self._read(data)
+
+        assert arr[0, 0] == -32768
+        assert arr[0, 1] == 0  # 0.01 m rounds to 0 dm
+
+    def test_uncovered_pixels_are_nodata_without_source_nodata(self, tmp_path):
+        rasterio = pytest.importorskip("rasterio")
+        import numpy as np
+        from rasterio.transform import from_origin
+        from services.lantmateriet.stac_elevation import _merge_and_write
+
+        tile = tmp_path / "t0.tif"
+        with rasterio.open(
+            tile, "w", driver="GTiff", width=100, height=100, count=1,
+            dtype="float32", crs="EPSG:3006",
+            transform=from_origin(500000, 6501000, 10, 10),
+        ) as dst:
+            dst.write(np.full((1, 100, 100), 50, dtype=np.float32))
+        # Left third of the bbox lies west of the tile
+        bbox = (499500.0, 6500000.0, 501000.0, 6501000.0)
+
+        data, _, _ = _merge_and_write([tile], bbox, "EPSG:3006", 150, 100, str(tmp_path))
+        arr, _, _ = self._read(data)
+
+        assert arr[0, 0] == -32768
+        assert arr[0, -1] == 500
+
+    def test_geotiff_to_array_applies_scale(self, tmp_path):
+        pytest.importorskip("scipy")
+        from services.heightmap_generator import geotiff_to_array
+        from services.lantmateriet.stac_elevation import _merge_and_write
+
+        tile = tmp_path / "t0.tif"
+        self._write_tile(tile)
+        bbox = (500100.0, 6500100.0, 502000.0, 6502000.0)
+
+        data, _, _ = _merge_and_write([tile], bbox, "EPSG:3006", None, None, str(tmp_path))
+        elevation, _ = geotiff_to_array(data)
+
+        assert elevation.dtype.name == "float32"
+        assert elevation[0, 0] == pytest.approx(125.1, abs=0.05)
+
+    def test_geotiff_to_array_reads_spilled_path(self, tmp_path):
+        pytest.importorskip("scipy")
+        import numpy as np
+        from services.heightmap_generator import geotiff_to_array
+        from services.lantmateriet.stac_elevation import _merge_and_write
+
+        tile = tmp_path / "t0.tif"
+        self._write_tile(tile)
+        bbox = (500100.0, 6500100.0, 502000.0, 6502000.0)
+
+        data, _, _ = _merge_and_write([tile], bbox, "EPSG:3006", None, None, str(tmp_path))
+        dem_path = tmp_path / "_dem.tif"
+        dem_path.write_bytes(data)
+
+        from_bytes, _ = geotiff_to_array(data)
+        from_path, meta = geotiff_to_array(dem_path)
+
+        np.testing.assert_array_equal(from_path, from_bytes)
+        assert meta["crs"] == "EPSG:3006"
+
+
 # ---------------------------------------------------------------------------
 # Feature dispatch unit tests
 # ---------------------------------------------------------------------------
@@ -0,0 +1,56 @@
+"""Tests for run_generation cancellation: worker threads are drained before
+the output directory is handed to cleanup."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import types
+
+import pytest
+
+import services.map_generator as map_generator
+from services.map_generator import MapGenerationJob, _run_worker, launch_generation
+
+
+class TestCancelWaitsForWorkers:
+    """Cancelling mid-step never lets cleanup race a running worker thread."""
+
+    @pytest.mark.asyncio
+    async def test_cleanup_runs_only_after_the_worker_returns(self, tmp_path, monkeypatch):
+        started = threading.Event()
+        release = threading.Event()
+        events = []
+
+        def blocking_step():
+            started.set()
+            release.wait(5)
+            events.append("worker done")
+
+        async def fake_detect_countries(polygon_coords):
+            await _run_worker(blocking_step)
+            raise AssertionError("the pipeline should have been cancelled")
+
+        fake_main = types.SimpleNamespace(
+            schedule_cleanup=lambda job_id, delay: events.append("cleanup"),
+        )
+        monkeypatch.setitem(sys.modules, "main", fake_main)
+        monkeypatch.setattr("config.OUTPUT_DIR", tmp_path)
+        monkeypatch.setattr(map_generator, "step_detect_countries", fake_detect_countries)
+
+        job = MapGenerationJob("job", [], {}, "session")
+        task = launch_generation(job)
+        await asyncio.to_thread(started.wait, 5)
+
+        assert job.cancel()
+        await asyncio.sleep(0.05)
+        # The worker is still blocked, so the pipeline must still be draining.
+        assert not task.done()
+        assert events == []
+
+        release.set()
+        await task
+
+        assert events == ["worker done", "cleanup"]
+        assert job.status == "cancelled"
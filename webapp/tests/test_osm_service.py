@@ -1,8 +1,29 @@
-"""Tests for Overpass mirror health validation and probe-based ranking."""
+"""Tests for Overpass mirror health validation, probe-based ranking and the
+combined multi-set feature query."""
 
 from __future__ import annotations
 
-from services.osm_service import _is_valid_iso_timestamp, _rank_mirrors
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from services.osm_service import (
+    _cool_down,
+    _is_valid_iso_timestamp,
+    _multi_query,
+    _order_by_cooldown,
+    _prune_overpass_cache,
+    _rank_mirrors,
+    _retry_after_seconds,
+    _run_overpass_query,
+    _split_multi_output,
+    fetch_all_features,
+    rotate_endpoints,
+)
 
 
 class TestIsValidIsoTimestamp:
@@ -68,3 +89,214 @@ class TestRankMirrors:
 
     def test_empty_results(self):
         assert _rank_mirrors([]) == []
+
+
+class TestMirrorCooldown:
+    """A mirror that just failed is tried last until its cooldown ends."""
+
+    @patch.dict("services.osm_service._mirror_cooldown", clear=True)
+    def test_failed_mirror_moves_to_back(self):
+        _cool_down("https://a/api")
+        assert _order_by_cooldown(["https://a/api", "https://b/api", "https://c/api"]) == [
+            "https://b/api",
+            "https://c/api",
+            "https://a/api",
+        ]
+
+    @patch.dict("services.osm_service._mirror_cooldown", clear=True)
+    def test_expired_cooldown_restores_order(self):
+        _cool_down("https://a/api", seconds=-1)
+        assert _order_by_cooldown(["https://a/api", "https://b/api"]) == [
+            "https://a/api",
+            "https://b/api",
+        ]
+
+
+
+class TestRotateEndpoints:
+    def test_each_concurrent_query_starts_on_a_different_mirror(self):
+        eps = ["a", "b", "c"]
+        assert [rotate_endpoints(eps, k)[0] for k in range(4)] == ["a", "b", "c", "a"]
+        assert rotate_endpoints(eps, 1) == ["b", "c", "a"]
+
+    def test_empty(self):
+        assert rotate_endpoints([], 3) == []
+
+
+class TestRetryAfterSeconds:
+    def test_delta_seconds(self):
+        resp = httpx.Response(429, headers={"Retry-After": "12"})
+        assert _retry_after_seconds(resp) == 12.0
+
+    def test_http_date_in_the_past_is_zero(self):
+        resp = httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert _retry_after_seconds(resp) == 0.0
+
+    def test_missing_or_garbage(self):
+        assert _retry_after_seconds(httpx.Response(429)) is None
+        assert _retry_after_seconds(httpx.Response(429, headers={"Retry-After": "soon"})) is None
+
+
+def _count():
+    return {"type": "count", "id": 0, "tags": {"total": "0"}}
+
+
+class TestMultiQuery:
+    """One request carries every category; count sentinels separate the sets."""
+
+    def test_each_set_is_output_then_counted(self):
+        query = _multi_query("1,2,3,4", ["roads", "buildings"])
+        assert query.startswith("[out:json]")
+        assert "[bbox:1,2,3,4]" in query
+        assert query.index(".roads out body geom;") < query.index(".roads out count;")
+        assert query.index(".roads out count;") < query.index(".buildings out body geom;")
+        assert query.rstrip().endswith(".buildings out count;")
+
+    def test_split_at_count_sentinels(self):
+        road = {"type": "way", "id": 1}
+        bld = {"type": "way", "id": 2}
+        elements = [road, _count(), _count(), bld, _count()]
+        assert _split_multi_output(elements, ["roads", "water", "buildings"]) == {
+            "roads": [road],
+            "water": [],
+            "buildings": [bld],
+        }
+
+    def test_same_element_can_land_in_two_sets(self):
+        way = {"type": "way", "id": 7}
+        buckets = _split_multi_output([way, _count(), way, _count()], ["a", "b"])
+        assert buckets == {"a": [way], "b": [way]}
+
+
+class TestFetchAllFeatures:
+    @pytest.mark.asyncio
+    async def test_single_request_for_all_categories(self):
+        bbox = {"west": 18.0, "south": 59.0, "east": 18.1, "north": 59.1}
+        road = {
+            "type": "way", "id": 1, "tags": {"highway": "primary"},
+            "geometry": [{"lat": 59.0, "lon": 18.0}, {"lat": 59.1, "lon": 18.1}],
+        }
+        response = {"elements": [road] + [_count()] * 5}
+
+        with patch("services.osm_service.probe_overpass_mirrors",
+                   AsyncMock(return_value=["https://a/api"])), \
+             patch("services.osm_service._run_overpass_query",
+                   AsyncMock(return_value=response)) as run:
+            result = await fetch_all_features(bbox)
+
+        assert run.await_count == 1
+        assert len(result["roads"]["features"]) == 1
+        assert result["water"]["features"] == []
+        assert set(result) == {"roads", "water", "forests", "buildings", "land_use"}
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_separate_queries(self):
+        bbox = {"west": 18.0, "south": 59.0, "east": 18.1, "north": 59.1}
+
+        with patch("services.osm_service.probe_overpass_mirrors",
+                   AsyncMock(return_value=["https://a/api"])), \
+             patch("services.osm_service._run_overpass_query",
+                   AsyncMock(side_effect=[None] + [{"elements": []}] * 5)) as run:
+            result = await fetch_all_features(bbox)
+
+        assert run.await_count == 6
+        assert all(fc["features"] == [] for fc in result.values())
+
+
+class TestOverpassCache:
+    """A validated response is served from disk on the next identical query."""
+
+    @pytest.mark.asyncio
+    async def test_second_identical_query_skips_the_network(self, tmp_path):
+        payload = (
+            b'{"osm3s": {"timestamp_osm_base": "2026-05-20T15:27:44Z"},'
+            b' "elements": [{"type": "way", "id": 1}]}'
+        )
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(
+                200, headers={"content-type": "application/json"}, content=payload
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("services.osm_service.OVERPASS_CACHE_DIR", str(tmp_path)), \
+             patch("services.osm_service._client", client):
+            first = await _run_overpass_query("q", endpoints=["https://a/api"])
+            second = await _run_overpass_query("q", endpoints=["https://a/api"])
+            await _run_overpass_query("other", endpoints=["https://a/api"])
+        await client.aclose()
+
+        assert first == second
+        assert second["elements"] == [{"type": "way", "id": 1}]
+        assert len(calls) == 2
+
+    def test_prune_evicts_oldest_until_under_cap(self, tmp_path):
+        now = time.time()
+        for i, name in enumerate(["old", "mid", "new"]):
+            path = tmp_path / f"{name}.json"
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (now - 300 + i * 100, now - 300 + i * 100))
+        (tmp_path / "keep.part").write_bytes(b"x" * 100)
+
+        _prune_overpass_cache(tmp_path, max_bytes=150)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["keep.part", "new.json"]
+
+    def test_prune_drops_expired_entries_under_cap(self, tmp_path):
+        stale = tmp_path / "stale.json"
+        stale.write_bytes(b"{}")
+        old = time.time() - 2 * 24 * 3600
+        os.utime(stale, (old, old))
+        (tmp_path / "fresh.json").write_bytes(b"{}")
+
+        _prune_overpass_cache(tmp_path, max_bytes=1024)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["fresh.json"]
+
+
+class TestSingleFlight:
+    """Identical concurrent queries share one fetch."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_queries_share_one_fetch(self):
+        release = asyncio.Event()
+
+        async def fake_fetch(query, *args):
+            await release.wait()
+            return {"elements": [query]}
+
+        with patch("services.osm_service._fetch_overpass_query",
+                   AsyncMock(side_effect=fake_fetch)) as fetch:
+            first = asyncio.create_task(_run_overpass_query("q"))
+            second = asyncio.create_task(_run_overpass_query("q"))
+            other = asyncio.create_task(_run_overpass_query("other"))
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(first, second, other)
+
+        assert fetch.await_count == 2
+        assert results[0] is results[1]
+        assert results[2] == {"elements": ["other"]}
+
+    @pytest.mark.asyncio
+    async def test_cancelling_one_caller_keeps_the_fetch_for_the_other(self):
+        release = asyncio.Event()
+
+        async def fake_fetch(query, *args):
+            await release.wait()
+            return {"elements": []}
+
+        with patch("services.osm_service._fetch_overpass_query",
+                   AsyncMock(side_effect=fake_fetch)):
+            first = asyncio.create_task(_run_overpass_query("q"))
+            second = asyncio.create_task(_run_overpass_query("q"))
+            await asyncio.sleep(0)
+            first.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            assert await second == {"elements": []}
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
@@ -296,3 +296,22 @@ class TestLines:
         mask = rasterize_features_to_mask(gj, W, H, BBOX, buffer_px=1)
         # The line crosses the hole at the centre — it must still be drawn
         assert mask[H // 2, W // 2] == 1
+
+
+class TestCoordsToPixels:
+    def test_vectorized_matches_per_coordinate_path(self):
+        from services.utils.rasterize import _coords_to_pixels, _coords_to_pixels_slow
+
+        rng = np.random.default_rng(0)
+        # Includes points outside the bbox on every side to exercise clamping.
+        coords = rng.uniform(-0.2, 1.2, size=(500, 2)).tolist()
+        args = (0.0, 1.0, 1.0, 1.0, W, H)
+
+        assert _coords_to_pixels(coords, *args) == _coords_to_pixels_slow(coords, *args)
+
+    def test_ragged_ring_falls_back(self):
+        from services.utils.rasterize import _coords_to_pixels
+
+        # Mixed 2D/3D positions plus a malformed entry.
+        coords = [[0.25, 0.75], [0.5, 0.5, 12.0], [0.3]]
+        assert _coords_to_pixels(coords, 0.0, 1.0, 1.0, 1.0, W, H) == [(25, 25), (50, 50)]
@@ -174,6 +174,18 @@ class TestExportRoadsSplineCsv:
         assert lines[0].startswith("road_id,prefab,")
         assert len(lines) > 1
 
+    def test_streamed_csv_matches_string(self, sample_road_features):
+        import io
+
+        from services.road_processor import (
+            process_roads, export_roads_spline_csv, export_roads_reference_csv,
+        )
+        processed = process_roads(sample_road_features, "NO")
+        for export in (export_roads_spline_csv, export_roads_reference_csv):
+            buf = io.StringIO()
+            assert export(processed, fp=buf) is None
+            assert buf.getvalue() == export(processed)
+
 
 class TestValidateRoadPrefab:
     """v1.4.0 — Atlas 2 canonical names. validate_road_prefab snaps any
@@ -53,3 +53,60 @@ class TestComputeSatelliteTargetDims:
             assert x >= size, (
                 f"satellite dim {x} smaller than heightmap dim {size}"
             )
+
+
+class TestPngWithDpi:
+    """Correctly-sized RGB PNGs get DPI stamped without a PIL re-encode."""
+
+    @staticmethod
+    def _png(size, mode="RGB", **save_kwargs) -> bytes:
+        import io
+
+        from PIL import Image
+
+        buf = io.BytesIO()
+        Image.new(mode, size, (10, 20, 30) if mode == "RGB" else 0).save(
+            buf, format="PNG", **save_kwargs
+        )
+        return buf.getvalue()
+
+    def test_matching_rgb_png_gets_96_dpi(self):
+        import io
+
+        from PIL import Image
+
+        from services.map_generator import _png_with_dpi
+
+        out = _png_with_dpi(self._png((64, 32)), 64, 32)
+        assert out is not None
+        with Image.open(io.BytesIO(out)) as img:
+            img.load()
+            assert img.size == (64, 32)
+            assert img.getpixel((5, 5)) == (10, 20, 30)
+            assert tuple(round(d) for d in img.info["dpi"]) == (96, 96)
+
+    def test_existing_phys_chunk_is_replaced(self):
+        from services.map_generator import _png_with_dpi
+
+        out = _png_with_dpi(self._png((16, 16), dpi=(300, 300)), 16, 16)
+        assert out is not None
+        assert out.count(b"pHYs") == 1
+
+    def test_png_already_at_96_dpi_is_returned_unchanged(self):
+        from services.map_generator import _png_with_dpi
+
+        data = self._png((16, 16), dpi=(96, 96))
+        assert _png_with_dpi(data, 16, 16) is data
+
+    def test_png_ihdr(self):
+        from services.map_generator import _png_ihdr
+
+        assert _png_ihdr(self._png((64, 32))) == (64, 32, 8, 2)
+        assert _png_ihdr(b"GIF89a" + b"\0" * 40) is None
+
+    def test_wrong_size_or_mode_falls_back(self):
+        from services.map_generator import _png_with_dpi
+
+        assert _png_with_dpi(self._png((64, 32)), 64, 64) is None
+        assert _png_with_dpi(self._png((64, 32), mode="L"), 64, 32) is None
+        assert _png_with_dpi(b"\xff\xd8\xff\xe0 not a png", 64, 32) is None
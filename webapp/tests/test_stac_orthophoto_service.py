@@ -8,6 +8,9 @@ seam/coverage bugs behind issue #65:
    produced a vertical missing-data line).
 2. `_cog_merge_rgb` must merge two adjacent COG tiles without a
    1-pixel-wide black seam at their shared boundary.
+
+Also covers `_select_covering_features`, which trims the search results to
+the items that actually contribute pixels before any COG is opened.
 """
 
 from __future__ import annotations
@@ -73,6 +76,103 @@ class TestWgs84BboxToEpsg3006Envelope:
         )
 
 
+# ---------------------------------------------------------------------------
+# Candidate selection — shapely only
+# ---------------------------------------------------------------------------
+
+
+def _item(item_id: str, w: float, s: float, e: float, n: float) -> dict:
+    return {"id": item_id, "bbox": [w, s, e, n]}
+
+
+class TestSelectCoveringFeatures:
+    def test_drops_edge_touching_hidden_and_duplicate_items(self):
+        from services.lantmateriet.stac_orthophoto_service import (
+            _select_covering_features,
+        )
+
+        bbox = (15.0, 58.0, 16.0, 58.5)
+        features = [
+            _item("new-west", 14.9, 57.9, 15.5, 58.6),
+            _item("new-west", 14.9, 57.9, 15.5, 58.6),   # duplicate id
+            _item("old-west", 15.0, 58.0, 15.4, 58.5),   # hidden under new-west
+            _item("touching", 16.0, 58.0, 16.5, 58.5),   # shares the east edge only
+            _item("new-east", 15.4, 57.9, 16.1, 58.6),
+            _item("old-east", 15.6, 58.0, 16.0, 58.5),   # after full coverage
+        ]
+
+        result = [f["id"] for f in _select_covering_features(features, bbox)]
+
+        assert result == ["new-west", "new-east"]
+
+    def test_partial_coverage_keeps_contributing_older_items(self):
+        from services.lantmateriet.stac_orthophoto_service import (
+            _select_covering_features,
+        )
+
+        bbox = (15.0, 58.0, 16.0, 58.5)
+        features = [
+            _item("new", 15.0, 58.0, 15.5, 58.5),
+            {"id": "no-footprint"},
+            _item("old", 15.0, 58.0, 16.0, 58.5),
+        ]
+
+        result = [f["id"] for f in _select_covering_features(features, bbox)]
+
+        assert result == ["new", "no-footprint", "old"]
+
+    def test_only_edge_touching_items_selects_nothing(self):
+        from services.lantmateriet.stac_orthophoto_service import (
+            _select_covering_features,
+        )
+
+        bbox = (15.0, 58.0, 16.0, 58.5)
+        features = [
+            _item("east", 16.0, 58.0, 16.5, 58.5),
+            _item("north", 15.0, 58.5, 16.0, 59.0),
+        ]
+
+        assert _select_covering_features(features, bbox) == []
+
+    @pytest.mark.asyncio
+    async def test_fetch_returns_none_when_only_edge_items_found(self, monkeypatch):
+        from services.lantmateriet import stac_orthophoto_service
+
+        monkeypatch.setattr(
+            stac_orthophoto_service.LANTMATERIET_CONFIG, "has_credentials", lambda: True
+        )
+        monkeypatch.setattr(
+            stac_orthophoto_service, "load_cached_search",
+            lambda cache_dir, key: {"features": [_item("east", 16.0, 58.0, 16.5, 58.5)]},
+        )
+
+        result = await stac_orthophoto_service.fetch_stac_orthophoto(
+            (15.0, 58.0, 16.0, 58.5), 256, 256
+        )
+
+        assert result is None
+
+
+class TestSnapResToOverview:
+    def test_snaps_up_to_slightly_coarser_overview(self):
+        from services.lantmateriet.stac_orthophoto_service import _snap_res_to_overview
+
+        # 2.5 m/px requested, 2.56 m/px overview is 2.4% coarser → use it
+        assert _snap_res_to_overview(2.5, 0.16, [2, 4, 8, 16]) == pytest.approx(2.56)
+
+    def test_keeps_resolution_when_next_level_is_too_coarse(self):
+        from services.lantmateriet.stac_orthophoto_service import _snap_res_to_overview
+
+        # Next level up (2.56) is 60% coarser than 1.6 → never snap down to 1.28
+        assert _snap_res_to_overview(1.6, 0.16, [2, 4, 8, 16]) == 1.6
+
+    def test_beyond_coarsest_level_is_unchanged(self):
+        from services.lantmateriet.stac_orthophoto_service import _snap_res_to_overview
+
+        assert _snap_res_to_overview(10.0, 0.16, [2, 4]) == 10.0
+        assert _snap_res_to_overview(0.165, 0.16, []) == pytest.approx(0.165)
+
+
 # ---------------------------------------------------------------------------
 # Merge seam test — needs rasterio (Docker CI / sufficient dev env)
 # ---------------------------------------------------------------------------
@@ -131,3 +231,28 @@ class TestCogMergeNoSeam:
         col_max = red_band.max(axis=0)
         zero_cols = int(np.sum(col_max == 0))
         assert zero_cols == 0, f"found {zero_cols} all-zero column(s) — seam present"
+
+
+class TestCogMergeFirstWins:
+    def test_newest_tile_wins_overlap_and_older_fills_gaps(self, tmp_path: Path):
+        """Input order is newest-first: the first tile owns the overlap and
+        later tiles only fill pixels it leaves at nodata (0)."""
+        newest = tmp_path / "newest.tif"
+        older = tmp_path / "older.tif"
+        oldest = tmp_path / "oldest.tif"
+        # newest covers the left half, older the whole extent, oldest too
+        _write_tile(newest, x_min=500_000, y_max=6_400_128, size=32, res_m=2.0, fill=200)
+        _write_tile(older, x_min=500_000, y_max=6_400_128, size=64, res_m=2.0, fill=100)
+        _write_tile(oldest, x_min=500_000, y_max=6_400_128, size=64, res_m=2.0, fill=50)
+
+        merged, _ = _cog_merge_rgb(
+            [str(newest), str(older), str(oldest)],
+            epsg3006_bounds=(500_000, 6_400_000, 500_128, 6_400_128),
+            target_width=64,
+            target_height=64,
+        )
+
+        assert merged is not None
+        assert merged[0, 5, 5] == 200     # newest wins its footprint
+        assert merged[0, 50, 50] == 100   # older fills the rest
+        assert not (merged[0] == 50).any()  # oldest is fully hidden
@@ -166,3 +166,21 @@ class TestEstimateBboxDimensionsM:
         assert 10_000 < w < 15_000
         # ~0.15 degrees latitude ≈ 16.7 km
         assert 15_000 < h < 20_000
+
+
+class TestTransformBboxToCrs:
+    """Test transform_bbox_to_crs()."""
+
+    def test_wgs84_target_is_identity(self):
+        from services.utils.geo import transform_bbox_to_crs
+        bbox = (7.90, 58.10, 8.10, 58.25)
+        assert transform_bbox_to_crs(bbox, "EPSG:4326") == bbox
+        assert transform_bbox_to_crs(bbox, "epsg:4326") == bbox
+
+    def test_projected_target(self):
+        from services.utils.geo import transform_bbox_to_crs
+        x_min, y_min, x_max, y_max = transform_bbox_to_crs(
+            (7.90, 58.10, 8.10, 58.25), "EPSG:3006"
+        )
+        assert x_min < x_max and y_min < y_max
+        assert 6_400_000 < y_min < 6_500_000